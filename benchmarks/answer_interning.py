@@ -0,0 +1,73 @@
+"""
+Micro-benchmark: counting the answers of a round by their raw text (the
+previous ``Potstop.count_words``) against counting their interned ids, and
+the points each way gives to answers that only differ in case or accents.
+
+    python benchmarks/answer_interning.py
+"""
+import random
+import timeit
+from collections import Counter
+
+from common import ROOT  # noqa: F401  (puts the server modules on the path)
+from normalize import InternTable
+from potstop import Potstop
+
+VARIANTS = ("Arara", "arara", "Arára", "ARARA", "Abacaxi", "abacaxí", "Amora", "Açaí", "acai")
+
+
+def legacy_count_words(answers: list[dict[str, str]], pots: list[str]) -> dict[str, dict[str, int]]:
+    """
+    The previous implementation, keyed by the raw answers.
+    """
+    count = {}
+    for pot in pots:
+        category = Counter()
+        for ans in answers:
+            value = ans.get(pot)
+            if value is not None:
+                category[value] += 1
+        count[pot] = dict(category)
+    return count
+
+
+def interned_count_words(answers: list[dict[str, str]], pots: list[str]) -> dict[str, dict[int, int]]:
+    table = InternTable(32)
+    count = {}
+    for pot in pots:
+        category = Counter()
+        for ans in answers:
+            value = ans.get(pot)
+            if isinstance(value, str) and (answer_id := table.intern(value)) is not None:
+                category[answer_id] += 1
+        count[pot] = dict(category)
+    return count
+
+
+def main() -> None:
+    game = Potstop()
+    game.start_game()
+    pots = game.pots
+    names = ["ana", "bia", "caio"]
+    for name in names:
+        game.add_player(name)
+    same = [(name, {pot: variant for pot in pots}) for name, variant in zip(names, VARIANTS)]
+    print("Arara / arara / Arára (letter A, no dictionary):")
+    game._Potstop__letter = "A"  # type: ignore[attr-defined]
+    print(f"  points per player: {game.compute_round_points(same)}")
+    print("  (each player got 10 per category before, as if the answers were all distinct)\n")
+
+    rng = random.Random(0)
+    print(f"{'players':>8} | {'raw Counter':>12} | {'interned':>10} | {'distinct raw':>12} | {'distinct ids':>12}")
+    for players in (8, 64, 256, 1000):
+        answers = [{pot: rng.choice(VARIANTS) for pot in pots} for _ in range(players)]
+        number = max(1, 20_000 // players)
+        raw = min(timeit.repeat(lambda: legacy_count_words(answers, pots), number=number, repeat=3)) / number
+        interned = min(timeit.repeat(lambda: interned_count_words(answers, pots), number=number, repeat=3)) / number
+        distinct_raw = sum(map(len, legacy_count_words(answers, pots).values()))
+        distinct_ids = sum(map(len, interned_count_words(answers, pots).values()))
+        print(f"{players:>8} | {raw * 1e3:>9.3f} ms | {interned * 1e3:>7.3f} ms | {distinct_raw:>12} | {distinct_ids:>12}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Micro-benchmark: ``Potstop.is_stop_valid`` against the nested-loop validator
+it replaced, for typical answers and for oversized ones sent by a malicious
+client. Also checks that ``validate_answers`` (which scoring agrees with)
+gives the same verdicts as ``is_stop_valid``.
+
+    python benchmarks/answer_validation.py
+"""
+import random
+import timeit
+
+from common import ROOT  # noqa: F401  (puts the server modules on the path)
+from potstop import Potstop
+
+
+def legacy_is_stop_valid(answer: str, letter: str) -> bool:
+    """
+    The previous implementation, O(n²) on the answer length.
+    """
+    for i in range(len(answer)):
+        qtd = 0
+        for j in range(i, len(answer)):
+            if qtd > 2:
+                return False
+            if answer[i] == answer[j] and i != j:
+                qtd += 1
+
+    return len(answer) > 2 and answer[0].upper() == letter.upper()
+
+
+def adversarial(length: int, letter: str) -> str:
+    """
+    An answer where no character appears more than three times, so the legacy
+    validator has to scan it all.
+    """
+    alphabet = [chr(c) for c in range(0x4E00, 0x4E00 + length // 3 + 1)]
+    chars = (alphabet * 3)[:length - 1]
+    random.Random(0).shuffle(chars)
+    return letter + "".join(chars)
+
+
+def agrees(game: Potstop) -> bool:
+    """
+    Checks ``validate_answers`` against ``is_stop_valid`` on answers that
+    repeat a letter more than ``MAX_REPEATS`` times only once case and
+    accents are ignored (like "Alabama" or "Anastácia" for the letter A).
+    """
+    letter, lower = game.letter, game.letter.lower()
+    cases = [
+        f"{letter}l{lower}b{lower}m{lower}",
+        f"{letter}n{lower}st{lower}cia",
+        f"{letter}raaaá",
+        f"{letter}bacaxis",
+        f"{letter}aaaa",
+    ]
+    answers = {f"category{i}": answer for i, answer in enumerate(cases)}
+    expected = {category: game.is_stop_valid(answer) for category, answer in answers.items()}
+    return game.validate_answers(answers) == expected
+
+
+def main() -> None:
+    game = Potstop()
+    game.start_game()
+    letter = game.letter
+    cases = {
+        "typical (8 chars)": letter + "bacaxis",
+        "typical (20 chars)": letter + "lgo que se quebra f",
+        "oversized (1 KiB)": adversarial(1024, letter),
+        "oversized (4 KiB)": adversarial(4096, letter),
+    }
+
+    print(f"{'answer':>20} | {'legacy':>12} | {'is_stop_valid':>13} | speedup")
+    for name, answer in cases.items():
+        number = 3 if len(answer) > 100 else 100_000
+        legacy = min(timeit.repeat(lambda: legacy_is_stop_valid(answer, letter), number=number, repeat=3)) / number
+        current = min(timeit.repeat(lambda: game.is_stop_valid(answer), number=number, repeat=3)) / number
+        print(f"{name:>20} | {legacy * 1e6:>9.2f} µs | {current * 1e6:>10.2f} µs | {legacy / current:>6.1f}x")
+
+    game.max_answer_length = 8192
+    answer = cases["oversized (4 KiB)"]
+    number = 200
+    uncapped = min(timeit.repeat(lambda: game.is_stop_valid(answer), number=number, repeat=3)) / number
+    print(f"\nis_stop_valid on 4 KiB with max_answer_length=8192 (full scan): {uncapped * 1e6:.2f} µs")
+
+    answers = [{f"category{c}": letter + "bacaxis" for c in range(8)} for _ in range(8)]
+    number = 10_000
+    batch = min(timeit.repeat(lambda: game.validate_answers(answers), number=number, repeat=3)) / number
+    print(f"validate_answers on 8 players x 8 categories: {batch * 1e6:.2f} µs")
+
+    game.max_answer_length = 64
+    consistent = agrees(game)
+    print(f"validate_answers agrees with is_stop_valid: {consistent}")
+    assert consistent, "validate_answers and is_stop_valid disagree"
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Benchmark: memory allocated by one broadcast as the number of recipients grows.
+
+Compares ``Server.broadcast`` (frame encoded once and shared by every
+recipient's outbox) against encoding the message once per recipient, which
+is what broadcast used to do. Only the enqueueing is measured: the outboxes
+are not drained.
+
+    python benchmarks/broadcast_allocations.py
+"""
+import contextlib
+import io
+import json
+import tracemalloc
+
+from common import ROOT  # noqa: F401  (puts the server modules on the path)
+from framing import encode_frame
+from outbox import Outbox
+from rooms import Room
+from server.server import Client, Server
+
+RECIPIENTS = (8, 64, 512, 5_000)
+MESSAGE = "START\n" + json.dumps({
+    "round": 1,
+    "pots": ["Nome próprio", "Cidade", "Fruta", "Filme", "Brinquedo", "Cor", "Esporte", "Algo caro"],
+    "letter": "A",
+})
+
+
+def make_room(size: int) -> Room:
+    room = Room("bench")
+    room.members = [
+        Client(None, ("bench", i), name=f"player{i}", outbox=Outbox(limit=16))  # type: ignore[arg-type]
+        for i in range(size)
+    ]
+    return room
+
+
+def encode_per_recipient(room: Room) -> None:
+    for client in room.members:
+        client.send(encode_frame(MESSAGE))
+
+
+def measure(broadcast, room: Room) -> tuple[int, int]:
+    """
+    Returns the number of memory blocks and bytes still allocated after
+    running ``broadcast`` once.
+    """
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    broadcast(room)
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    diff = after.compare_to(before, "filename")
+    blocks = sum(stat.count_diff for stat in diff if stat.count_diff > 0)
+    size = sum(stat.size_diff for stat in diff if stat.size_diff > 0)
+    return blocks, size
+
+
+def main() -> None:
+    server = Server(port=0)
+    rows = []
+    for size in RECIPIENTS:
+        with contextlib.redirect_stdout(io.StringIO()):
+            legacy = measure(encode_per_recipient, make_room(size))
+            shared = measure(lambda room: server.broadcast(MESSAGE, room=room), make_room(size))
+        rows.append((size, legacy, shared))
+
+    print(f"{'recipients':>10} | {'per-recipient encode':>26} | {'encode once (broadcast)':>26}")
+    for size, (legacy_blocks, legacy_bytes), (shared_blocks, shared_bytes) in rows:
+        print(
+            f"{size:>10} | {legacy_blocks:>8} blocks {legacy_bytes:>9} B | "
+            f"{shared_blocks:>8} blocks {shared_bytes:>9} B"
+        )
+    print("\nblocks/bytes are the allocations retained after one broadcast, over all recipients")
+
+
+if __name__ == "__main__":
+    main()
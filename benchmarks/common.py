@@ -0,0 +1,117 @@
+"""
+Helpers shared by the benchmark scripts.
+
+The benchmarks are plain scripts meant to be run from the project root, e.g.
+``python benchmarks/idle_connections.py``. Process statistics are read from
+``/proc``, so the ones that measure a live server only work on Linux.
+"""
+import os
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+SERVER_DIR = ROOT / "server"
+
+# The server modules import each other as top-level modules ("from potstop
+# import Potstop"), so the server directory goes on the path. It is appended
+# after the project root so "server" still names the package (e.g. "from
+# server.server import Server") instead of server/server.py.
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+if str(SERVER_DIR) not in sys.path:
+    sys.path.append(str(SERVER_DIR))
+
+
+def free_port() -> int:
+    """
+    Returns a TCP port that is free on localhost.
+    """
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def launch_server(port: int, *args: str) -> subprocess.Popen:
+    """
+    Starts ``server/server.py`` in a subprocess and waits until it accepts
+    connections.
+
+    The server stdin is kept as a pipe: closing it (see ``stop_server``) makes
+    the server shut down as if 'q' was typed.
+
+    Args:
+        port (int): Port the server should listen on.
+        *args (str): Extra command line arguments for the server.
+
+    Returns:
+        subprocess.Popen: The running server process.
+    """
+    process = subprocess.Popen(
+        [sys.executable, str(SERVER_DIR / "server.py"), str(port), *args],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        cwd=ROOT,
+    )
+    deadline = time.time() + 10
+    while time.time() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.5).close()
+            return process
+        except OSError:
+            time.sleep(0.05)
+    process.kill()
+    raise RuntimeError("Server did not start")
+
+
+def stop_server(process: subprocess.Popen) -> None:
+    """
+    Asks a server started by ``launch_server`` to shut down.
+    """
+    assert process.stdin is not None
+    process.stdin.close()
+    try:
+        process.wait(5)
+    except subprocess.TimeoutExpired:
+        process.kill()
+
+
+def rss_bytes(pid: int) -> int:
+    """
+    Returns the resident set size of a process in bytes.
+    """
+    with open(f"/proc/{pid}/status") as status:
+        for line in status:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) * 1024
+    return 0
+
+
+def cpu_seconds(pid: int) -> float:
+    """
+    Returns the user + system CPU time consumed by a process, in seconds.
+    """
+    with open(f"/proc/{pid}/stat") as stat:
+        fields = stat.read().rsplit(")", 1)[1].split()
+    return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+
+
+def open_fds(pid: int) -> int:
+    """
+    Returns the number of file descriptors opened by a process.
+    """
+    return len(os.listdir(f"/proc/{pid}/fd"))
+
+
+def raise_open_files_limit() -> None:
+    """
+    Raises the soft limit of open file descriptors up to the hard limit.
+    """
+    import resource
+
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft < hard:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
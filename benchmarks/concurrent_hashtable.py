@@ -0,0 +1,167 @@
+"""
+Stress benchmark: ``ConcurrentHashTable`` under many writer threads.
+
+Every writer joins and leaves its own players and adds points to a set of
+shared players (what the handler threads do to ``Potstop``'s player table
+while a round is scored), while a reader thread keeps listing the ranking.
+Compares the striped table against a ``HashTable`` behind one global lock and
+a ``HashTable`` with no synchronization, and checks afterwards that no entry
+and no point was lost. The interpreter switch interval is lowered so that
+threads interleave as often as possible.
+
+    python benchmarks/concurrent_hashtable.py
+"""
+import sys
+import threading
+import time
+from typing import Any, Optional
+
+from common import ROOT  # noqa: F401  (puts the server modules on the path)
+from data_structures.concurrent_hashtable import ConcurrentHashTable
+from data_structures.hashtable import HashTable
+
+THREADS = (1, 4, 16)
+OPERATIONS = 20_000
+SHARED = 50  # divides OPERATIONS, so every shared player gets the same points
+
+
+class Unsynchronized:
+    """
+    A HashTable used directly, as Potstop used to.
+    """
+
+    def __init__(self) -> None:
+        self.table = HashTable()
+
+    def put(self, key: Any, value: Any) -> None:
+        self.table.put(key, value)
+
+    def add(self, key: Any, amount: Any) -> Optional[Any]:
+        if key in self.table:
+            self.table[key] += amount
+            return self.table[key]
+        return None
+
+    def discard(self, key: Any) -> Optional[Any]:
+        return self.table.remove(key) if key in self.table else None
+
+    def items(self) -> list[tuple]:
+        return self.table.items()
+
+    def get(self, key: Any) -> Any:
+        return self.table.get(key)
+
+
+class GlobalLock(Unsynchronized):
+    """
+    A HashTable behind a single lock.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.lock = threading.Lock()
+
+    def put(self, key: Any, value: Any) -> None:
+        with self.lock:
+            super().put(key, value)
+
+    def add(self, key: Any, amount: Any) -> Optional[Any]:
+        with self.lock:
+            return super().add(key, amount)
+
+    def discard(self, key: Any) -> Optional[Any]:
+        with self.lock:
+            return super().discard(key)
+
+    def items(self) -> list[tuple]:
+        with self.lock:
+            return super().items()
+
+    def get(self, key: Any) -> Any:
+        with self.lock:
+            return super().get(key)
+
+
+def writer(table: Any, worker: int, errors: list[BaseException]) -> None:
+    try:
+        for n in range(OPERATIONS):
+            name = f"worker{worker}-player{n}"
+            table.put(name, 0)
+            table.add(f"shared{n % SHARED}", 1)
+            if n % 2:
+                table.discard(name)
+    except BaseException as error:  # noqa: BLE001  (reported as a failure)
+        errors.append(error)
+
+
+def reader(table: Any, done: threading.Event, latencies: list[float], errors: list[BaseException]) -> None:
+    while not done.is_set():
+        start = time.perf_counter()
+        try:
+            sorted(table.items(), key=lambda item: item[1], reverse=True)
+        except BaseException as error:  # noqa: BLE001  (reported as a failure)
+            errors.append(error)
+            return
+        latencies.append(time.perf_counter() - start)
+
+
+def run(factory, threads: int) -> dict[str, Any]:
+    table = factory()
+    for n in range(SHARED):
+        table.put(f"shared{n}", 0)
+
+    errors: list[BaseException] = []
+    latencies: list[float] = []
+    done = threading.Event()
+    workers = [threading.Thread(target=writer, args=(table, w, errors)) for w in range(threads)]
+    listing = threading.Thread(target=reader, args=(table, done, latencies, errors))
+
+    start = time.perf_counter()
+    listing.start()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    done.set()
+    listing.join()
+
+    expected_points = threads * OPERATIONS // SHARED
+    try:
+        lost_points = sum(expected_points - table.get(f"shared{n}") for n in range(SHARED))
+        present = {key for key, _ in table.items()}
+        lost_players = sum(
+            f"worker{w}-player{n}" not in present for w in range(threads) for n in range(0, OPERATIONS, 2)
+        )
+    except KeyError as error:
+        errors.append(error)
+        lost_points = lost_players = -1
+    return {
+        "throughput": threads * OPERATIONS / elapsed,
+        "lost_points": lost_points,
+        "lost_players": lost_players,
+        "errors": len(errors),
+        "listing": sorted(latencies)[len(latencies) // 2] if latencies else 0.0,
+        "max_listing": max(latencies, default=0.0),
+    }
+
+
+def main() -> None:
+    sys.setswitchinterval(1e-6)
+    layouts = {
+        "concurrent": lambda: ConcurrentHashTable(probing="triangular"),
+        "global lock": GlobalLock,
+        "no locking": Unsynchronized,
+    }
+    print(f"{'threads':>7} | {'table':>11} | {'ops/s':>9} | {'lost points':>11} | {'lost players':>12} | {'errors':>6} | {'listing p50':>11} | {'listing max':>11}")
+    for threads in THREADS:
+        for label, factory in layouts.items():
+            result = run(factory, threads)
+            print(
+                f"{threads:>7} | {label:>11} | {result['throughput']:>9.0f} | {result['lost_points']:>11} | "
+                f"{result['lost_players']:>12} | {result['errors']:>6} | {result['listing'] * 1e3:>8.2f} ms | {result['max_listing'] * 1e3:>8.2f} ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Benchmark: loading and querying the dictionary of accepted answers.
+
+Builds word lists for every category of ``pots.py`` (synthetic words, as
+many as a real dictionary would have), then compares getting them ready at
+startup by parsing the text files into sets against opening the prebuilt
+memory-mapped index, and times ``Dictionary.accepts`` for answers of
+growing length, found and not found.
+
+    python benchmarks/dictionary_lookup.py
+"""
+import random
+import string
+import tempfile
+import time
+import timeit
+from pathlib import Path
+
+from common import ROOT  # noqa: F401  (puts the server modules on the path)
+import pots
+from dictionary import Dictionary, build_index, read_word_lists, slug
+from normalize import normalize
+
+WORDS_PER_CATEGORY = 5_000
+ANSWER_LENGTHS = (6, 24, 64)
+
+
+def random_word(rng: random.Random, length: int) -> str:
+    return "".join(rng.choice(string.ascii_lowercase + "áãçéêíóõú") for _ in range(length)).capitalize()
+
+
+def parse_lists(directory: Path, categories: list[str]) -> dict[str, set[str]]:
+    """
+    What the server would do at startup without a prebuilt index.
+    """
+    return {normalize(category): {normalize(word) for word in words}
+            for category, words in read_word_lists(directory, categories).items()}
+
+
+def main() -> None:
+    rng = random.Random(0)
+    categories = [category for group in pots.pots for category in group]
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = Path(tmp)
+        samples: dict[int, str] = {}
+        for category in categories:
+            words = [random_word(rng, rng.randint(3, 20)) for _ in range(WORDS_PER_CATEGORY)]
+            for length in ANSWER_LENGTHS:
+                words.append(samples.setdefault(length, random_word(rng, length)))
+            (directory / f"{slug(category)}.txt").write_text("\n".join(words), encoding="utf-8")
+
+        started = time.perf_counter()
+        count = build_index(read_word_lists(directory, categories), directory / "index.potd")
+        build = time.perf_counter() - started
+        index_size = (directory / "index.potd").stat().st_size
+        text_size = sum(path.stat().st_size for path in directory.glob("*.txt"))
+
+        parse = min(timeit.repeat(lambda: parse_lists(directory, categories), number=1, repeat=3))
+        load = min(timeit.repeat(lambda: Dictionary(directory / "index.potd").close(), number=20, repeat=3)) / 20
+        print(f"{count} words in {len(categories)} categories: text {text_size / 1e6:.1f} MB, index {index_size / 1e6:.1f} MB")
+        print(f"build index: {build * 1e3:.0f} ms (once, offline)")
+        print(f"startup, parsing the text files: {parse * 1e3:8.1f} ms")
+        print(f"startup, mapping the index:      {load * 1e3:8.3f} ms\n")
+
+        dictionary = Dictionary(directory / "index.potd")
+        category = categories[0]
+        print(f"{'answer length':>13} | {'found':>10} | {'not found':>10}")
+        for length in ANSWER_LENGTHS:
+            found, missing = samples[length], samples[length][:-1] + "#"
+            assert dictionary.accepts(category, found.upper()) and not dictionary.accepts(category, missing)
+            hit = min(timeit.repeat(lambda: dictionary.accepts(category, found), number=20_000, repeat=3)) / 20_000
+            miss = min(timeit.repeat(lambda: dictionary.accepts(category, missing), number=20_000, repeat=3)) / 20_000
+            print(f"{length:>13} | {hit * 1e6:>7.2f} µs | {miss * 1e6:>7.2f} µs")
+        dictionary.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+Benchmark: grouping the answers of a category by edit distance with
+``scoring.cluster_answers`` (a BK-tree of the group leaders) against
+comparing each answer with every leader, as the number of distinct answers
+in the category grows.
+
+The answers are synthetic words of the same initial, a third of them typos
+(one edit) of an earlier answer. Both ways give the same groups; the table
+shows the edit distances computed and the time taken.
+
+    python benchmarks/fuzzy_clustering.py [--distance 1]
+"""
+import argparse
+import random
+import time
+
+from common import ROOT  # noqa: F401  (puts the server modules on the path)
+from data_structures.bktree import levenshtein
+import scoring
+from scoring import MIN_FUZZY_LENGTH, cluster_answers
+
+SYLLABLES = ("ba", "ca", "da", "ra", "ri", "to", "lu", "me", "na", "po", "sa", "te", "vi", "zo", "lha", "nho")
+ANSWERS = (250, 500, 1000, 2000, 4000)
+LINEAR_LIMIT = 2000  # the linear scan takes too long beyond this
+
+
+def typo(rng: random.Random, word: str) -> str:
+    i = rng.randrange(1, len(word))
+    edit = rng.choice(("insert", "delete", "replace"))
+    if edit == "insert":
+        return word[:i] + rng.choice("aeiourls") + word[i:]
+    if edit == "delete":
+        return word[:i] + word[i + 1:]
+    return word[:i] + rng.choice("aeiourls") + word[i + 1:]
+
+
+def answers(count: int, seed: int = 0) -> list[str]:
+    rng = random.Random(seed)
+    seen: dict[str, None] = {}
+    while len(seen) < count:
+        if seen and rng.random() < 1 / 3:
+            word = typo(rng, rng.choice(list(seen)))
+        else:
+            word = "a" + "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4)))
+        seen[word] = None
+    return list(seen)
+
+
+def linear_clusters(forms: list[str], max_distance: int, distance=levenshtein) -> list[int]:
+    """
+    The same grouping as ``cluster_answers``, comparing each answer with
+    every group leader.
+    """
+    groups = list(range(len(forms)))
+    leaders: list[int] = []
+    for index, form in enumerate(forms):
+        if len(form) < MIN_FUZZY_LENGTH:
+            continue
+        best = None
+        for leader in leaders:
+            d = distance(form, forms[leader])
+            if d <= max_distance and (best is None or d < best[0]):
+                best = (d, leader)
+        if best is None:
+            leaders.append(index)
+        else:
+            groups[index] = best[1]
+    return groups
+
+
+class Counted:
+    """
+    A distance function that counts its calls.
+    """
+
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def __call__(self, a: str, b: str) -> int:
+        self.calls += 1
+        return levenshtein(a, b)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--distance", type=int, default=1)
+    args = parser.parse_args()
+
+    print(f"max distance {args.distance}")
+    print(f"{'answers':>8} | {'groups':>6} | {'bk-tree calls':>13} | {'bk-tree':>10} | "
+          f"{'linear calls':>12} | {'linear':>10} | same")
+    for count in ANSWERS:
+        forms = answers(count)
+
+        counted = Counted()
+        original = scoring.BKTree
+        scoring.BKTree = lambda: original(distance=counted)  # type: ignore[assignment]
+        try:
+            start = time.perf_counter()
+            tree_groups = cluster_answers(forms, args.distance)
+            tree_time = time.perf_counter() - start
+        finally:
+            scoring.BKTree = original  # type: ignore[assignment]
+        groups = len(set(tree_groups))
+
+        if count <= LINEAR_LIMIT:
+            linear = Counted()
+            start = time.perf_counter()
+            linear_groups = linear_clusters(forms, args.distance, linear)
+            linear_time = time.perf_counter() - start
+            print(f"{count:>8} | {groups:>6} | {counted.calls:>13} | {tree_time * 1e3:>7.1f} ms | "
+                  f"{linear.calls:>12} | {linear_time * 1e3:>7.1f} ms | {tree_groups == linear_groups}")
+        else:
+            print(f"{count:>8} | {groups:>6} | {counted.calls:>13} | {tree_time * 1e3:>7.1f} ms | "
+                  f"{'-':>12} | {'-':>10} | -")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Benchmark: players constantly joining and leaving a long-lived room.
+
+Runs 1M leave/join cycles against a ``HashTable`` holding a steady number of
+players (as ``Potstop.remove_player`` / ``Potstop.add_player`` do) and
+reports, at checkpoints, the average and longest probe sequence of the live
+keys, the index and dense list sizes and the memory they hold. All of them
+must stay bounded however many cycles have run.
+
+    python benchmarks/hashtable_churn.py
+"""
+import random
+import sys
+import time
+
+from common import ROOT  # noqa: F401  (puts the server modules on the path)
+from data_structures.hashtable import HashTable
+
+CYCLES = 1_000_000
+CHECKPOINTS = 5
+ROOM_SIZES = (8, 1_000)
+
+
+def probe_lengths(table: HashTable) -> tuple[float, int]:
+    """
+    Returns the average and the longest number of slots probed to find each
+    live key, read from the table internals.
+    """
+    indices = table._HashTable__indices  # type: ignore[attr-defined]
+    hashes = table._HashTable__hashes  # type: ignore[attr-defined]
+    mask = len(indices) - 1
+    lengths = [((slot - (hashes[entry] & mask)) & mask) + 1 for slot, entry in enumerate(indices) if entry >= 0]
+    return sum(lengths) / len(lengths), max(lengths)
+
+
+def footprint(table: HashTable) -> tuple[int, int, int]:
+    """
+    Returns the index size, the dense lists length and the bytes held by both.
+    """
+    indices = table._HashTable__indices  # type: ignore[attr-defined]
+    dense = (table._HashTable__hashes, table._HashTable__keys, table._HashTable__values)  # type: ignore[attr-defined]
+    return len(indices), len(dense[0]), sys.getsizeof(indices) + sum(sys.getsizeof(column) for column in dense)
+
+
+def churn(players: int, rng: random.Random) -> None:
+    table = HashTable()
+    present = [f"player{n}" for n in range(players)]
+    for name in present:
+        table.put(name, 0)
+    joined = players
+
+    print(f"\n{players} players, {CYCLES} leave/join cycles")
+    print(f"{'cycles':>9} | {'avg probe':>9} | {'max probe':>9} | {'index':>6} | {'dense':>6} | {'memory':>9} | {'per cycle':>9}")
+    step = CYCLES // CHECKPOINTS
+    for checkpoint in range(CHECKPOINTS):
+        start = time.perf_counter()
+        for _ in range(step):
+            position = rng.randrange(players)
+            table.remove(present[position])
+            present[position] = f"player{joined}"
+            table.put(present[position], 0)
+            joined += 1
+        elapsed = time.perf_counter() - start
+
+        assert len(table) == players
+        average, longest = probe_lengths(table)
+        index, dense, memory = footprint(table)
+        print(
+            f"{(checkpoint + 1) * step:>9} | {average:>9.2f} | {longest:>9} | {index:>6} | {dense:>6} | "
+            f"{memory / 1024:>6.1f} KB | {elapsed / step * 1e6:>6.2f} µs"
+        )
+
+
+def main() -> None:
+    rng = random.Random(0)
+    for players in ROOM_SIZES:
+        churn(players, rng)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Benchmark: ``HashTable`` compact layout (sparse index + dense insertion-ordered
+entries) against the previous open-addressing layout and the built-in ``dict``.
+
+Measures building the table, looking every key up, listing ``keys()`` /
+``items()`` (what ``Potstop.players`` and ``Potstop.ranking`` do) and the
+memory retained, for room sizes from a handful of players to thousands.
+
+    python benchmarks/hashtable_layout.py
+"""
+import timeit
+import tracemalloc
+from typing import Any
+
+import numpy as np
+
+from common import ROOT  # noqa: F401  (puts the server modules on the path)
+from data_structures.hashtable import HashTable
+
+SIZES = (8, 64, 1_000, 20_000)
+
+
+class LegacyHashTable:
+    """
+    The previous layout: (key, value) tuples stored directly in a numpy object
+    array of at least 500 slots, scanned whole by ``keys()`` and ``items()``.
+    Only the operations measured here are kept.
+    """
+
+    def __init__(self, size: int = 500) -> None:
+        self.load_factor = 0.70
+        self.length = 0
+        self.table = np.full(size, None)
+
+    def put(self, key: Any, value: Any) -> None:
+        slot = hash(key) % len(self.table)
+        while self.table[slot] not in [None, "X"] and self.table[slot][0] != key:
+            slot = (slot + 1) % len(self.table)
+        if self.table[slot] in [None, "X"]:
+            self.length += 1
+        self.table[slot] = (key, value)
+        if self.length / float(len(self.table)) >= self.load_factor:
+            old_table = self.table
+            self.table = [None] * (len(old_table) * 2)
+            self.length = 0
+            for entry in old_table:
+                if entry is not None:
+                    self.put(entry[0], entry[1])
+
+    def get(self, key: Any) -> Any:
+        slot = hash(key) % len(self.table)
+        while self.table[slot][0] != key:
+            slot = (slot + 1) % len(self.table)
+        return self.table[slot][1]
+
+    def keys(self) -> list:
+        return [entry[0] for entry in self.table if (entry is not None and entry != "X")]
+
+    def items(self) -> list:
+        return [entry for entry in self.table if entry not in [None, "X"]]
+
+
+class Dict(dict):
+    put = dict.__setitem__
+
+
+def build(factory, names: list[str]):
+    table = factory()
+    for points, name in enumerate(names):
+        table.put(name, points)
+    return table
+
+
+def retained_bytes(factory, names: list[str]) -> int:
+    tracemalloc.start()
+    table = build(factory, names)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del table
+    return size
+
+
+def main() -> None:
+    layouts = {"legacy": LegacyHashTable, "compact": HashTable, "dict": Dict}
+    print(f"{'entries':>8} | {'layout':>7} | {'build':>10} | {'get all':>10} | {'keys()':>10} | {'items()':>10} | {'memory':>10}")
+    for size in SIZES:
+        names = [f"player{i}" for i in range(size)]
+        number = max(1, 20_000 // size)
+        for label, factory in layouts.items():
+            table = build(factory, names)
+            assert sorted(table.keys()) == sorted(names)
+            timings = [
+                min(timeit.repeat(statement, number=number, repeat=3)) / number
+                for statement in (
+                    lambda: build(factory, names),
+                    lambda: [table.get(name) for name in names],
+                    lambda: list(table.keys()),
+                    lambda: list(table.items()),
+                )
+            ]
+            columns = " | ".join(f"{t * 1e6:>7.1f} µs" for t in timings)
+            memory = retained_bytes(factory, names)
+            print(f"{size:>8} | {label:>7} | {columns} | {memory / 1024:>7.1f} KB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Benchmark: ``HashTable`` probing strategies on the workloads of the game.
+
+For each strategy, fills a table with the keys of a workload, removes and
+re-adds part of them (players leaving and joining) and reports the numbers
+of ``HashTable.probe_stats`` plus the time to look every key up.
+
+Workloads:
+    * players: names sharing a prefix ("player0001", "player0002", ...)
+    * answers: the (category, answer) pairs counted when scoring a round
+    * clustered: integers with consecutive home buckets, the worst case for
+      linear probing
+
+    python benchmarks/hashtable_probing.py
+"""
+import random
+import timeit
+from typing import Any
+
+from common import ROOT  # noqa: F401  (puts the server modules on the path)
+from data_structures.hashtable import PROBING, HashTable
+from pots import pots
+
+SIZE = 5_000
+
+
+def players(rng: random.Random) -> list[Any]:
+    return [f"player{n:04d}" for n in range(SIZE)]
+
+
+def answers(rng: random.Random) -> list[Any]:
+    categories = [rng.choice(group) for group in rng.sample(pots, 8)]
+    letter = rng.choice("ABCDEFGHIJLMNOPRSTUV")
+    return list({
+        (rng.choice(categories), letter + "".join(rng.choices("aeioulmnrst", k=rng.randint(3, 8))))
+        for _ in range(SIZE)
+    })
+
+
+def clustered(rng: random.Random) -> list[Any]:
+    # runs of keys hashing to consecutive buckets, each run starting where
+    # the previous one ended
+    return [run * 64 + offset for run in range(SIZE // 16) for offset in range(16)]
+
+
+def run(probing: str, keys: list[Any], rng: random.Random) -> dict[str, Any]:
+    table = HashTable(probing=probing)
+    for key in keys:
+        table.put(key, 0)
+    for key in rng.sample(keys, len(keys) // 4):
+        table.remove(key)
+    for key in rng.sample(keys, len(keys) // 4):
+        table.put(key, 1)
+
+    stats = table.probe_stats()
+    present = table.keys()
+    stats["lookup"] = min(timeit.repeat(lambda: [table.get(key) for key in present], number=3, repeat=3)) / 3 / len(present)
+    return stats
+
+
+def main() -> None:
+    rng = random.Random(0)
+    print(f"{'workload':>9} | {'probing':>10} | {'avg probe':>9} | {'max probe':>9} | {'load':>5} | {'resizes':>7} | {'lookup':>8}")
+    for workload in (players, answers, clustered):
+        keys = workload(rng)
+        for probing in PROBING:
+            stats = run(probing, keys, random.Random(1))
+            print(
+                f"{workload.__name__:>9} | {probing:>10} | {stats['avg_probe']:>9.2f} | {stats['max_probe']:>9} | "
+                f"{stats['load_factor']:>5.2f} | {stats['resizes']:>7} | {stats['lookup'] * 1e9:>5.0f} ns"
+            )
+
+
+if __name__ == "__main__":
+    main()
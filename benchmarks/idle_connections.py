@@ -0,0 +1,72 @@
+"""
+Load test: how many idle POP connections a single server process holds.
+
+Opens N client sockets against a fresh server and reports the server RSS
+growth per connection, the CPU spent while the connections sit idle and the
+latency of a JOIN issued once all of them are open.
+
+    python benchmarks/idle_connections.py --connections 10000 --mode async
+    python benchmarks/idle_connections.py --connections 2000 --mode thread
+"""
+import argparse
+import json
+import socket
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from common import (cpu_seconds, free_port, launch_server, open_fds,
+                    raise_open_files_limit, rss_bytes, stop_server)
+from framing import encode_frame
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--connections", type=int, default=10_000)
+    parser.add_argument("--mode", choices=("thread", "async"), default="async")
+    parser.add_argument("--idle", type=float, default=5.0, help="seconds to stay idle while measuring CPU")
+    args = parser.parse_args()
+
+    raise_open_files_limit()
+    port = free_port()
+    server = launch_server(port, "--mode", args.mode)
+    time.sleep(0.5)
+    base_rss = rss_bytes(server.pid)
+    base_fds = open_fds(server.pid)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(64) as pool:
+        sockets = list(pool.map(lambda _: socket.create_connection(("127.0.0.1", port)), range(args.connections)))
+    while open_fds(server.pid) < base_fds + args.connections:
+        time.sleep(0.05)
+    connect_time = time.perf_counter() - started
+
+    time.sleep(0.5)
+    rss = rss_bytes(server.pid)
+    cpu_before = cpu_seconds(server.pid)
+    time.sleep(args.idle)
+    idle_cpu = cpu_seconds(server.pid) - cpu_before
+
+    probe = sockets[-1]
+    started = time.perf_counter()
+    probe.sendall(encode_frame("JOIN\nprobe"))
+    probe.recv(1024)
+    join_latency = time.perf_counter() - started
+
+    for sock in sockets:
+        sock.close()
+    stop_server(server)
+
+    print(json.dumps({
+        "mode": args.mode,
+        "connections": args.connections,
+        "connect_seconds": round(connect_time, 3),
+        "server_rss_base_mb": round(base_rss / 2**20, 1),
+        "server_rss_mb": round(rss / 2**20, 1),
+        "rss_per_connection_kb": round((rss - base_rss) / args.connections / 1024, 2),
+        "idle_cpu_percent": round(idle_cpu / args.idle * 100, 2),
+        "join_latency_ms": round(join_latency * 1000, 2),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
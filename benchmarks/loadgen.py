@@ -0,0 +1,301 @@
+"""
+Load generator: simulated players speaking POP against ``server/server.py``.
+
+Opens ``--rooms`` x ``--players`` headless players (``client.aio.AsyncClient``:
+one asyncio task each, no Textual) and plays ``--rounds`` rounds in every
+room: the leader sends START, everybody waits for the START broadcast, some
+players STOP and the others answer the "STOPPED BY" broadcast with their own
+STOP, then the round is settled. Finally every player QUITs.
+
+Scenarios (the fractions can also be set one by one):
+
+    basic         one player stops each round
+    simultaneous  every player stops at the same time
+    slow          a quarter of the players read their socket slowly
+    disconnect    a quarter of the players drop mid-round and are replaced
+    mixed         all of the above at once
+
+Reports p50/p95/p99 latency per command, rounds per second and the server
+CPU time and RSS (when the server was launched here, or ``--server-pid`` is
+given), as JSON on stdout or in ``--output``.
+
+    python benchmarks/loadgen.py --rooms 50 --players 8 --rounds 10 --mode async
+    python benchmarks/loadgen.py --scenario mixed --output results.json
+    python benchmarks/loadgen.py --host 10.0.0.2 --port 8888 --server-pid 1234
+"""
+import argparse
+import asyncio
+import json
+import random
+import string
+import threading
+import time
+from typing import Any, Awaitable, Optional
+
+from common import cpu_seconds, free_port, launch_server, raise_open_files_limit, rss_bytes, stop_server
+from client.aio import AsyncClient, Event, Response
+
+SCENARIOS = {
+    # (fraction of players that STOP first, slow readers, mid-round disconnects)
+    "basic": (0.0, 0.0, 0.0),
+    "simultaneous": (1.0, 0.0, 0.0),
+    "slow": (0.0, 0.25, 0.0),
+    "disconnect": (0.0, 0.0, 0.25),
+    "mixed": (1.0, 0.25, 0.25),
+}
+
+
+class Player:
+    """
+    A simulated player: an ``AsyncClient`` whose requests have their latency
+    recorded, and whose failures (timeouts, lost connections) are counted
+    instead of raised.
+    """
+
+    def __init__(self, name: str, room: str, latencies: dict[str, list[float]], errors: dict[str, int],
+                 client: AsyncClient) -> None:
+        self.name = name
+        self.room = room
+        self.client = client
+        self.__latencies = latencies
+        self.__errors = errors
+
+    async def timed(self, method: str, call: Awaitable[Response]) -> Optional[Response]:
+        """
+        Waits for a request of the client, recording its latency.
+
+        Returns:
+            The response, or None on timeout or connection loss (counted as an
+            error of the method).
+        """
+        started = time.perf_counter()
+        try:
+            response = await call
+        except (OSError, ConnectionError, asyncio.TimeoutError):
+            self.__errors[method] = self.__errors.get(method, 0) + 1
+            return None
+        self.__latencies.setdefault(method, []).append(time.perf_counter() - started)
+        return response
+
+    async def wait_event(self, kind: str) -> Optional[Event]:
+        """
+        Waits for the next broadcast of a kind, skipping others.
+        """
+        try:
+            return await self.client.next_event(kind, self.client.timeout)
+        except (ConnectionError, asyncio.TimeoutError):
+            self.__errors[f"event {kind}"] = self.__errors.get(f"event {kind}", 0) + 1
+            return None
+
+
+def make_answers(game: dict[str, Any], rng: random.Random) -> dict[str, str]:
+    letter = game["letter"]
+    return {
+        pot: letter + "".join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 9)))
+        for pot in game["pots"]
+    }
+
+
+class Room:
+    """
+    Plays the rounds of one room.
+    """
+
+    def __init__(self, room_id: str, args: argparse.Namespace, stats: dict[str, Any], rng: random.Random) -> None:
+        self.id = room_id
+        self.args = args
+        self.stats = stats
+        self.rng = rng
+        self.players: list[Player] = []
+        self.joined = 0
+
+    async def join(self) -> Optional[Player]:
+        self.joined += 1
+        slow = self.rng.random() < self.args.slow_fraction
+        client = AsyncClient(self.args.host, self.args.port, timeout=self.args.timeout,
+                             read_delay=self.args.slow_delay if slow else 0.0)
+        player = Player(f"p{self.joined}", self.id, self.stats["latencies"], self.stats["errors"], client)
+        try:
+            await client.connect()
+        except OSError:
+            self.stats["errors"]["connect"] = self.stats["errors"].get("connect", 0) + 1
+            return None
+        response = await player.timed("JOIN", client.join(player.name, self.id))
+        if response is None or response.status != 20:
+            await client.close()
+            return None
+        self.players.append(player)
+        return player
+
+    async def play_round(self) -> bool:
+        for player in self.players:
+            player.client.drain_events()
+        leader = self.players[0]
+        started = await leader.timed("START", leader.client.start())
+        if started is None or started.status != 40:
+            return False
+        starts = await asyncio.gather(*(player.wait_event("START") for player in self.players))
+        if starts[0] is None:
+            return False
+        game = starts[0].json()
+        await asyncio.sleep(self.args.think_time)
+
+        dropped = [p for p in self.players[1:] if self.rng.random() < self.args.disconnect_fraction]
+        for player in dropped:
+            self.players.remove(player)
+            await player.client.close()
+            self.stats["disconnects"] += 1
+
+        stoppers = {p for p in self.players if self.rng.random() < self.args.stop_fraction} or {self.players[0]}
+
+        async def play(player: Player) -> Optional[Response]:
+            if player not in stoppers and await player.wait_event("STOPPED BY") is None:
+                return None
+            return await player.timed("STOP", player.client.stop(make_answers(game, self.rng)))
+
+        results = await asyncio.gather(*(play(player) for player in self.players))
+        for _ in dropped:
+            await self.join()
+        return all(result is not None and result.status == 10 for result in results)
+
+    async def run(self) -> None:
+        for _ in range(self.args.players):
+            await self.join()
+        if not self.players:
+            return
+        for _ in range(self.args.rounds):
+            if await self.play_round():
+                self.stats["rounds"] += 1
+            else:
+                self.stats["failed_rounds"] += 1
+        for player in self.players:
+            await player.timed("QUIT", player.client.quit())
+            await player.client.close()
+
+
+def percentiles(samples: list[float]) -> dict[str, float]:
+    ordered = sorted(samples)
+
+    def at(fraction: float) -> float:
+        return round(ordered[min(len(ordered) - 1, int(fraction * len(ordered)))] * 1e3, 3)
+
+    return {"count": len(ordered), "p50_ms": at(0.50), "p95_ms": at(0.95), "p99_ms": at(0.99), "max_ms": at(1.0)}
+
+
+class ServerSampler:
+    """
+    Samples the server RSS in a background thread and its CPU time at the ends.
+    """
+
+    def __init__(self, pid: Optional[int], interval: float = 0.2) -> None:
+        self.pid = pid
+        self.interval = interval
+        self.peak_rss = 0
+        self.__done = threading.Event()
+        self.__thread = threading.Thread(target=self.__sample, daemon=True)
+
+    def __sample(self) -> None:
+        while not self.__done.wait(self.interval):
+            self.peak_rss = max(self.peak_rss, rss_bytes(self.pid))  # type: ignore[arg-type]
+
+    def __enter__(self) -> "ServerSampler":
+        if self.pid is not None:
+            self.start_rss = rss_bytes(self.pid)
+            self.start_cpu = cpu_seconds(self.pid)
+            self.__thread.start()
+        return self
+
+    def __exit__(self, *_: Any) -> None:
+        if self.pid is not None:
+            self.__done.set()
+            self.__thread.join()
+            self.end_cpu = cpu_seconds(self.pid)
+            self.end_rss = rss_bytes(self.pid)
+
+    def report(self, elapsed: float) -> Optional[dict[str, Any]]:
+        if self.pid is None:
+            return None
+        cpu = self.end_cpu - self.start_cpu
+        return {
+            "cpu_seconds": round(cpu, 3),
+            "cpu_percent": round(100 * cpu / elapsed, 1),
+            "rss_start_bytes": self.start_rss,
+            "rss_peak_bytes": max(self.peak_rss, self.end_rss),
+            "rss_end_bytes": self.end_rss,
+        }
+
+
+async def run_load(args: argparse.Namespace) -> tuple[dict[str, Any], float]:
+    stats: dict[str, Any] = {"latencies": {}, "errors": {}, "rounds": 0, "failed_rounds": 0, "disconnects": 0}
+    rng = random.Random(args.seed)
+    rooms = [Room(f"{args.room_prefix}{n}", args, stats, random.Random(rng.random())) for n in range(args.rooms)]
+    started = time.perf_counter()
+    await asyncio.gather(*(room.run() for room in rooms))
+    return stats, time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default=None, help="server to load (default: launch one on localhost)")
+    parser.add_argument("--port", type=int, default=None)
+    parser.add_argument("--server-pid", type=int, default=None, help="pid of an external server, for CPU/RSS")
+    parser.add_argument("--mode", choices=("thread", "async"), default="async", help="mode of the launched server")
+    parser.add_argument("--workers", type=int, default=1, help="worker processes of the launched server")
+    parser.add_argument("--scenario", choices=SCENARIOS, default="basic")
+    parser.add_argument("--rooms", type=int, default=10)
+    parser.add_argument("--room-prefix", default="room", help="room ids are this prefix and a number")
+    parser.add_argument("--players", type=int, default=8, help="players per room")
+    parser.add_argument("--rounds", type=int, default=5, help="rounds per room")
+    parser.add_argument("--stop-fraction", type=float, default=None, help="players that STOP without waiting")
+    parser.add_argument("--slow-fraction", type=float, default=None, help="players that read slowly")
+    parser.add_argument("--disconnect-fraction", type=float, default=None, help="players dropping each round")
+    parser.add_argument("--slow-delay", type=float, default=0.05, help="seconds a slow reader waits per message")
+    parser.add_argument("--think-time", type=float, default=0.0, help="seconds between START and the first STOP")
+    parser.add_argument("--timeout", type=float, default=15.0, help="seconds to wait for a response")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=None, help="write the JSON report to this file")
+    args = parser.parse_args()
+
+    stop_fraction, slow_fraction, disconnect_fraction = SCENARIOS[args.scenario]
+    for name, default in (("stop_fraction", stop_fraction), ("slow_fraction", slow_fraction),
+                          ("disconnect_fraction", disconnect_fraction)):
+        if getattr(args, name) is None:
+            setattr(args, name, default)
+
+    raise_open_files_limit()
+    server = None
+    if args.host is None:
+        args.host = "127.0.0.1"
+        args.port = args.port or free_port()
+        server = launch_server(args.port, "--mode", args.mode, "--workers", str(args.workers))
+        args.server_pid = server.pid
+    elif args.port is None:
+        parser.error("--port is required with --host")
+
+    try:
+        with ServerSampler(args.server_pid) as sampler:
+            stats, elapsed = asyncio.run(run_load(args))
+    finally:
+        if server is not None:
+            stop_server(server)
+
+    report = {
+        "config": {key: value for key, value in vars(args).items() if key not in ("output", "server_pid")},
+        "elapsed_seconds": round(elapsed, 3),
+        "rounds": stats["rounds"],
+        "failed_rounds": stats["failed_rounds"],
+        "rounds_per_second": round(stats["rounds"] / elapsed, 2),
+        "disconnects": stats["disconnects"],
+        "latency": {method: percentiles(samples) for method, samples in sorted(stats["latencies"].items())},
+        "errors": stats["errors"],
+        "server": sampler.report(elapsed),
+    }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(output + "\n")
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
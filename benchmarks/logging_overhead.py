@@ -0,0 +1,71 @@
+"""
+Benchmark: time spent logging on the request path.
+
+Each request logs the incoming message and the response. Compares the old
+``print(repr(...))`` lines against ``Logger.message`` (full, sampled at
+10%, and with message logs disabled), writing to /dev/null and to a slow
+stream that takes 1 ms per write, as a terminal that cannot keep up would.
+
+    python benchmarks/logging_overhead.py
+"""
+import json
+import os
+import time
+
+from common import ROOT  # noqa: F401  (puts the server modules on the path)
+from logger import Logger
+
+REQUESTS = 20_000
+REQUEST = "STOP\n" + json.dumps({f"categoria{n}": "Resposta " * 8 for n in range(12)})
+RESPONSE = "10 Stopped\n" + json.dumps([[f"player{n}", n * 5] for n in range(8)])
+
+
+class SlowStream:
+    """
+    A stream that blocks for a while on every write.
+    """
+
+    def __init__(self, delay: float) -> None:
+        self.delay = delay
+
+    def write(self, data: str) -> int:
+        time.sleep(self.delay)
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+
+def with_print(stream, requests: int) -> float:
+    started = time.perf_counter()
+    for _ in range(requests):
+        print(f"> [player] {repr(REQUEST)[1:-1]}", file=stream)
+        print(f"< [player] {repr(RESPONSE)[1:-1]}", file=stream)
+    return (time.perf_counter() - started) / requests
+
+
+def with_logger(logger: Logger, requests: int) -> float:
+    started = time.perf_counter()
+    for _ in range(requests):
+        logger.message("request", "player", REQUEST)
+        logger.message("response", "player", RESPONSE)
+    elapsed = (time.perf_counter() - started) / requests
+    logger.close()
+    return elapsed
+
+
+def main() -> None:
+    print(f"payload: request {len(REQUEST)} chars, response {len(RESPONSE)} chars\n")
+    print(f"{'stream':>10} | {'logging':>18} | {'µs/request':>10} | {'dropped':>7}")
+    with open(os.devnull, "w") as devnull:
+        streams = (("/dev/null", devnull, REQUESTS), ("slow", SlowStream(0.001), 200))
+        for label, stream, requests in streams:
+            print(f"{label:>10} | {'print(repr())':>18} | {with_print(stream, requests) * 1e6:>10.1f} | {'-':>7}")
+            for name, options in (("Logger", {}), ("Logger sample=0.1", {"sample": 0.1}), ("Logger warning", {"level": "warning"})):
+                logger = Logger(stream=stream, **options)
+                per_request = with_logger(logger, requests)
+                print(f"{label:>10} | {name:>18} | {per_request * 1e6:>10.1f} | {logger.dropped:>7}")
+
+
+if __name__ == "__main__":
+    main()
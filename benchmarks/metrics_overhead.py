@@ -0,0 +1,69 @@
+"""
+Benchmark: cost of recording the server metrics.
+
+Every handled command reads the clock twice and observes a histogram, and
+broadcasts also bump a counter, so this measures those operations alone and
+from several threads at once (the thread serving mode records from one
+thread per client), next to a bare ``perf_counter`` call for reference.
+
+    python benchmarks/metrics_overhead.py
+"""
+import threading
+import time
+import timeit
+
+from common import ROOT  # noqa: F401  (puts the server modules on the path)
+from metrics import MetricsRegistry
+
+NUMBER = 200_000
+THREADS = (1, 4, 16)
+
+
+def per_call(stmt, number: int = NUMBER) -> float:
+    return min(timeit.repeat(stmt, number=number, repeat=5)) / number
+
+
+def contended(threads: int, record) -> float:
+    """
+    Returns the wall time per recording with ``threads`` threads recording.
+    """
+    each = NUMBER // threads
+
+    def run() -> None:
+        for _ in range(each):
+            record()
+
+    workers = [threading.Thread(target=run) for _ in range(threads)]
+    started = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return (time.perf_counter() - started) / (each * threads)
+
+
+def main() -> None:
+    metrics = MetricsRegistry()
+    counter = metrics.counter("bench.counter")
+    histogram = metrics.histogram("bench.histogram")
+    perf_counter = time.perf_counter
+
+    def timed() -> None:
+        started = perf_counter()
+        histogram.observe(perf_counter() - started)
+
+    print(f"{'operation':>28} | {'ns/call':>8}")
+    print(f"{'perf_counter()':>28} | {per_call(perf_counter) * 1e9:>8.0f}")
+    print(f"{'Counter.inc()':>28} | {per_call(counter.inc) * 1e9:>8.0f}")
+    print(f"{'Histogram.observe()':>28} | {per_call(lambda: histogram.observe(0.0003)) * 1e9:>8.0f}")
+    print(f"{'timed command (2 clocks)':>28} | {per_call(timed) * 1e9:>8.0f}")
+    print(f"{'snapshot() (per call)':>28} | {per_call(metrics.snapshot, 2_000) * 1e9:>8.0f}")
+
+    print(f"\n{'threads':>8} | {'timed command ns/call (wall)':>28}")
+    for threads in THREADS:
+        print(f"{threads:>8} | {contended(threads, timed) * 1e9:>28.0f}")
+    print(f"\nrecorded {histogram.count} observations, p99 {histogram.percentile(0.99) * 1e6:.0f} µs")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+Benchmark: the leader-order ``Queue`` with 100k members churning.
+
+Members leave from random positions (``Potstop.remove_player``), new ones
+join at the back and the leader is peeked and dequeued
+(``Potstop.remove_leader``). Compares the indexed doubly linked ``Queue``
+against the previous singly linked one, whose ``remove`` walks the list, and
+reports the memory held per member and whether ``len()`` stays exact.
+
+    python benchmarks/queue_churn.py
+"""
+import random
+import time
+import tracemalloc
+from typing import Any
+
+from common import ROOT  # noqa: F401  (puts the server modules on the path)
+from data_structures.queue import Queue
+
+MEMBERS = 100_000
+CYCLES = {"legacy": 200, "indexed": 100_000}
+
+
+class LegacyNode:
+    def __init__(self, value: Any):
+        self.value = value
+        self.next = None
+
+
+class LegacyQueue:
+    """
+    The previous singly linked queue, with its size accounting.
+    """
+
+    def __init__(self) -> None:
+        self.head = None
+        self.tail = None
+        self.size = 0
+
+    def __len__(self) -> int:
+        return self.size
+
+    def peek(self) -> Any:
+        return self.head.value
+
+    def enqueue(self, value: Any) -> None:
+        new_node = LegacyNode(value)
+        if self.head is None:
+            self.head = new_node
+            self.tail = new_node
+        else:
+            self.tail.next = new_node
+            self.tail = new_node
+        self.size += 1
+
+    def dequeue(self) -> Any:
+        if self.head is None:
+            return None
+        value = self.head.value
+        self.head = self.head.next
+        self.size += 1
+        return value
+
+    def remove(self, key: Any) -> Any:
+        current = self.head
+        previous = None
+        while current:
+            if current.value == key:
+                if previous:
+                    previous.next = current.next
+                else:
+                    self.head = current.next
+                if current == self.tail:
+                    self.tail = previous
+                return current.value
+            previous = current
+            current = current.next
+        return None
+
+
+def fill(factory) -> tuple[Any, list[str], int]:
+    names = [f"player{n}" for n in range(MEMBERS)]
+    tracemalloc.start()
+    queue = factory()
+    for name in names:
+        queue.enqueue(name)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return queue, names, size
+
+
+def churn(queue: Any, names: list[str], cycles: int, rng: random.Random) -> float:
+    """
+    Runs ``cycles`` leave/join/leader rounds and returns the time per cycle.
+    """
+    members = list(names)
+    joined = len(members)
+    start = time.perf_counter()
+    for _ in range(cycles):
+        position = rng.randrange(len(members))
+        queue.remove(members[position])
+        members[position] = f"player{joined}"
+        queue.enqueue(members[position])
+        joined += 1
+
+        leader = queue.peek()
+        queue.dequeue()
+        queue.enqueue(leader)
+    return (time.perf_counter() - start) / cycles
+
+
+def main() -> None:
+    print(f"{MEMBERS} members")
+    print(f"{'queue':>8} | {'per cycle':>10} | {'memory/member':>13} | {'len()':>7} | exact")
+    for label, factory in (("legacy", LegacyQueue), ("indexed", Queue)):
+        queue, names, memory = fill(factory)
+        per_cycle = churn(queue, names, CYCLES[label], random.Random(0))
+        print(
+            f"{label:>8} | {per_cycle * 1e6:>7.1f} µs | {memory / MEMBERS:>11.0f} B | "
+            f"{len(queue):>7} | {len(queue) == MEMBERS}"
+        )
+    print("\nmemory/member excludes the name strings; a cycle is one leave, one join and one leader rotation")
+
+
+if __name__ == "__main__":
+    main()
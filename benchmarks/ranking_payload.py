@@ -0,0 +1,67 @@
+"""
+Benchmark: answering a STOP with the ranking, for every player of a room.
+
+After a STOP each waiting handler replies with the ranking. Compares sorting
+the player table and serializing it in every handler (what ``__stop`` and
+``__call_stop`` used to do) against ``Potstop.ranking_payload``, which is
+serialized once per leaderboard version and shared. Also times a rank query
+(``Potstop.get_rank``) against finding the player in a freshly sorted list.
+
+    python benchmarks/ranking_payload.py
+"""
+import json
+import random
+import timeit
+
+from common import ROOT  # noqa: F401  (puts the server modules on the path)
+from potstop import Potstop
+
+ROOM_SIZES = (8, 64, 1_000)
+
+
+def make_game(players: int) -> Potstop:
+    game = Potstop()
+    rng = random.Random(0)
+    for n in range(players):
+        game.add_player(f"player{n}", rng.randrange(0, 500, 5))
+    return game
+
+
+def legacy_replies(game: Potstop, players: list[str]) -> None:
+    for _ in players:
+        ranking = sorted(((name, game.get_points(name)) for name in players), key=lambda i: i[1], reverse=True)
+        f"10 Stopped\n{json.dumps(ranking)}"
+
+
+def shared_replies(game: Potstop, players: list[str]) -> None:
+    game.add_player_points(players[0], 5)  # a new round: the cache is stale
+    for _ in players:
+        f"10 Stopped\n{game.ranking_payload}"
+
+
+def main() -> None:
+    print(f"{'players':>8} | {'sort+dumps each':>15} | {'shared payload':>14} | {'sorted rank':>11} | {'get_rank':>9}")
+    for size in ROOM_SIZES:
+        game = make_game(size)
+        players = game.players
+        number = max(1, 2000 // size)
+        legacy = min(timeit.repeat(lambda: legacy_replies(game, players), number=number, repeat=3)) / number
+        shared = min(timeit.repeat(lambda: shared_replies(game, players), number=number, repeat=3)) / number
+
+        name = players[len(players) // 2]
+        sorted_rank = min(timeit.repeat(
+            lambda: [player for player, _ in sorted(
+                ((player, game.get_points(player)) for player in players), key=lambda i: i[1], reverse=True
+            )].index(name) + 1,
+            number=number, repeat=3,
+        )) / number
+        rank = min(timeit.repeat(lambda: game.get_rank(name), number=1000, repeat=3)) / 1000
+        print(
+            f"{size:>8} | {legacy * 1e3:>12.2f} ms | {shared * 1e3:>11.2f} ms | "
+            f"{sorted_rank * 1e6:>8.1f} µs | {rank * 1e6:>6.1f} µs"
+        )
+    print("\na row answers every player of the room once, after one score change")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""
+Benchmark: ``RingBuffer`` against the linked ``Queue`` and ``collections.deque``.
+
+Measures one-by-one enqueue/dequeue, bulk enqueue/dequeue (``enqueue_many`` /
+``dequeue_many``; ``extend`` and repeated ``popleft`` for deque, a loop for
+Queue), the memory allocated while the queue is full, and the throughput of
+a producer thread feeding a consumer thread through a bounded blocking queue
+(a deque guarded by a ``Condition``, as ``Outbox`` used to be).
+
+    python benchmarks/ring_buffer.py
+"""
+import threading
+import time
+import timeit
+import tracemalloc
+from collections import deque
+
+from common import ROOT  # noqa: F401  (puts the server modules on the path)
+from data_structures.queue import Queue
+from data_structures.ring_buffer import RingBuffer
+
+ITEMS = 10_000
+BATCH = 64
+HANDOFF = 200_000
+CAPACITY = 256
+
+
+def one_by_one(structure: str):
+    items = range(ITEMS)
+    if structure == "RingBuffer":
+        queue = RingBuffer(ITEMS)
+        return lambda: ([queue.enqueue(i) for i in items], [queue.dequeue() for _ in items])
+    if structure == "Queue":
+        linked = Queue()
+        return lambda: ([linked.enqueue(i) for i in items], [linked.dequeue() for _ in items])
+    buffer: deque = deque()
+    return lambda: ([buffer.append(i) for i in items], [buffer.popleft() for _ in items])
+
+
+def bulk(structure: str):
+    batches = [list(range(n, n + BATCH)) for n in range(0, ITEMS, BATCH)]
+    if structure == "RingBuffer":
+        queue = RingBuffer(ITEMS)
+
+        def run() -> None:
+            for batch in batches:
+                queue.enqueue_many(batch)
+            while queue.dequeue_many(BATCH):
+                pass
+        return run
+    if structure == "Queue":
+        linked = Queue()
+
+        def run() -> None:
+            for batch in batches:
+                for item in batch:
+                    linked.enqueue(item)
+            while not linked.is_empty():
+                [linked.dequeue() for _ in range(min(BATCH, len(linked)))]
+        return run
+    buffer: deque = deque()
+
+    def run() -> None:
+        for batch in batches:
+            buffer.extend(batch)
+        while buffer:
+            [buffer.popleft() for _ in range(min(BATCH, len(buffer)))]
+    return run
+
+
+def memory(structure: str) -> int:
+    tracemalloc.start()
+    if structure == "RingBuffer":
+        queue = RingBuffer(ITEMS)
+        queue.enqueue_many(range(ITEMS))
+    elif structure == "Queue":
+        queue = Queue()
+        for i in range(ITEMS):
+            queue.enqueue(i)
+    else:
+        queue = deque(range(ITEMS))
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del queue
+    return size
+
+
+class ConditionDeque:
+    """
+    A bounded blocking deque, the previous Outbox storage.
+    """
+
+    def __init__(self, capacity: int) -> None:
+        self.items: deque = deque()
+        self.capacity = capacity
+        self.lock = threading.Lock()
+        self.ready = threading.Condition(self.lock)
+        self.room = threading.Condition(self.lock)
+
+    def enqueue(self, value, timeout=None) -> bool:
+        with self.lock:
+            self.room.wait_for(lambda: len(self.items) < self.capacity, timeout)
+            self.items.append(value)
+            self.ready.notify()
+            return True
+
+    def dequeue(self, timeout=None):
+        with self.lock:
+            self.ready.wait_for(lambda: self.items, timeout)
+            self.room.notify()
+            return self.items.popleft()
+
+
+def handoff(queue, bulk_consumer: bool) -> float:
+    """
+    Returns the items per second passed from a producer to a consumer thread.
+    """
+    def consume() -> None:
+        received = 0
+        while received < HANDOFF:
+            if bulk_consumer:
+                received += len(queue.dequeue_many(timeout=None))
+            else:
+                queue.dequeue(timeout=None)
+                received += 1
+
+    consumer = threading.Thread(target=consume)
+    start = time.perf_counter()
+    consumer.start()
+    for i in range(HANDOFF):
+        queue.enqueue(i, timeout=None)
+    consumer.join()
+    return HANDOFF / (time.perf_counter() - start)
+
+
+def main() -> None:
+    print(f"{ITEMS} items")
+    print(f"{'structure':>10} | {'one by one':>10} | {'bulk':>10} | {'memory':>9}")
+    for structure in ("RingBuffer", "Queue", "deque"):
+        single = min(timeit.repeat(one_by_one(structure), number=1, repeat=5))
+        batched = min(timeit.repeat(bulk(structure), number=1, repeat=5))
+        print(f"{structure:>10} | {single * 1e3:>7.2f} ms | {batched * 1e3:>7.2f} ms | {memory(structure) / 1024:>6.0f} KB")
+
+    print(f"\nproducer -> consumer, capacity {CAPACITY}, {HANDOFF} items")
+    print(f"{'RingBuffer (dequeue)':>26} | {handoff(RingBuffer(CAPACITY), False):>9.0f} items/s")
+    print(f"{'RingBuffer (dequeue_many)':>26} | {handoff(RingBuffer(CAPACITY), True):>9.0f} items/s")
+    print(f"{'deque + Condition':>26} | {handoff(ConditionDeque(CAPACITY), False):>9.0f} items/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Benchmark: drawing the letter and categories of a round with
+``rounds.RoundPlanner`` against the generator it replaced (which rebuilt
+the letter weights and called ``random.choices`` every round), how often
+back-to-back rounds repeat a letter or category each way, and planning many
+rooms at once with ``rounds.plan_rooms`` against one planner per room.
+
+    python benchmarks/round_planning.py
+"""
+import random
+import time
+import timeit
+
+from common import ROOT  # noqa: F401  (puts the server modules on the path)
+import pots
+from rounds import RoundPlanner, plan_rooms
+
+ROUNDS = 20_000
+BULK = ((1_000, 20), (10_000, 20), (10_000, 100))
+
+
+def legacy_round(rng: random.Random) -> tuple[str, list[str]]:
+    """
+    The previous ``__gen_pots`` + ``__gen_letter``.
+    """
+    chosen = [rng.choice(pot) for pot in pots.pots]
+    letters = [chr(i) for i in range(65, 91)]
+    weights = [5] * 26
+    rare = (
+        ("Z", 1), ("X", 1), ("Q", 2),
+        ("H", 2), ("K", 2), ("Y", 1),
+        ("W", 1)
+    )
+    for letter, weight in rare:
+        weights[ord(letter) - 65] = weight
+    return rng.choices(letters, weights=weights, k=1)[0], chosen
+
+
+def repeats(rounds: list[tuple[str, list[str]]]) -> tuple[float, float]:
+    """
+    Fraction of rounds repeating the previous letter, and of categories
+    repeating the previous round's.
+    """
+    letters = sum(a[0] == b[0] for a, b in zip(rounds, rounds[1:]))
+    categories = sum(x == y for a, b in zip(rounds, rounds[1:]) for x, y in zip(a[1], b[1]))
+    return letters / (len(rounds) - 1), categories / ((len(rounds) - 1) * len(pots.pots))
+
+
+def main() -> None:
+    rng = random.Random(0)
+    planner = RoundPlanner(seed=0)
+    number = 20_000
+    legacy = min(timeit.repeat(lambda: legacy_round(rng), number=number, repeat=3)) / number
+    planned = min(timeit.repeat(planner.next, number=number, repeat=3)) / number
+    print(f"one round: legacy {legacy * 1e6:.2f} µs, RoundPlanner {planned * 1e6:.2f} µs")
+
+    legacy_repeats = repeats([legacy_round(rng) for _ in range(ROUNDS)])
+    planner_repeats = repeats([tuple(plan) for plan in RoundPlanner(seed=1).plan(ROUNDS)])
+    print(f"back-to-back repeats over {ROUNDS} rounds:")
+    print(f"  legacy:       letter {legacy_repeats[0]:.1%}, categories {legacy_repeats[1]:.1%}")
+    print(f"  RoundPlanner: letter {planner_repeats[0]:.1%}, categories {planner_repeats[1]:.1%}\n")
+
+    print(f"{'rooms':>7} | {'rounds':>6} | {'planners':>10} | {'plan_rooms':>10} | speedup")
+    for rooms, rounds in BULK:
+        start = time.perf_counter()
+        for room in range(rooms):
+            RoundPlanner(seed=room).plan(rounds)
+        scalar = time.perf_counter() - start
+        start = time.perf_counter()
+        plan_rooms(rooms, rounds, seed=0)
+        bulk = time.perf_counter() - start
+        print(f"{rooms:>7} | {rounds:>6} | {scalar * 1e3:>7.0f} ms | {bulk * 1e3:>7.0f} ms | {scalar / bulk:>6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Benchmark: scoring a round with ``Potstop.compute_round_points`` against the
+per-player ``count_words`` + ``compute_points`` path, for growing rooms.
+Also checks that both give every player the same points.
+
+    python benchmarks/round_scoring.py
+"""
+import random
+import timeit
+
+from common import ROOT  # noqa: F401  (puts the server modules on the path)
+from potstop import Potstop
+
+ROOM_SIZES = (8, 64, 256, 1000)
+
+
+def make_round(game: Potstop, players: int, seed: int = 0) -> list[tuple[str, dict[str, str]]]:
+    """
+    Builds the answers of a round: each player picks answers from a small pool
+    per category, so some are unique and some repeated, and a few are invalid.
+    """
+    rng = random.Random(seed)
+    letter = game.letter
+    pools = {
+        pot: [f"{letter}{rng.choice('aeiou')}{rng.choice('lmnrst')}{rng.choice('aeiou')}{i}" for i in range(players // 2 + 2)]
+        + ["", "x", f"{letter}aaaa"]
+        for pot in game.pots
+    }
+    return [(f"player{p}", {pot: rng.choice(pool) for pot, pool in pools.items()}) for p in range(players)]
+
+
+def legacy_scoring(game: Potstop, answers: list[tuple[str, dict[str, str]]]) -> None:
+    words = game.count_words([data for _, data in answers])
+    for name, data in answers:
+        game.compute_points(name, data, words)
+
+
+def reset_players(game: Potstop, answers: list[tuple[str, dict[str, str]]]) -> None:
+    for name, _ in answers:
+        game.remove_player(name)
+        game.add_player(name, 0)
+
+
+def main() -> None:
+    print(f"{'players':>8} | {'legacy':>10} | {'batched':>10} | speedup | identical")
+    for players in ROOM_SIZES:
+        game = Potstop()
+        game.start_game()
+        answers = make_round(game, players)
+
+        reset_players(game, answers)
+        legacy_scoring(game, answers)
+        expected = {name: game.get_points(name) for name, _ in answers}
+        reset_players(game, answers)
+        game.compute_round_points(answers)
+        identical = all(game.get_points(name) == points for name, points in expected.items())
+
+        number = max(1, 2000 // players)
+        legacy = min(timeit.repeat(lambda: legacy_scoring(game, answers), number=number, repeat=3)) / number
+        batched = min(timeit.repeat(lambda: game.compute_round_points(answers), number=number, repeat=3)) / number
+        print(f"{players:>8} | {legacy * 1e3:>7.2f} ms | {batched * 1e3:>7.2f} ms | {legacy / batched:>6.1f}x | {identical}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Benchmark: rounds per second as the server gets more worker processes.
+
+For each worker count, launches ``server/server.py --workers N`` (N = 1 is
+the plain single process) and drives it with several ``loadgen.py``
+processes at once, each playing its own rooms, so the load generator is not
+the bottleneck. Reports the total rounds per second, the speedup over one
+worker and the latency percentiles of START and STOP. The CPU time of the
+server (dispatcher plus workers) is read from ``/proc``, so Linux only.
+
+Scaling is bounded by the cores left once the load generators take theirs:
+on a machine with few cores the figures stay flat.
+
+    python benchmarks/worker_scaling.py --workers 1 2 4 --clients 4
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from common import ROOT, cpu_seconds, free_port, launch_server, raise_open_files_limit, stop_server
+
+LOADGEN = Path(__file__).resolve().parent / "loadgen.py"
+
+
+def children(pid: int) -> list[int]:
+    """
+    Returns the pids of the direct children of a process.
+    """
+    found = []
+    for task in os.listdir(f"/proc/{pid}/task"):
+        with open(f"/proc/{pid}/task/{task}/children") as file:
+            found += [int(child) for child in file.read().split()]
+    return found
+
+
+def run(workers: int, args: argparse.Namespace) -> dict:
+    port = free_port()
+    server = launch_server(port, "--mode", args.mode, "--workers", str(workers), "--log-level", "warning")
+    time.sleep(1)  # the workers start after the dispatcher accepts connections
+    pids = [server.pid, *children(server.pid)]
+    cpu_before = sum(cpu_seconds(pid) for pid in pids)
+    with tempfile.TemporaryDirectory() as tmp:
+        outputs = [Path(tmp) / f"client{n}.json" for n in range(args.clients)]
+        started = time.perf_counter()
+        clients = [
+            subprocess.Popen(
+                [sys.executable, str(LOADGEN), "--host", "127.0.0.1", "--port", str(port),
+                 "--rooms", str(args.rooms), "--players", str(args.players), "--rounds", str(args.rounds),
+                 "--room-prefix", f"c{n}-room", "--seed", str(n), "--output", str(output)],
+                stdout=subprocess.DEVNULL, cwd=ROOT,
+            )
+            for n, output in enumerate(outputs)
+        ]
+        for client in clients:
+            client.wait()
+        elapsed = time.perf_counter() - started
+        cpu = sum(cpu_seconds(pid) for pid in pids) - cpu_before
+        stop_server(server)
+        reports = [json.loads(output.read_text()) for output in outputs]
+
+    latency = {
+        method: {key: max(report["latency"][method][key] for report in reports) for key in ("p50_ms", "p99_ms")}
+        for method in ("START", "STOP")
+    }
+    return {
+        "workers": workers,
+        "rounds": sum(report["rounds"] for report in reports),
+        "failed_rounds": sum(report["failed_rounds"] for report in reports),
+        "rounds_per_second": sum(report["rounds"] for report in reports) / elapsed,
+        "server_cpu_seconds": cpu,
+        "latency": latency,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--clients", type=int, default=4, help="load generator processes")
+    parser.add_argument("--mode", choices=("thread", "async"), default="async")
+    parser.add_argument("--rooms", type=int, default=20, help="rooms per load generator")
+    parser.add_argument("--players", type=int, default=6)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+    raise_open_files_limit()
+
+    print(f"cores: {os.cpu_count()}, load generators: {args.clients}, mode: {args.mode}\n")
+    print(f"{'workers':>7} | {'rounds/s':>8} | {'speedup':>7} | {'server cpu':>10} | "
+          f"{'START p50/p99 ms':>16} | {'STOP p50/p99 ms':>15} | {'failed':>6}")
+    baseline = None
+    for workers in args.workers:
+        result = run(workers, args)
+        baseline = baseline or result["rounds_per_second"]
+        start, stop = result["latency"]["START"], result["latency"]["STOP"]
+        print(
+            f"{workers:>7} | {result['rounds_per_second']:>8.1f} | {result['rounds_per_second'] / baseline:>6.2f}x | "
+            f"{result['server_cpu_seconds']:>9.2f}s | {start['p50_ms']:>7.2f}/{start['p99_ms']:<8.2f} | "
+            f"{stop['p50_ms']:>7.2f}/{stop['p99_ms']:<7.2f} | {result['failed_rounds']:>6}"
+        )
+
+
+if __name__ == "__main__":
+    main()
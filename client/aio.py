@@ -0,0 +1,274 @@
+"""
+Headless asyncio client of the POP protocol, for bots and tooling.
+
+Unlike ``client.client.Client``, it does not import Textual, uses no
+threads and does not reconnect: each connection is one reader task, so a
+single process can drive thousands of sessions.
+
+    async with AsyncClient("localhost", 8888) as client:
+        await client.join("Davi", "sala-1")
+        await client.start()
+        async for event in client:
+            if event.kind == "START":
+                await client.stop({pot: "Arara" for pot in event.json()["pots"]})
+                break
+        await client.quit()
+"""
+import asyncio
+import json
+from itertools import count
+from typing import Any, AsyncIterator, NamedTuple, Optional
+
+from client.framing import FrameDecoder, FrameError, encode_frame, split_request_id
+
+
+class Response(NamedTuple):
+    """
+    The response to a request: "20 Joined" has status 20 and reason "Joined".
+    """
+
+    status: int
+    reason: str
+    body: str
+
+    @property
+    def ok(self) -> bool:
+        """
+        Statuses ending in 0 are successes; the others (and "0 Bad Request")
+        are errors.
+        """
+        return self.status >= 10 and self.status % 10 == 0
+
+    def json(self) -> Any:
+        return json.loads(self.body)
+
+
+class Event(NamedTuple):
+    """
+    A message the server sent without being asked (a broadcast): "START"
+    with the round as JSON, or "STOPPED BY" with the name of a player.
+    """
+
+    kind: str
+    body: str
+
+    def json(self) -> Any:
+        return json.loads(self.body)
+
+
+def parse_response(message: str) -> Response:
+    status_line, _, body = message.partition("\n")
+    status_line, _ = split_request_id(status_line)
+    status, _, reason = status_line.partition(" ")
+    return Response(int(status), reason, body)
+
+
+def parse_event(message: str) -> Event:
+    if message.startswith("STOPPED BY "):
+        return Event("STOPPED BY", message[len("STOPPED BY "):])
+    kind, _, body = message.partition("\n")
+    return Event(kind, body)
+
+
+class AsyncClient:
+    """
+    A POP connection driven by asyncio.
+
+    Every request is tagged with an id and awaits the response with the
+    same id, so several requests may be in flight at once. Broadcasts are
+    queued as ``Event``s and read by iterating over the client (or with
+    ``next_event``); when the queue holds ``max_events`` events, the oldest
+    is dropped (counted in ``dropped_events``). The iteration ends when the
+    connection closes.
+
+    Requests raise ``asyncio.TimeoutError`` if the response takes more than
+    ``timeout`` seconds and ``ConnectionError`` if the connection is lost.
+
+    **Public methods:**
+
+    * connect: None - Opens the connection.
+    * request: Response - Sends any request and waits for its response.
+    * join, start, stop, quit, stats: Response - Send the POP methods.
+    * next_event: Event - Waits for the next event (of a kind).
+    * close: None - Closes the connection.
+    """
+
+    def __init__(
+        self,
+        host: str = "localhost",
+        port: int = 8888,
+        timeout: Optional[float] = 4.0,
+        max_events: int = 1024,
+        read_delay: float = 0.0,
+    ) -> None:
+        """
+        Args:
+            host (str): The server host.
+            port (int): The server port.
+            timeout (Optional[float]): Seconds to wait for a response (None
+                waits forever).
+            max_events (int): Events kept until they are read.
+            read_delay (float): Seconds waited after reading each message,
+                to simulate a slow client.
+        """
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.read_delay = read_delay
+        self.dropped_events = 0
+        self.__events: asyncio.Queue[Optional[Event]] = asyncio.Queue(max_events)
+        self.__pending: dict[str, asyncio.Future[Response]] = {}
+        self.__request_ids = count(1)
+        self.__writer: Optional[asyncio.StreamWriter] = None
+        self.__reader_task: Optional[asyncio.Task] = None
+        self.__closed = False
+
+    @property
+    def connected(self) -> bool:
+        return self.__writer is not None and not self.__closed
+
+    async def connect(self) -> None:
+        """
+        Opens the connection and starts reading from it.
+
+        Raises:
+            OSError: If the server cannot be reached.
+        """
+        reader, self.__writer = await asyncio.open_connection(self.host, self.port)
+        self.__reader_task = asyncio.create_task(self.__read(reader))
+
+    async def __aenter__(self) -> "AsyncClient":
+        await self.connect()
+        return self
+
+    async def __aexit__(self, *_: Any) -> None:
+        await self.close()
+
+    def __aiter__(self) -> AsyncIterator[Event]:
+        return self.__iterate()
+
+    async def __iterate(self) -> AsyncIterator[Event]:
+        while (event := await self.__events.get()) is not None:
+            yield event
+        self.__events.put_nowait(None)  # later iterations end too
+
+    async def request(self, method: str, data: Optional[str] = None) -> Response:
+        """
+        Sends a request tagged with a new id and waits for its response.
+
+        Args:
+            method (str): The POP method (e.g. "JOIN").
+            data (Optional[str]): The lines following the method, if any.
+        """
+        if self.__writer is None or self.__closed:
+            raise ConnectionError("not connected")
+        request_id = str(next(self.__request_ids))
+        future: asyncio.Future[Response] = asyncio.get_running_loop().create_future()
+        self.__pending[request_id] = future
+        msg = f"{method} #{request_id}" if data is None else f"{method} #{request_id}\n{data}"
+        try:
+            self.__writer.write(encode_frame(msg))
+            return await asyncio.wait_for(future, self.timeout)
+        finally:
+            self.__pending.pop(request_id, None)
+
+    async def join(self, name: str, room: Optional[str] = None) -> Response:
+        return await self.request("JOIN", name if room is None else f"{name}\n{room}")
+
+    async def start(self) -> Response:
+        return await self.request("START")
+
+    async def stop(self, answers: dict[str, str]) -> Response:
+        """
+        Sends the answers of the round; the body of the response is the
+        ranking as JSON.
+        """
+        return await self.request("STOP", json.dumps(answers))
+
+    async def quit(self) -> Response:
+        return await self.request("QUIT")
+
+    async def stats(self) -> Response:
+        return await self.request("STATS")
+
+    async def next_event(self, kind: Optional[str] = None, timeout: Optional[float] = None) -> Event:
+        """
+        Waits for the next event, skipping the ones of other kinds if
+        ``kind`` is given.
+
+        Raises:
+            asyncio.TimeoutError: If no such event arrives within ``timeout``.
+            ConnectionError: If the connection closes first.
+        """
+        async def wait() -> Event:
+            while (event := await self.__events.get()) is not None:
+                if kind is None or event.kind == kind:
+                    return event
+            self.__events.put_nowait(None)
+            raise ConnectionError("connection closed")
+
+        return await asyncio.wait_for(wait(), timeout)
+
+    def drain_events(self) -> None:
+        """
+        Discards the events not read yet.
+        """
+        while not self.__events.empty():
+            if self.__events.get_nowait() is None:
+                self.__events.put_nowait(None)
+                break
+
+    async def close(self) -> None:
+        """
+        Closes the connection and waits for the reader to stop.
+        """
+        if self.__writer is not None:
+            self.__writer.close()
+            try:
+                await self.__writer.wait_closed()
+            except OSError:
+                pass
+        if self.__reader_task is not None:
+            await self.__reader_task
+
+    async def __read(self, reader: asyncio.StreamReader) -> None:
+        decoder = FrameDecoder()
+        try:
+            while data := await reader.read(65536):
+                for msg in decoder.feed(data):
+                    if self.read_delay:
+                        await asyncio.sleep(self.read_delay)
+                    if msg.upper() == "ENDC" or not msg:
+                        return
+                    if msg[0].isdigit():
+                        self.__resolve(msg)
+                    else:
+                        self.__push(parse_event(msg))
+        except (OSError, FrameError, UnicodeDecodeError):
+            pass
+        finally:
+            self.__closed = True
+            for future in self.__pending.values():
+                if not future.done():
+                    future.set_exception(ConnectionError("connection lost"))
+            self.__pending.clear()
+            self.__push(None)
+
+    def __resolve(self, msg: str) -> None:
+        """
+        Resolves the request answered by a response. Responses without a
+        known id (e.g. to requests that timed out) are discarded.
+        """
+        _, request_id = split_request_id(msg.partition("\n")[0])
+        future = self.__pending.pop(request_id, None) if request_id else None
+        if future is not None and not future.done():
+            try:
+                future.set_result(parse_response(msg))
+            except ValueError as e:
+                future.set_exception(e)
+
+    def __push(self, event: Optional[Event]) -> None:
+        if self.__events.full():
+            self.__events.get_nowait()
+            self.dropped_events += 1
+        self.__events.put_nowait(event)
@@ -2,9 +2,13 @@ import threading
 import socket
 import time
 import errno
+from concurrent.futures import Future, TimeoutError
+from itertools import count
 from json import dumps
 from typing import Callable, Optional
 
+from client.framing import FrameDecoder, FrameError, encode_frame, split_request_id
+
 
 class Client:
     """Client class for managing communication with a server.    
@@ -12,6 +16,10 @@ class Client:
     This class provides methods to send various commands to the server, such as
     joining, starting, stopping, and quitting. It also handles receiving messages
     from the server and reconnecting in case of connection issues.
+
+    Every request is tagged with an id and gets a future that is resolved by the
+    receiving thread as soon as the matching response arrives, so several
+    requests may be in flight at the same time.
     """
     
     def __init__(
@@ -22,7 +30,8 @@ class Client:
         self.__server_port = 8888
         self.__client_sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
         self.__on_message = on_message
-        self.__pending_responses: dict[str, Optional[str]] = {}
+        self.__pending_responses: dict[str, Future[str]] = {}
+        self.__request_ids = count(1)
         self.__lock = threading.Lock()
 
     def send_username_to_server(self, username: str) -> tuple[str, str]:
@@ -44,10 +53,7 @@ class Client:
         """
         
         try:
-            self.__pending_responses["JOIN"] = None
-            self.__client_sock.sendall(f"JOIN\n{username}".encode())
-
-            return self.__retrieve_response("JOIN")
+            return self.__retrieve_response(self.send_request("JOIN", username))
         except Exception as e:
             return ("99", f"Ocorreu um erro: ({e.__str__()})! Tente novamente.")
 
@@ -66,10 +72,7 @@ class Client:
         """
         
         try:
-            self.__pending_responses["START"] = None
-            self.__client_sock.sendall("START".encode())
-
-            return self.__retrieve_response("START")
+            return self.__retrieve_response(self.send_request("START"))
         except Exception as e:
             return ("99", f"Ocorreu um erro: ({e.__str__()})! Tente novamente.")
 
@@ -93,14 +96,7 @@ class Client:
         """
         
         try:
-            self.__pending_responses["STOP"] = None
-            self.__client_sock.sendall(
-                f'STOP\n{dumps(pots)}'.encode()
-            )
-
-            response = self.__retrieve_response("STOP")
-
-            return response
+            return self.__retrieve_response(self.send_request("STOP", dumps(pots)))
         except Exception as e:
             return ("99", f"Ocorreu um erro: ({e.__str__()})! Tente novamente.")
         
@@ -119,28 +115,57 @@ class Client:
         """
         
         try:
-            self.__pending_responses["QUIT"] = None
-            self.__client_sock.sendall(
-                'QUIT'.encode()
-            )
-
-            response = self.__retrieve_response("QUIT")
-
-            return response
+            return self.__retrieve_response(self.send_request("QUIT"))
         except Exception as e:
             return ("99", f"Ocorreu um erro: ({e.__str__()})! Tente novamente.")
 
-    def __retrieve_response(self, request_method: str, timeout: int = 4):
+    def send_request(self, method: str, data: Optional[str] = None) -> Future[str]:
+        """
+        Sends a request tagged with a new id, without waiting for the response.
+
+        The returned future is resolved with the raw response (without the id)
+        as soon as it is received, which allows pipelining several requests.
+
+        Args:
+            method (str): The POP method (e.g. "JOIN").
+            data (Optional[str]): The lines following the method, if any.
+
+        Returns:
+            Future[str]: The future response of the server.
+
+        Raises:
+            OSError: If the request could not be sent.
+        """
+
+        request_id = str(next(self.__request_ids))
+        future: Future[str] = Future()
+        with self.__lock:
+            self.__pending_responses[request_id] = future
+
+        def forget(_: Future[str]) -> None:
+            with self.__lock:
+                self.__pending_responses.pop(request_id, None)
+
+        future.add_done_callback(forget)
+
+        msg = f"{method} #{request_id}" if data is None else f"{method} #{request_id}\n{data}"
+        try:
+            self.__client_sock.sendall(encode_frame(msg))
+        except OSError:
+            future.cancel()
+            raise
+        return future
+
+    def __retrieve_response(self, future: Future[str], timeout: int = 4):
         """
-        Retrieves a response for a given request method within a specified timeout period.
+        Waits for the response of a request within a specified timeout period.
 
-        This method continuously checks for a response associated with the given 
-        request method in the `__pending_responses` dictionary. If a response is 
-        found within the timeout period, it is returned. Otherwise, a timeout 
-        message is returned.
+        The future is resolved by the receiving thread the moment the response
+        arrives, so this returns right away instead of polling. If the response
+        does not arrive within the timeout period, a timeout message is returned.
 
         Args:
-            request_method (str): The method name for which the response is being retrieved.
+            future (Future[str]): The future returned by `send_request`.
             timeout (int, optional): The maximum time (in seconds) to wait for a response. 
                                      Defaults to 4 seconds.
 
@@ -150,43 +175,40 @@ class Client:
                 str: The response message or an error message if the timeout is reached.
 
         Raises:
-            AssertionError: If the response retrieved from `__pending_responses` is None.
+            ConnectionError: If the connection was lost before the response arrived.
         """
         
-        started_at = time.time()
-
-        while time.time() - started_at < timeout:
-            with self.__lock:
-                if self.__pending_responses[request_method] is not None:
-                    response = self.__pending_responses.pop(request_method)
-                    assert response is not None
-                    return (response[1:2], response[3:])
-
-            time.sleep(0.5)
+        try:
+            response = future.result(timeout)
+        except TimeoutError:
+            future.cancel()
+            return ("9", "Tempo limite para resposta do servidor!")
 
-        return ("9", "Tempo limite para resposta do servidor!")
+        return (response[1:2], response[3:])
 
     def __receive_messages(self):
         """
         Handles receiving messages from the client socket in a continuous loop in a thread.
         
-        This method listens for incoming messages from the server and processes them
-        based on their content. It supports handling specific response types, invoking
+        This method listens for incoming frames from the server, reassembles them into
+        messages and processes each one based on its content. It supports handling specific response types, invoking
         a callback for general messages, and managing connection errors.
         
         **Message Handling:**
-            - If the message starts with a digit, it is treated as a response type
-              and stored in the `__pending_responses` dictionary.
+            - If the message starts with a digit, it is treated as a response and
+              resolves the future of the request with the same id.
             - If the message does not start with a digit, it is passed to the
               `__on_message` callback in a separate thread.
-            - If the message is "ENDC" (case-insensitive) or empty, the loop terminates.
+            - If the message is "ENDC" (case-insensitive) or the connection is closed,
+              the loop terminates.
             
         **Exceptions:**
-            - Handles `ConnectionResetError` and `ConnectionAbortedError` gracefully
-              by breaking the loop and closing the socket.
+            - Handles `ConnectionResetError`, `ConnectionAbortedError` and malformed
+              frames gracefully by breaking the loop and closing the socket.
               
         **Post-Processing:**
-            - Closes the client socket after exiting the loop.
+            - Closes the client socket after exiting the loop and fails the pending
+              requests with `ConnectionError`.
             - Attempts to reconnect the client by calling `__reconnect_client`.
             
         **Note:**
@@ -197,35 +219,58 @@ class Client:
             None directly, but exceptions during socket operations are caught and handled.
         """
         
-        while True:
-            try:
-                msg = self.__client_sock.recv(1024).decode()
+        decoder = FrameDecoder()
+        ended = False
 
-                if msg.upper() == "ENDC" or not msg:
+        while not ended:
+            try:
+                data = self.__client_sock.recv(65536)
+                if not data:
                     break
-                
-                code = msg[0]
-
-                if code.isdigit():                    
-                    response_types = {
-                        "1": 'STOP',
-                        "2": 'JOIN',
-                        "3": 'QUIT',
-                        "4": 'START',                        
-                    }
-                    
-                    with self.__lock:
-                        self.__pending_responses[response_types[code]] = msg
-                            
-                else:
-                    threading.Thread(target=self.__on_message, args=(msg,), daemon=True).start()
-
-            except (ConnectionResetError, ConnectionAbortedError):
+
+                for msg in decoder.feed(data):
+                    if msg.upper() == "ENDC" or not msg:
+                        ended = True
+                        break
+
+                    code = msg[0]
+
+                    if code.isdigit():
+                        self.__resolve_response(msg)
+
+                    else:
+                        threading.Thread(target=self.__on_message, args=(msg,), daemon=True).start()
+
+            except (ConnectionResetError, ConnectionAbortedError, FrameError, UnicodeDecodeError):
                 break
 
         self.__client_sock.close()
+        with self.__lock:
+            pending = list(self.__pending_responses.values())
+            self.__pending_responses.clear()
+        for future in pending:
+            if future.set_running_or_notify_cancel():
+                future.set_exception(ConnectionError("Conexão com o servidor perdida"))
         self.__reconnect_client()
 
+    def __resolve_response(self, msg: str) -> None:
+        """
+        Resolves the future of the request answered by a response.
+
+        Responses without a known id (e.g. answers to requests that already
+        timed out) are discarded.
+
+        Args:
+            msg (str): The response received from the server.
+        """
+
+        status, sep, body = msg.partition("\n")
+        status, request_id = split_request_id(status)
+        with self.__lock:
+            future = self.__pending_responses.pop(request_id, None) if request_id else None
+        if future is not None and future.set_running_or_notify_cancel():
+            future.set_result(f"{status}{sep}{body}")
+
     def connect(self, host: Optional[str] = None, port: Optional[int] = None):
         """
         Establishes a connection to the server using the specified host and port.
@@ -0,0 +1,58 @@
+import random
+from typing import Sequence
+
+import numpy as np
+
+
+class AliasTable:
+    """
+    Weighted sampling of indexes with Walker's alias method.
+
+    The weights are turned once into two tables of ``n`` columns: column
+    ``i`` keeps index ``i`` with probability ``probability[i]`` and gives
+    ``alias[i]`` otherwise. A sample picks a uniform column and flips that
+    biased coin, so it costs O(1) however many weights there are, whereas
+    ``random.choices`` builds the cumulative weights and bisects them on
+    every call. Building the table is O(n).
+    """
+
+    def __init__(self, weights: Sequence[float]):
+        n = len(weights)
+        total = float(sum(weights))
+        if n == 0 or total <= 0 or min(weights) < 0:
+            raise ValueError("weights must be non-negative and not all zero")
+        scaled = [weight * n / total for weight in weights]
+        self.probability = [1.0] * n
+        self.alias = list(range(n))
+        small = [i for i, p in enumerate(scaled) if p < 1]
+        large = [i for i, p in enumerate(scaled) if p >= 1]
+        while small and large:
+            less, more = small.pop(), large.pop()
+            self.probability[less] = scaled[less]
+            self.alias[less] = more
+            scaled[more] -= 1 - scaled[less]
+            (small if scaled[more] < 1 else large).append(more)
+        # Whatever is left is 1 up to rounding errors: those columns keep their index
+        self.__probability = np.array(self.probability)
+        self.__alias = np.array(self.alias, dtype=np.intp)
+
+    def __len__(self) -> int:
+        return len(self.probability)
+
+    def sample(self, rng: random.Random) -> int:
+        """
+        Returns an index drawn with probability proportional to its weight.
+        """
+        n = len(self.probability)
+        u = rng.random() * n
+        column = min(int(u), n - 1)  # u can round up to n
+        return column if u - column < self.probability[column] else self.alias[column]
+
+    def sample_many(self, generator: np.random.Generator, count: int) -> np.ndarray:
+        """
+        Returns ``count`` indexes drawn at once.
+        """
+        n = len(self.probability)
+        u = generator.random(count) * n
+        columns = np.minimum(u.astype(np.intp), n - 1)
+        return np.where(u - columns < self.__probability[columns], columns, self.__alias[columns])
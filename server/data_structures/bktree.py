@@ -0,0 +1,151 @@
+from typing import Callable, Iterable, Optional
+
+
+def levenshtein(a: str, b: str) -> int:
+    """
+    Returns the edit distance between two strings: the fewest insertions,
+    deletions and substitutions of a character turning one into the other.
+
+    Uses the bit-parallel algorithm of Myers (as formulated by Hyyrö): each
+    column of the dynamic programming matrix is kept as bit vectors in two
+    ints, so the cost is a few int operations per character of the longer
+    string instead of one step per pair of characters.
+    """
+    if len(a) < len(b):
+        a, b = b, a
+    # A common prefix or suffix (the usual case for typos) does not change the distance
+    start = 0
+    while start < len(b) and a[start] == b[start]:
+        start += 1
+    end = 0
+    while end < len(b) - start and a[-1 - end] == b[-1 - end]:
+        end += 1
+    a, b = a[start:len(a) - end], b[start:len(b) - end]
+    if not b:
+        return len(a)
+
+    positions: dict[str, int] = {}
+    for i, c in enumerate(b):
+        positions[c] = positions.get(c, 0) | 1 << i
+    full = (1 << len(b)) - 1
+    last = 1 << (len(b) - 1)
+    vp, vn, distance = full, 0, len(b)
+    for c in a:
+        eq = positions.get(c, 0)
+        xv = eq | vn
+        xh = (((eq & vp) + vp) ^ vp) | eq
+        hp = vn | (~(xh | vp) & full)
+        hn = vp & xh
+        if hp & last:
+            distance += 1
+        elif hn & last:
+            distance -= 1
+        hp = (hp << 1 | 1) & full
+        hn = (hn << 1) & full
+        vp = hn | (~(xv | hp) & full)
+        vn = hp & xv
+    return distance
+
+
+class _Node:
+    __slots__ = ("word", "children")
+
+    def __init__(self, word: str):
+        self.word = word
+        self.children: dict[int, "_Node"] = {}  # distance to this node -> child
+
+
+class BKTree:
+    """
+    A Burkhard-Keller tree: a metric index of words for finding the ones
+    within a distance of a query.
+
+    Every child of a node hangs under its distance to the node. By the
+    triangle inequality, a search for words within ``d`` of a query at
+    distance ``k`` from a node only has to descend into the children at
+    distances ``k - d`` to ``k + d``, so for small ``d`` it compares the
+    query with a small part of the tree instead of with every word.
+
+    The distance defaults to ``levenshtein``; any metric works. The tree is
+    not thread-safe.
+    """
+
+    def __init__(self, words: Iterable[str] = (), distance: Callable[[str, str], int] = levenshtein):
+        self.__root: Optional[_Node] = None
+        self.__size = 0
+        self.__distance = distance
+        for word in words:
+            self.add(word)
+
+    def __len__(self) -> int:
+        return self.__size
+
+    def __contains__(self, word: str) -> bool:
+        return self.nearest(word, 0) is not None
+
+    def add(self, word: str) -> bool:
+        """
+        Adds a word.
+
+        Returns:
+            False if the word was already in the tree.
+        """
+        if self.__root is None:
+            self.__root = _Node(word)
+            self.__size = 1
+            return True
+        node = self.__root
+        while True:
+            distance = self.__distance(word, node.word)
+            if distance == 0:
+                return False
+            child = node.children.get(distance)
+            if child is None:
+                node.children[distance] = _Node(word)
+                self.__size += 1
+                return True
+            node = child
+
+    def search(self, word: str, max_distance: int) -> list[tuple[int, str]]:
+        """
+        Returns the (distance, word) pairs of the words within ``max_distance``
+        of ``word``, closest first.
+        """
+        found = []
+        stack = [self.__root] if self.__root is not None else []
+        while stack:
+            node = stack.pop()
+            distance = self.__distance(word, node.word)
+            if distance <= max_distance:
+                found.append((distance, node.word))
+            for k in range(max(1, distance - max_distance), distance + max_distance + 1):
+                child = node.children.get(k)
+                if child is not None:
+                    stack.append(child)
+        found.sort(key=lambda pair: pair[0])
+        return found
+
+    def nearest(self, word: str, max_distance: int) -> Optional[tuple[int, str]]:
+        """
+        Returns the (distance, word) pair of the closest word within
+        ``max_distance`` of ``word``, or None if there is none.
+
+        The search radius shrinks as closer words are found, so it prunes
+        more of the tree than ``search``.
+        """
+        best: Optional[tuple[int, str]] = None
+        radius = max_distance
+        stack = [self.__root] if self.__root is not None else []
+        while stack:
+            node = stack.pop()
+            distance = self.__distance(word, node.word)
+            if distance <= radius:
+                best = (distance, node.word)
+                if distance == 0:
+                    break
+                radius = distance - 1  # only closer words matter now
+            for k in range(max(1, distance - radius), distance + radius + 1):
+                child = node.children.get(k)
+                if child is not None:
+                    stack.append(child)
+        return best
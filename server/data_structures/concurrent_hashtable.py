@@ -0,0 +1,171 @@
+import threading
+from typing import Any, Iterator, Optional, Sequence
+
+from .hashtable import HashTable
+
+_FIBONACCI = 0x9E3779B97F4A7C15  # 2**64 / golden ratio
+_MASK64 = (1 << 64) - 1
+
+
+class ConcurrentHashTable:
+    """
+    A thread-safe HashTable, split into independent stripes.
+
+    Each key belongs to one stripe: a HashTable guarded by its own lock, so
+    threads working on keys of different stripes never wait for each other.
+    The stripe is picked from the top bits of the key's hash (Fibonacci
+    hashing), leaving the low bits, which the stripe's HashTable uses for its
+    buckets, evenly spread.
+
+    Resizing never stops the world: a stripe grows or shrinks on its own,
+    under its own lock, while the other stripes keep serving reads and writes.
+    Listings (keys, items, values) lock one stripe at a time, so they wait at
+    most for one short write and never for a whole batch of writes. They are
+    consistent per stripe, and ordered by insertion within each stripe only.
+    """
+
+    def __init__(self, stripes: int = 16, size: int = 500, probing: str = "linear"):
+        """
+        Args:
+            stripes: The number of stripes, rounded up to a power of two.
+            size: The initial number of slots of the whole table.
+            probing: The probing strategy of every stripe (see HashTable).
+        """
+        bits = max(0, stripes - 1).bit_length()
+        self.__shift = 64 - bits
+        self.__locks = [threading.Lock() for _ in range(1 << bits)]
+        self.__tables = [HashTable(max(8, size >> bits), probing) for _ in range(1 << bits)]
+
+    def __stripe(self, key: Any) -> int:
+        """
+        Returns the index of the stripe holding the key.
+        """
+        return ((hash(key) * _FIBONACCI) & _MASK64) >> self.__shift
+
+    def put(self, key: Any, value: Any) -> None:
+        """
+        Inserts or replaces the value of the key.
+        """
+        stripe = self.__stripe(key)
+        with self.__locks[stripe]:
+            self.__tables[stripe].put(key, value)
+
+    def update(self, *args: Sequence[tuple[Any, Any]]) -> None:
+        """
+        Inserts several (key, value) pairs.
+        """
+        for key, value in args:
+            self.put(key, value)
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        self.put(key, value)
+
+    def get(self, key: Any) -> Any:
+        """
+        Returns the value of the key.
+
+        Raises:
+            KeyError: If the key is not in the table.
+        """
+        stripe = self.__stripe(key)
+        with self.__locks[stripe]:
+            return self.__tables[stripe].get(key)
+
+    def __getitem__(self, key: Any) -> Any:
+        return self.get(key)
+
+    def add(self, key: Any, amount: Any) -> Optional[Any]:
+        """
+        Atomically adds ``amount`` to the value of the key.
+
+        Returns:
+            The new value, or None if the key is not in the table.
+        """
+        stripe = self.__stripe(key)
+        with self.__locks[stripe]:
+            table = self.__tables[stripe]
+            if key not in table:
+                return None
+            value = table.get(key) + amount
+            table.put(key, value)
+            return value
+
+    def remove(self, key: Any) -> Any:
+        """
+        Removes the key and returns its value.
+
+        Raises:
+            KeyError: If the key is not in the table.
+        """
+        stripe = self.__stripe(key)
+        with self.__locks[stripe]:
+            return self.__tables[stripe].remove(key)
+
+    def discard(self, key: Any) -> Optional[Any]:
+        """
+        Removes the key if it is in the table.
+
+        Returns:
+            The value of the removed key, or None if it was not in the table.
+        """
+        stripe = self.__stripe(key)
+        with self.__locks[stripe]:
+            table = self.__tables[stripe]
+            return table.remove(key) if key in table else None
+
+    def __delitem__(self, key: Any) -> None:
+        self.remove(key)
+
+    def __contains__(self, key: Any) -> bool:
+        stripe = self.__stripe(key)
+        with self.__locks[stripe]:
+            return key in self.__tables[stripe]
+
+    def __iter__(self) -> Iterator:
+        return iter(self.keys())
+
+    def items(self) -> list[tuple]:
+        """
+        Returns the (key, value) pairs of every stripe.
+        """
+        items = []
+        for lock, table in zip(self.__locks, self.__tables):
+            with lock:
+                items.extend(table.items())
+        return items
+
+    def keys(self) -> list:
+        """
+        Returns the keys of every stripe.
+        """
+        keys = []
+        for lock, table in zip(self.__locks, self.__tables):
+            with lock:
+                keys.extend(table.keys())
+        return keys
+
+    def values(self) -> list:
+        """
+        Returns the values of every stripe.
+        """
+        values = []
+        for lock, table in zip(self.__locks, self.__tables):
+            with lock:
+                values.extend(table.values())
+        return values
+
+    def __len__(self) -> int:
+        return sum(len(table) for table in self.__tables)
+
+    def probe_stats(self) -> list[dict[str, Any]]:
+        """
+        Returns ``HashTable.probe_stats`` of every stripe.
+        """
+        stats = []
+        for lock, table in zip(self.__locks, self.__tables):
+            with lock:
+                stats.append(table.probe_stats())
+        return stats
+
+    def __str__(self) -> str:
+        return "{" + ", ".join(f"{key}:{value}" for key, value in self.items()) + "}"
@@ -1,81 +1,255 @@
-import numpy as np
-from typing import Any, Sequence
+from array import array
+from typing import Any, Iterator, Sequence
+
+_EMPTY = -1    # slot do índice nunca usado
+_DUMMY = -2    # slot do índice cuja entrada foi removida
+_REMOVED = object()  # buraco deixado nas listas densas por uma remoção
+
+PROBING = ('linear', 'triangular', 'robinhood') # estratégias de sondagem
 
 
 class HashTable(object):
     '''
-    Implementação de uma tabela hash com tratamento de colisão por 
-    sondagem linear (linear probing) e redimensionamento automático 
-    da tabela hash quando o fator de carga máximo é atingido.
+    Implementação de uma tabela hash com tratamento de colisão por
+    sondagem (linear, triangular ou Robin Hood, escolhida na construção)
+    e redimensionamento automático
+    da tabela hash quando o fator de carga máximo é atingido ou quando
+    a ocupação cai muito (a tabela encolhe).
+
+    A tabela usa o layout compacto (o mesmo do dict do Python):
+    um índice esparso (array de inteiros, com o menor tipo que comporta
+    as posições) onde a sondagem acontece e que aponta para listas densas
+    de chaves e valores, mantidas em ordem de inserção. Assim, listar e
+    percorrer as entradas e redimensionar a tabela custam proporcionalmente
+    à quantidade de entradas, e não ao tamanho do índice. O hash de cada
+    chave é guardado junto da entrada e nunca é recalculado.
+
+    Estratégias de sondagem (PROBING):
+    * linear: bucket, bucket+1, bucket+2, ...
+    * triangular: bucket, bucket+1, bucket+3, bucket+6, ... (números
+      triangulares; com índice potência de 2, visita todos os slots e
+      espalha os agrupamentos da sondagem linear)
+    * robinhood: sondagem linear em que a entrada que está mais longe do seu
+      bucket de origem toma o slot da que está mais perto. As sequências
+      de sondagem ficam curtas e uniformes, a busca por chave ausente
+      termina cedo e a remoção desloca as entradas seguintes para trás,
+      sem deixar slots _DUMMY.
+
+    O método probe_stats() informa o comprimento médio e máximo de sondagem,
+    o fator de carga e a quantidade de redimensionamentos, para comparar as
+    estratégias com cargas de trabalho reais.
 
-    A tabela hash armazena em cada bucket uma tupla com o par
-    chave/valor.
-    O código funciona com qualquer tipo de chave e valor.
+    O código funciona com qualquer tipo de chave (hashable) e valor.
 
-    Dependência: instalação do numpy
-    
     Autor: Prof. Alex Sandro da Cunha Rêgo
     Última modificação: 03/09/2024
     '''
 
-    def __init__(self, size = 500):
+    def __init__(self, size = 500, probing = 'linear'):
         '''
-        Construtor da classe HashTable, sem argumentos.
-        Inicializa a tabela hash com 500 posições, fator de carga 
-        máximo de 70%.
-        Utiliza tratamento de colisão por sondagem linear (linear probing).
+        Construtor da classe HashTable.
+        Inicializa o índice com pelo menos 500 posições (arredondado
+        para uma potência de 2), fator de carga máximo de 70%.
+        Utiliza tratamento de colisão por sondagem linear (linear probing),
+        a menos que outra estratégia seja informada.
+        Argumentos
+        ----------
+        size (int): quantidade mínima de slots do índice
+        probing (str): estratégia de sondagem, uma de PROBING
+        Raise
+        -----
+        ValueError: se a estratégia de sondagem não existir
         '''
+        if probing not in PROBING:
+            raise ValueError(f'estrategia de sondagem {probing} invalida, use uma de {PROBING}')
+        self.__probing = probing
+        self.__robin_hood = probing == 'robinhood'
+        self.__growth = 1 if probing == 'triangular' else 0 # incremento do passo de sondagem
         self.__load_factor = 0.70  # fator de carga máximo 70%
-        self.__length = 0          # quantidade de buckets ocupados
-        self.__table = np.full(size, None) # tabela hash usando um array numpy
+        self.__length = 0          # quantidade de entradas na tabela
+        self.__resizes = 0         # quantidade de redimensionamentos
+        self.__indices = self.__new_index(size) # índice esparso
+        self.__hashes: list = []   # hash de cada chave, calculado uma única vez
+        self.__keys: list = []     # chaves, em ordem de inserção
+        self.__values: list = []   # valores, na mesma ordem das chaves
 
-    def __hash(self, key:Any)->int:
+    @staticmethod
+    def __new_index(size:int)->array:
         '''
-        Calcula o hash da chave, utilizando o método de resto da divisão
-        (Hash modular)
+        Cria um índice vazio com a menor potência de 2 maior ou igual a size.
+        Cada slot usa o menor inteiro com sinal capaz de guardar as posições
+        das listas densas (1, 2, 4 ou 8 bytes).
         Argumentos
         ----------
-        key (Any): chave de mapeamento
+        size (int): quantidade mínima de slots
+        Retorno
+        -------
+        array: array de inteiros preenchido com _EMPTY
+        '''
+        capacity = 8
+        while capacity < size:
+            capacity *= 2
+        for typecode in 'bhiq':
+            if capacity <= 1 << (8 * array(typecode).itemsize - 1):
+                break
+        return array(typecode, [_EMPTY]) * capacity
+
+    def __hash(self, hashcode:int)->int:
+        '''
+        Calcula o bucket a partir do hash da chave, utilizando o método de
+        resto da divisão (Hash modular). Como o tamanho do índice é potência
+        de 2, o resto é calculado com uma máscara de bits.
+        Argumentos
+        ----------
+        hashcode (int): hash da chave de mapeamento, hash(key)
         Retorno
         -------
         int: índice (bucket) mapeado para a tabela hash
         '''
-        return hash(key) % len(self.__table)
+        return hashcode & (len(self.__indices) - 1)
 
-    def __rehash(self, bucket:Any)->int:
+    def __rehash(self, bucket:Any, step:int)->int:
         '''
-        Realiza o rehashing do bucket em colisão utilizando o cálculo por sondagem linear.
+        Realiza o rehashing do bucket em colisão. O passo é sempre 1 na
+        sondagem linear (e na Robin Hood) e cresce de 1 em 1 na triangular.
         Argumentos
         ----------
         bucket (int): índice do bucket em colisão
+        step (int): distância até o próximo bucket
         Retorno
         -------
         int: índice do próximo bucket
         '''
-        return (bucket + 1) % len(self.__table)
+        return (bucket + step) & (len(self.__indices) - 1)
 
-    def __search(self, key:Any):
+    def __distance(self, bucket:int, entry:int)->int:
         '''
-        Retorna o bucket correspondente a uma determinada chave na tabela hash.
+        Calcula a distância (na sondagem linear) entre o bucket onde a
+        entrada está e o seu bucket de origem. Usado pela Robin Hood.
+        Argumentos
+        ----------
+        bucket (int): bucket onde a entrada está
+        entry (int): posição da entrada nas listas densas
+        Retorno
+        -------
+        int: quantidade de slots entre o bucket de origem e o bucket atual
+        '''
+        return (bucket - self.__hash(self.__hashes[entry])) & (len(self.__indices) - 1)
+
+    def __lookup(self, key:Any, hashcode:int)->tuple[int, int]:
+        '''
+        Procura a chave no índice. As chaves só são comparadas quando
+        os hashes guardados coincidem.
+        Argumentos
+        ----------
+        key (Any): chave a ser pesquisada
+        hashcode (int): hash da chave, hash(key)
+        Retorno
+        -------
+        tuple[int, int]: o bucket e a posição da entrada nas listas densas.
+            Se a chave não existir, a posição é _EMPTY e o bucket é o primeiro
+            bucket livre da sequência de sondagem (onde a chave seria inserida;
+            na Robin Hood a inserção é feita por __place).
+        '''
+        indices = self.__indices
+        hashes = self.__hashes
+        keys = self.__keys
+        mask = len(indices) - 1
+        bucket = hashcode & mask # o mesmo que self.__hash(hashcode)
+        if self.__robin_hood:
+            distance = 0
+            while True:
+                entry = indices[bucket]
+                # slot vazio ou entrada mais perto da origem do que a chave
+                # estaria: a chave não está na tabela
+                if entry == _EMPTY or ((bucket - (hashes[entry] & mask)) & mask) < distance:
+                    return bucket, _EMPTY
+                if hashes[entry] == hashcode:
+                    stored = keys[entry]
+                    if stored is key or stored == key:
+                        return bucket, entry
+                bucket = (bucket + 1) & mask
+                distance += 1
+
+        step = 1
+        growth = self.__growth
+        free = -1
+        while True:
+            entry = indices[bucket]
+            if entry == _EMPTY:
+                return (bucket if free < 0 else free), _EMPTY
+            if entry == _DUMMY:
+                if free < 0:
+                    free = bucket
+            elif hashes[entry] == hashcode:
+                stored = keys[entry]
+                if stored is key or stored == key:
+                    return bucket, entry
+            bucket = (bucket + step) & mask # o mesmo que self.__rehash(bucket, step)
+            step += growth
+
+    def __place(self, entry:int):
+        '''
+        Insere a posição da entrada no índice, no primeiro slot vazio da sua
+        sequência de sondagem. Na Robin Hood, a entrada toma o slot de qualquer
+        entrada que esteja mais perto da origem e a entrada deslocada continua
+        a sondagem a partir dali.
+        Argumentos
+        ----------
+        entry (int): posição da entrada nas listas densas
+        '''
+        indices = self.__indices
+        bucket = self.__hash(self.__hashes[entry])
+        if self.__robin_hood:
+            distance = 0
+            while indices[bucket] != _EMPTY:
+                resident = indices[bucket]
+                resident_distance = self.__distance(bucket, resident)
+                if resident_distance < distance:
+                    indices[bucket] = entry
+                    entry, distance = resident, resident_distance
+                bucket = self.__rehash(bucket, 1)
+                distance += 1
+        else:
+            step = 1
+            while indices[bucket] != _EMPTY:
+                bucket = self.__rehash(bucket, step)
+                step += self.__growth
+        indices[bucket] = entry
+
+    def __unlink(self, bucket:int):
+        '''
+        Retira uma entrada do índice. Na Robin Hood, as entradas seguintes
+        que não estão no seu bucket de origem voltam um slot (backward shift),
+        assim nenhum slot _DUMMY é necessário; nas demais, o slot vira _DUMMY.
+        Argumentos
+        ----------
+        bucket (int): bucket da entrada removida
+        '''
+        indices = self.__indices
+        if not self.__robin_hood:
+            indices[bucket] = _DUMMY
+            return
+        following = self.__rehash(bucket, 1)
+        while indices[following] != _EMPTY and self.__distance(following, indices[following]) > 0:
+            indices[bucket] = indices[following]
+            bucket, following = following, self.__rehash(following, 1)
+        indices[bucket] = _EMPTY
+
+    def __search(self, key:Any)->int:
+        '''
+        Retorna a posição nas listas densas correspondente a uma determinada chave.
         Argumentos:
             key(Any): chave a ser pesquisada
         Retorna:
-            bucket(int): índice da chave na tabela hash
+            entry(int): posição da entrada nas listas densas
         Raise
             KeyError: se a chave não for encontrada na tabela hash
         '''
-        bucket = self.__hash(key)
-        if self.__table[bucket] is None:
+        _, entry = self.__lookup(key, hash(key))
+        if entry == _EMPTY:
             raise KeyError(f'Key {key} not found')
-        if self.__table[bucket][0] != key:
-            original_bucket = bucket
-            while self.__table[bucket][0] != key:
-                bucket = self.__rehash(bucket)
-                if self.__table[bucket] is None:
-                    raise KeyError(f'Key {key} not found')
-                if bucket == original_bucket:
-                    raise KeyError(f'Key {key} not found')
-        return bucket
+        return entry
 
     def put(self, key:Any, value:Any):
         '''
@@ -86,25 +260,29 @@ class HashTable(object):
         key (Any): chave de mapeamento
         value (Any): valor associado à chave
         '''
-        slot = self.__hash(key) # calcula o hash modular da chave
-        
-        while self.__table[slot] not in [None,'X'] and \
-              self.__table[slot][0] != key:
-            slot = self.__rehash(slot)
-
-        if self.__table[slot] in [None,'X']:
-            self.__length += 1
+        hashcode = hash(key)
+        bucket, entry = self.__lookup(key, hashcode)
+        if entry != _EMPTY:
+            self.__values[entry] = value
+            return
 
-        tuple = (key, value)
-        self.__table[slot] = tuple
-        # Teste do fator de carga
-        if (self.__length / float(len(self.__table))) >= self.__load_factor:
+        self.__hashes.append(hashcode)
+        self.__keys.append(key)
+        self.__values.append(value)
+        if self.__robin_hood:
+            self.__place(len(self.__keys) - 1)
+        else:
+            self.__indices[bucket] = len(self.__keys) - 1
+        self.__length += 1
+        # Teste do fator de carga: as listas densas contam as entradas
+        # vivas e os buracos, que ocupam slots _DUMMY no índice
+        if (len(self.__keys) / float(len(self.__indices))) >= self.__load_factor:
             self.__resize()
 
     def update(self, *args: Sequence[tuple[Any, Any]]):
-        """ 
+        """
         Insere várias chaves/valor na tabela hash.
-        
+
         Argumentos
         ---------
         *args (Sequence[tuple[Any, Any]]):  Várias tuplas
@@ -128,8 +306,7 @@ class HashTable(object):
         -----
         KeyError: se a chave não for encontrada na tabela hash
         '''
-        index = self.__search(key)
-        return self.__table[index][1]
+        return self.__values[self.__search(key)]
 
     def __getitem__(self, key:Any)->Any:
         '''
@@ -142,7 +319,7 @@ class HashTable(object):
         Any: valor associado à chave (de qualquer tipo)
         '''
         return self.get(key)
-    
+
     def remove(self, key:Any)->Any:
         '''
         Elimina a entrada da tabela hash correspondente à chave de busca
@@ -150,19 +327,28 @@ class HashTable(object):
             key(Any): chave a ser removida
         Retorna:
             data(Any): valor associado à chave removida
+        Raise
+            KeyError: se a chave não for encontrada na tabela hash
         Observação:
-            A chave é substituída por 'X' para indicar que o bucket está livre
-            e impedir a busca infinita, ou seja, quando um slot dentro de 
-            um agrupamento é removido e os slots seguintes não são alcançados.
-        '''
-        bucket = self.__search(key)
-        data = None
-        if bucket is not None:
-            data = self.__table[bucket][1] 
-            self.__table[bucket] = 'X'
-            self.__length -= 1
-            return data
-        raise KeyError(f'chave {key} nao encontrada')
+            O slot do índice é marcado como _DUMMY para indicar que o bucket está
+            livre e impedir a busca infinita, ou seja, quando um slot dentro de
+            um agrupamento é removido e os slots seguintes não são alcançados
+            (na Robin Hood, as entradas seguintes são deslocadas, ver __unlink).
+            A entrada vira um buraco (_REMOVED) nas listas densas, descartado
+            no próximo redimensionamento. Se a ocupação cair abaixo de 1/16
+            do índice, a tabela encolhe.
+        '''
+        bucket, entry = self.__lookup(key, hash(key))
+        if entry == _EMPTY:
+            raise KeyError(f'chave {key} nao encontrada')
+        data = self.__values[entry]
+        self.__unlink(bucket)
+        self.__keys[entry] = _REMOVED
+        self.__values[entry] = None
+        self.__length -= 1
+        if self.__length * 16 < len(self.__indices) and len(self.__indices) > 8:
+            self.__resize()
+        return data
 
     def __delitem__(self, key):
         self.remove(key)
@@ -176,72 +362,121 @@ class HashTable(object):
         Retorna:
             bool: True se a chave estiver na tabela de dispersão e False caso contrário.
         '''
-        try:
-            self.__search(key)
-            return True
-        except KeyError:
-            return False
+        return self.__lookup(key, hash(key))[1] != _EMPTY
+
+    def __iter__(self)->Iterator:
+        '''
+        Percorre as chaves da tabela hash em ordem de inserção
+        '''
+        return (key for key in self.__keys if key is not _REMOVED)
 
     def items(self)->list[tuple]:
         '''
-        Método que retorna um list com todos os pares chave/valor da tabela de dispersão.
+        Método que retorna um list com todos os pares chave/valor da tabela de dispersão,
+        em ordem de inserção.
         Retorna:
-            list(tuple): lista de tuplas com todos os pares chave/valor 
+            list(tuple): lista de tuplas com todos os pares chave/valor
         '''
-        return [tuple for tuple in self.__table if tuple not in [None,'X']]
+        return [(key, value) for key, value in zip(self.__keys, self.__values) if key is not _REMOVED]
 
     def keys(self)->list:
         '''
-        Retorna uma lista com todas as chaves da tabela hash
+        Retorna uma lista com todas as chaves da tabela hash, em ordem de inserção
         '''
-        return [tuple[0] for tuple in self.__table if (tuple is not None and tuple != 'X')]
+        return [key for key in self.__keys if key is not _REMOVED]
 
     def values(self)->list:
         '''
-        Retorna uma lista com todos os valores da tabela hash
+        Retorna uma lista com todos os valores da tabela hash, em ordem de inserção
         '''
-        return [tuple[1] for tuple in self.__table if tuple is not None]
- 
+        return [value for key, value in zip(self.__keys, self.__values) if key is not _REMOVED]
+
     def __len__(self)->int:
         '''
         Retorna a quantidade de elementos na tabela hash
         '''
         return self.__length
+
     def __resize(self):
         '''
-        Redimensiona a tabela hash para o dobro do seu tamanho.
-        Uma nova tabela é criada e os elementos da tabela antiga são 
-        inseridos na nova tabela. Haverá todo o transporte de dados,
-        novo rehashing e novo tratamento de colisão.
+        Reconstrói o índice a partir das entradas vivas, descartando os
+        buracos das listas densas e os slots _DUMMY do índice.
+        O novo índice tem a menor potência de 2 com pelo menos o dobro das
+        entradas vivas: cresce quando a tabela enche, mantém o tamanho quando
+        o fator de carga foi atingido por causa das remoções e encolhe quando
+        a ocupação caiu. Só as entradas vivas são percorridas, usando os
+        hashes guardados (hash() não é chamado de novo).
+        '''
+        if self.__length != len(self.__keys):
+            live = [entry for entry, key in enumerate(self.__keys) if key is not _REMOVED]
+            self.__hashes = [self.__hashes[entry] for entry in live]
+            self.__keys = [self.__keys[entry] for entry in live]
+            self.__values = [self.__values[entry] for entry in live]
+
+        self.__indices = self.__new_index(self.__length * 2)
+        for entry in range(self.__length):
+            self.__place(entry)
+        self.__resizes += 1
+
+    def probe_stats(self)->dict[str, Any]:
+        '''
+        Gancho de instrumentação: mede a tabela no estado atual, refazendo a
+        sondagem de cada chave presente.
+        Retorno
+        -------
+        dict[str, Any]: dicionário com
+            probing (str): estratégia de sondagem
+            length (int): quantidade de entradas
+            capacity (int): quantidade de slots do índice
+            load_factor (float): slots ocupados (entradas e _DUMMY) / capacity
+            avg_probe (float): média de slots visitados para achar uma chave
+            max_probe (int): maior quantidade de slots visitados para achar uma chave
+            resizes (int): quantidade de redimensionamentos desde a criação
         '''
-        new_size = len(self.__table) * 2 # dobra o tamanho da tabela
-        old_table = self.__table
-        self.__table = [None] * new_size
-        self.__length = 0
-        for tuple in old_table:
-            if tuple is not None:
-                self[tuple[0]] = tuple[1]
+        indices = self.__indices
+        total = longest = occupied = 0
+        for slot in indices:
+            if slot == _EMPTY:
+                continue
+            occupied += 1
+            if slot == _DUMMY:
+                continue
+            bucket = self.__hash(self.__hashes[slot])
+            probes = step = 1
+            while indices[bucket] != slot:
+                bucket = self.__rehash(bucket, step)
+                step += self.__growth
+                probes += 1
+            total += probes
+            longest = max(longest, probes)
+        return {
+            'probing': self.__probing,
+            'length': self.__length,
+            'capacity': len(indices),
+            'load_factor': occupied / len(indices),
+            'avg_probe': total / self.__length if self.__length else 0.0,
+            'max_probe': longest,
+            'resizes': self.__resizes,
+        }
 
     def showHashTable(self):
         entrada = -1
         print('+--+')
-        for item in self.__table:
+        for slot in self.__indices:
             entrada += 1
-            print(f'|{entrada:2d}| = ', end='') 
-            print(f' {item}')
+            print(f'|{entrada:2d}| = ', end='')
+            if slot == _EMPTY:
+                print(' None')
+            elif slot == _DUMMY:
+                print(' X')
+            else:
+                print(f' {(self.__keys[slot], self.__values[slot])}')
         print('+--+')
-    
+
     def __str__(self):
         '''
-        Método que retorna uma string com o conteúdo da tabela de dispersão.        
+        Método que retorna uma string com o conteúdo da tabela de dispersão.
         Retorno:
             str: string no formato: {chave1:valor1, chave2:valor2, ...}
         '''
-        str = '{'
-        for i,key in enumerate(self.__table):
-            if key == None or key == 'X':
-                continue
-            str += f'{self.__table[i][0]}:{self.__table[i][1]}, '
-        str = str.rstrip(', ')
-        str += '}'
-        return str
+        return '{' + ', '.join(f'{key}:{value}' for key, value in self.items()) + '}'
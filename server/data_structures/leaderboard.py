@@ -0,0 +1,194 @@
+import random
+import threading
+from itertools import count
+from typing import Any, Optional
+
+MAX_LEVEL = 32
+P = 0.25  # chance of a node reaching the next level
+
+
+class _Node:
+    __slots__ = ("name", "points", "key", "next", "span")
+
+    def __init__(self, name: Any, points: int, key: tuple, level: int):
+        self.name = name
+        self.points = points
+        self.key = key  # (-points, join order): best first, ties by join order
+        self.next: list[Optional["_Node"]] = [None] * level
+        self.span = [0] * level  # ranks skipped by following next[i]
+
+
+class Leaderboard:
+    """
+    Players ordered by points, kept sorted as points change.
+
+    An indexable skip list: every forward link records how many ranks it
+    skips, so inserting, removing, changing the points of a player and
+    finding a player's rank are O(log n), and the top k players are read in
+    O(k). Players with the same points keep the order in which they joined.
+
+    Every change bumps ``version``, so callers can cache anything derived
+    from the ranking (e.g. its serialized form) until the next change.
+    The leaderboard is thread-safe.
+    """
+
+    def __init__(self, seed: Optional[int] = None):
+        self.__head = _Node(None, 0, (), MAX_LEVEL)
+        self.__level = 1
+        self.__nodes: dict[Any, _Node] = {}
+        self.__order = count()
+        self.__random = random.Random(seed)
+        self.__lock = threading.Lock()
+        self.version = 0
+
+    def __len__(self) -> int:
+        return len(self.__nodes)
+
+    def __contains__(self, name: Any) -> bool:
+        return name in self.__nodes
+
+    def add(self, name: Any, points: int = 0) -> None:
+        """
+        Adds a player, or sets the points of a player already there (who
+        then ranks as if they had just joined).
+        """
+        with self.__lock:
+            if name in self.__nodes:
+                self.__unlink(self.__nodes.pop(name))
+            self.__insert(name, points, next(self.__order))
+            self.version += 1
+
+    def add_points(self, name: Any, delta: int) -> Optional[int]:
+        """
+        Adds ``delta`` to the points of a player and moves them to their new rank.
+
+        Returns:
+            The new points, or None if the player is not on the leaderboard.
+        """
+        with self.__lock:
+            node = self.__nodes.get(name)
+            if node is None:
+                return None
+            if delta:
+                del self.__nodes[name]
+                self.__unlink(node)
+                self.__insert(name, node.points + delta, node.key[1])
+                self.version += 1
+            return node.points + delta
+
+    def discard(self, name: Any) -> Optional[int]:
+        """
+        Removes a player.
+
+        Returns:
+            The points of the removed player, or None if they were not there.
+        """
+        with self.__lock:
+            node = self.__nodes.pop(name, None)
+            if node is None:
+                return None
+            self.__unlink(node)
+            self.version += 1
+            return node.points
+
+    def points(self, name: Any) -> Optional[int]:
+        """
+        Returns the points of a player, or None if they are not there.
+        """
+        node = self.__nodes.get(name)
+        return None if node is None else node.points
+
+    def rank(self, name: Any) -> Optional[int]:
+        """
+        Returns the rank of a player (1 for the leader), or None if they are
+        not there.
+        """
+        with self.__lock:
+            node = self.__nodes.get(name)
+            if node is None:
+                return None
+            rank = 0
+            current = self.__head
+            for i in reversed(range(self.__level)):
+                while current.next[i] is not None and current.next[i].key <= node.key:
+                    rank += current.span[i]
+                    current = current.next[i]
+                if current is node:
+                    return rank
+            return None
+
+    def top(self, k: int) -> list[tuple[Any, int]]:
+        """
+        Returns the (name, points) of the first ``k`` players, best first.
+        """
+        with self.__lock:
+            return self.__walk(k)
+
+    def items(self) -> list[tuple[Any, int]]:
+        """
+        Returns the (name, points) of every player, best first.
+        """
+        with self.__lock:
+            return self.__walk(len(self.__nodes))
+
+    def snapshot(self) -> tuple[int, list[tuple[Any, int]]]:
+        """
+        Returns the version and the full ranking, read atomically.
+        """
+        with self.__lock:
+            return self.version, self.__walk(len(self.__nodes))
+
+    def __walk(self, k: int) -> list[tuple[Any, int]]:
+        ranking = []
+        current = self.__head.next[0]
+        while current is not None and len(ranking) < k:
+            ranking.append((current.name, current.points))
+            current = current.next[0]
+        return ranking
+
+    def __random_level(self) -> int:
+        level = 1
+        while level < MAX_LEVEL and self.__random.random() < P:
+            level += 1
+        return level
+
+    def __insert(self, name: Any, points: int, order: int) -> None:
+        key = (-points, order)
+        update = [self.__head] * MAX_LEVEL
+        rank = [0] * MAX_LEVEL
+        current = self.__head
+        for i in reversed(range(self.__level)):
+            rank[i] = 0 if i == self.__level - 1 else rank[i + 1]
+            while current.next[i] is not None and current.next[i].key < key:
+                rank[i] += current.span[i]
+                current = current.next[i]
+            update[i] = current
+
+        level = self.__random_level()
+        if level > self.__level:
+            for i in range(self.__level, level):
+                self.__head.span[i] = len(self.__nodes)
+            self.__level = level
+
+        node = _Node(name, points, key, level)
+        for i in range(level):
+            node.next[i] = update[i].next[i]
+            update[i].next[i] = node
+            node.span[i] = update[i].span[i] - (rank[0] - rank[i])
+            update[i].span[i] = rank[0] - rank[i] + 1
+        for i in range(level, self.__level):
+            update[i].span[i] += 1
+        self.__nodes[name] = node
+
+    def __unlink(self, node: _Node) -> None:
+        current = self.__head
+        for i in reversed(range(self.__level)):
+            while current.next[i] is not None and current.next[i].key < node.key:
+                current = current.next[i]
+            if current.next[i] is node:
+                current.span[i] += node.span[i] - 1
+                current.next[i] = node.next[i]
+            else:
+                current.span[i] -= 1
+        while self.__level > 1 and self.__head.next[self.__level - 1] is None:
+            self.__level -= 1
@@ -1,31 +1,43 @@
 from typing import Any
 
 class Node:
+    __slots__ = ("value", "next", "prev", "twin")
+
     def __init__(self, value: Any):
         self.value = value
-        self.next = None    
-    
+        self.next = None
+        self.prev = None
+        self.twin = None  # next node holding an equal value
+
 class Queue:
     """
-    A Queue data structure, implemented as a linked list.
+    A Queue data structure, implemented as a doubly linked list.
+
+    An index maps each value to the node of its first occurrence, so
+    membership, remove, peek and dequeue are O(1). Equal values are chained
+    through ``Node.twin`` in queue order; enqueueing a repeated value walks
+    that chain. Values must be hashable.
     """
     def __init__(self):
         self.head = None
         self.tail = None
         self.size = 0
-    
+        self.__index: dict[Any, Node] = {}
+
     def __len__(self) -> int:
         """
         Returns the size of the queue.
         """
         return self.size
-        
+
     def peek(self) -> Any:
         """
-        Returns the value of the front of the queue.
+        Returns the value of the front of the queue, or None if it is empty.
         """
+        if self.head is None:
+            return None
         return self.head.value
-        
+
     def clear(self) -> None:
         """
         Clears the queue.
@@ -33,7 +45,8 @@ class Queue:
         self.head = None
         self.tail = None
         self.size = 0
-        
+        self.__index.clear()
+
     def enqueue(self, value) -> None:
         """
         Adds a value to the back of the queue.
@@ -43,10 +56,17 @@ class Queue:
             self.head = new_node
             self.tail = new_node
         else:
+            new_node.prev = self.tail
             self.tail.next = new_node
             self.tail = new_node
+
+        first = self.__index.setdefault(value, new_node)
+        if first is not new_node:
+            while first.twin is not None:
+                first = first.twin
+            first.twin = new_node
         self.size += 1
-        
+
     def dequeue(self) -> Any:
         """
         Removes the value from the front of the queue and returns it.
@@ -54,47 +74,51 @@ class Queue:
         if self.head is None:
             return None
         value = self.head.value
-        self.head = self.head.next
-        self.size += 1
+        self.__unlink(self.head)
         return value
-    
+
     def is_empty(self) -> bool:
         """
         Checks if the queue is empty.
         """
         return self.size == 0
-    
+
     def remove(self, key):
         """
         Removes the first occurrence of a value in the queue.
         """
-        current = self.head
-        previous = None
-        while current:
-            if current.value == key:
-                if previous:  
-                    previous.next = current.next
-                else:  
-                    self.head = current.next
-                if current == self.tail: 
-                    self.tail = previous
-                return current.value  
-            previous = current
-            current = current.next
-        
-        return None
+        node = self.__index.get(key)
+        if node is None:
+            return None
+        self.__unlink(node)
+        return node.value
+
+    def __unlink(self, node: Node) -> None:
+        """
+        Detaches the first occurrence of a value from the list and the index.
+        """
+        if node.prev is None:
+            self.head = node.next
+        else:
+            node.prev.next = node.next
+        if node.next is None:
+            self.tail = node.prev
+        else:
+            node.next.prev = node.prev
+
+        if node.twin is None:
+            del self.__index[node.value]
+        else:
+            self.__index[node.value] = node.twin
+        node.next = node.prev = node.twin = None
+        self.size -= 1
 
     def __contains__(self, value) -> bool:
         """
         Checks if a value is in the queue.
         """
-        current = self.head
-        while current is not None:
-            if current.value == value:
-                return True
-            current = current.next
-        return False
-    
+        return value in self.__index
+
     def __iter__(self):
         """
         Returns an iterator for the queue.
@@ -103,12 +127,9 @@ class Queue:
         while current is not None:
             yield current.value
             current = current.next
-            
+
     def __str__(self) -> str:
         """
         Returns a string representation of the queue.
         """
         return str([value for value in self])
-    
-        
-    
\ No newline at end of file
@@ -0,0 +1,254 @@
+import threading
+from typing import Any, Iterable, Optional
+
+OVERFLOW = ("reject", "drop_oldest")
+INITIAL_SLOTS = 8
+
+
+class RingBuffer:
+    """
+    A bounded, thread-safe FIFO queue backed by a list used as a circular
+    buffer.
+
+    The list starts with ``INITIAL_SLOTS`` slots and doubles when it fills
+    up, until it reaches the capacity, so an idle queue stays small. Once the
+    list is large enough for the traffic, enqueueing and dequeueing never
+    allocate (unlike ``Queue``, which creates a node per element). Bulk
+    operations move many elements under a single lock acquisition.
+
+    Timeouts follow ``queue.Queue``: 0 does not wait, None waits forever and
+    a positive number waits up to that many seconds.
+
+    When the buffer is full, the overflow policy decides what ``enqueue`` does:
+
+    * reject: waits for room up to the timeout, then refuses the element.
+    * drop_oldest: discards the element at the front to make room (counted
+      in ``dropped``) and never waits.
+
+    ``close`` wakes every waiting thread: afterwards new elements are refused,
+    and the elements left can still be dequeued.
+    """
+
+    def __init__(self, capacity: int, overflow: str = "reject"):
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        if overflow not in OVERFLOW:
+            raise ValueError(f"overflow must be one of {OVERFLOW}, not {overflow!r}")
+        self.__items: list[Any] = [None] * min(capacity, INITIAL_SLOTS)
+        self.__capacity = capacity
+        self.__drop_oldest = overflow == "drop_oldest"
+        self.__head = 0
+        self.__size = 0
+        self.__closed = False
+        self.dropped = 0
+        self.__lock = threading.Lock()
+        self.__not_empty = threading.Condition(self.__lock)
+        self.__not_full = threading.Condition(self.__lock)
+        # threads waiting on each condition, so that notify (which is costly
+        # even with no waiters) is only called when someone is waiting
+        self.__getters = 0
+        self.__putters = 0
+
+    def __len__(self) -> int:
+        """
+        Returns the size of the queue.
+        """
+        return self.__size
+
+    @property
+    def capacity(self) -> int:
+        return self.__capacity
+
+    @property
+    def closed(self) -> bool:
+        return self.__closed
+
+    def is_empty(self) -> bool:
+        """
+        Checks if the queue is empty.
+        """
+        return self.__size == 0
+
+    def is_full(self) -> bool:
+        """
+        Checks if the queue is full.
+        """
+        return self.__size == self.__capacity
+
+    def peek(self) -> Any:
+        """
+        Returns the value of the front of the queue, or None if it is empty.
+        """
+        with self.__lock:
+            return self.__items[self.__head] if self.__size else None
+
+    def enqueue(self, value: Any, timeout: Optional[float] = 0) -> bool:
+        """
+        Adds a value to the back of the queue.
+
+        Returns:
+            True if the value was added, False if the queue is closed or
+            stayed full for the whole timeout.
+        """
+        with self.__lock:
+            if self.__size == self.__capacity and not self.__closed:
+                if self.__drop_oldest:
+                    self.__discard_oldest()
+                elif timeout != 0:
+                    self.__wait_for_room(timeout)
+            if self.__closed or self.__size == self.__capacity:
+                return False
+            if self.__size == len(self.__items):
+                self.__grow()
+            self.__items[(self.__head + self.__size) % len(self.__items)] = value
+            self.__size += 1
+            if self.__getters:
+                self.__not_empty.notify()
+            return True
+
+    def enqueue_many(self, values: Iterable[Any], timeout: Optional[float] = 0) -> int:
+        """
+        Adds values to the back of the queue, in order.
+
+        With the reject policy, stops at the first value that does not fit
+        within the timeout (the timeout applies to each wait).
+
+        Returns:
+            The number of values added.
+        """
+        added = 0
+        with self.__lock:
+            for value in values:
+                if self.__closed:
+                    break
+                if self.__size == self.__capacity:
+                    if self.__drop_oldest:
+                        self.__discard_oldest()
+                    elif timeout == 0 or not self.__wait_for_room(timeout) or self.__closed:
+                        break
+                if self.__size == len(self.__items):
+                    self.__grow()
+                self.__items[(self.__head + self.__size) % len(self.__items)] = value
+                self.__size += 1
+                added += 1
+            if added and self.__getters:
+                self.__not_empty.notify(added)
+        return added
+
+    def dequeue(self, timeout: Optional[float] = 0) -> Any:
+        """
+        Removes the value from the front of the queue and returns it.
+
+        Returns:
+            The value, or None if the queue stayed empty for the whole timeout
+            (or is closed and empty).
+        """
+        with self.__lock:
+            if not self.__size:
+                if timeout == 0 or self.__closed:
+                    return None
+                self.__wait_for_values(timeout)
+                if not self.__size:
+                    return None
+            value = self.__items[self.__head]
+            self.__items[self.__head] = None
+            self.__head = (self.__head + 1) % len(self.__items)
+            self.__size -= 1
+            if self.__putters:
+                self.__not_full.notify()
+            return value
+
+    def dequeue_many(self, count: Optional[int] = None, timeout: Optional[float] = 0) -> list[Any]:
+        """
+        Removes up to ``count`` values (all of them if None) from the front of
+        the queue, waiting up to the timeout for at least one.
+
+        Returns:
+            The values removed, in order; empty if there were none.
+        """
+        with self.__lock:
+            if not self.__size and timeout != 0:
+                self.__wait_for_values(timeout)
+            taken = self.__size if count is None else min(count, self.__size)
+            values = []
+            slots = len(self.__items)
+            for _ in range(taken):
+                values.append(self.__items[self.__head])
+                self.__items[self.__head] = None
+                self.__head = (self.__head + 1) % slots
+            self.__size -= taken
+            if taken and self.__putters:
+                self.__not_full.notify(taken)
+            return values
+
+    def __wait_for_room(self, timeout: Optional[float]) -> bool:
+        """
+        Waits until the queue has room or is closed (lock held).
+        """
+        self.__putters += 1
+        try:
+            return self.__not_full.wait_for(lambda: self.__size < self.__capacity or self.__closed, timeout)
+        finally:
+            self.__putters -= 1
+
+    def __wait_for_values(self, timeout: Optional[float]) -> bool:
+        """
+        Waits until the queue has values or is closed (lock held).
+        """
+        self.__getters += 1
+        try:
+            return self.__not_empty.wait_for(lambda: self.__size or self.__closed, timeout)
+        finally:
+            self.__getters -= 1
+
+    def __discard_oldest(self) -> None:
+        """
+        Drops the value at the front of the queue to make room (lock held).
+        """
+        self.__items[self.__head] = None
+        self.__head = (self.__head + 1) % len(self.__items)
+        self.__size -= 1
+        self.dropped += 1
+
+    def __grow(self) -> None:
+        """
+        Doubles the list, up to the capacity, keeping the values in order
+        from its start (lock held).
+        """
+        items, head = self.__items, self.__head
+        slots = min(len(items) * 2, self.__capacity)
+        self.__items = items[head:] + items[:head] + [None] * (slots - len(items))
+        self.__head = 0
+
+    def clear(self) -> None:
+        """
+        Clears the queue.
+        """
+        with self.__lock:
+            self.__items = [None] * min(self.__capacity, INITIAL_SLOTS)
+            self.__head = 0
+            self.__size = 0
+            self.__not_full.notify_all()
+
+    def close(self) -> None:
+        """
+        Refuses new values and wakes every waiting thread.
+        """
+        with self.__lock:
+            self.__closed = True
+            self.__not_empty.notify_all()
+            self.__not_full.notify_all()
+
+    def __iter__(self):
+        """
+        Returns an iterator over a snapshot of the queue.
+        """
+        with self.__lock:
+            snapshot = [self.__items[(self.__head + i) % len(self.__items)] for i in range(self.__size)]
+        return iter(snapshot)
+
+    def __str__(self) -> str:
+        """
+        Returns a string representation of the queue.
+        """
+        return str(list(self))
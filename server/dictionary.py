@@ -0,0 +1,234 @@
+"""
+Dictionary of accepted answers per category.
+
+Word lists are plain text files, one per category of ``pots.py``, named
+after the category (``slug``): ``dictionaries/pais.txt`` holds the answers
+accepted for "País", one per line ('#' starts a comment). They are compiled
+once into a binary index that the server memory-maps, so starting a server
+(or every worker process) neither parses the lists nor copies them: the
+pages are shared through the OS page cache.
+
+Index layout (little-endian):
+
+    header      magic "POTD", version (u16), categories (u16), slots (u32),
+                slots offset (u32), records offset (u32)
+    categories  per category: length (u16) + normalized name (UTF-8)
+    slots       open addressing table of u32: record offset + 1, 0 if empty
+    records     per word: category id (u16), length (u16), normalized word (UTF-8)
+
+A word is found by hashing its normalized form with its category (CRC-32)
+and probing the slots linearly, so a lookup costs O(length of the answer).
+Lookups ignore case, accents and extra whitespace (see ``normalize``).
+
+Build the index with:
+
+    python server/dictionary.py build
+"""
+import argparse
+import mmap
+import re
+import struct
+import zlib
+from array import array
+from pathlib import Path
+from typing import Iterable, Optional, Union
+
+from normalize import normalize
+
+MAGIC = b"POTD"
+VERSION = 1
+HEADER = struct.Struct("<4sHHIII")
+RECORD = struct.Struct("<HH")
+SLOT = struct.Struct("<I")
+
+SOURCE_DIR = Path(__file__).resolve().parent / "dictionaries"
+DEFAULT_INDEX = SOURCE_DIR / "index.potd"
+
+
+def slug(category: str) -> str:
+    """
+    Returns the file name (without extension) of a category's word list.
+    """
+    return re.sub(r"[^a-z0-9]+", "-", normalize(category)).strip("-")
+
+
+def build_index(words: dict[str, Iterable[str]], path: Union[str, Path]) -> int:
+    """
+    Compiles word lists into an index file.
+
+    Args:
+        words: The accepted words of each category.
+        path: Where to write the index.
+
+    Returns:
+        The number of distinct words indexed.
+    """
+    categories = sorted({normalize(category) for category in words})
+    ids = {category: i for i, category in enumerate(categories)}
+    records = bytearray()
+    entries: list[tuple[int, int]] = []
+    seen: set[tuple[int, bytes]] = set()
+
+    for category, category_words in words.items():
+        category_id = ids[normalize(category)]
+        for word in category_words:
+            key = normalize(word).encode()
+            if not key or len(key) > 0xFFFF or (category_id, key) in seen:
+                continue
+            seen.add((category_id, key))
+            entries.append((zlib.crc32(key, category_id), len(records)))
+            records += RECORD.pack(category_id, len(key)) + key
+
+    size = 8
+    while size < 2 * len(entries):
+        size *= 2
+    mask = size - 1
+    slots = array("I", bytes(SLOT.size * size))
+    for hashcode, offset in entries:
+        slot = hashcode & mask
+        while slots[slot]:
+            slot = (slot + 1) & mask
+        slots[slot] = offset + 1
+
+    names = b"".join(struct.pack("<H", len(name.encode())) + name.encode() for name in categories)
+    slots_offset = HEADER.size + len(names)
+    slots_offset += -slots_offset % SLOT.size
+    records_offset = slots_offset + SLOT.size * size
+    if struct.pack("=I", 1) != SLOT.pack(1):
+        slots.byteswap()
+
+    with open(path, "wb") as file:
+        file.write(HEADER.pack(MAGIC, VERSION, len(categories), size, slots_offset, records_offset))
+        file.write(names)
+        file.write(bytes(slots_offset - HEADER.size - len(names)))
+        file.write(slots.tobytes())
+        file.write(records)
+    return len(entries)
+
+
+def read_word_lists(directory: Union[str, Path], categories: Iterable[str]) -> dict[str, list[str]]:
+    """
+    Reads the word list of every category that has one in ``directory``.
+    """
+    words = {}
+    for category in categories:
+        source = Path(directory) / f"{slug(category)}.txt"
+        if source.is_file():
+            lines = source.read_text(encoding="utf-8").splitlines()
+            words[category] = [word for line in lines if (word := line.split("#", 1)[0].strip())]
+    return words
+
+
+class Dictionary:
+    """
+    Read-only view of a dictionary index (see ``build_index``).
+
+    The file is memory-mapped and read in place; only the category names are
+    loaded in memory. Categories without a word list are not in the index,
+    and ``accepts`` takes any answer for them.
+
+    **Public methods:**
+
+    * has_category: bool - Checks if a category has a word list.
+    * contains: bool - Checks if a word is in the list of a category.
+    * accepts: bool - Checks an answer, accepting any for unlisted categories.
+    * close: None - Unmaps the index.
+    """
+
+    MAX_CACHED_NAMES = 1024
+
+    def __init__(self, path: Union[str, Path] = DEFAULT_INDEX) -> None:
+        with open(path, "rb") as file:
+            self.__map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, categories, slots, slots_offset, records_offset = HEADER.unpack_from(self.__map)
+        if magic != MAGIC or version != VERSION:
+            self.__map.close()
+            raise ValueError(f"{path} is not a dictionary index of version {VERSION}")
+        self.__ids: dict[str, int] = {}
+        offset = HEADER.size
+        for category_id in range(categories):
+            (length,) = struct.unpack_from("<H", self.__map, offset)
+            self.__ids[self.__map[offset + 2:offset + 2 + length].decode()] = category_id
+            offset += 2 + length
+        # Categories as the game names them, mapped to their ids (bounded,
+        # since the category names in the answers come from the clients)
+        self.__names: dict[str, Optional[int]] = {}
+        self.__mask = slots - 1
+        self.__slots_offset = slots_offset
+        self.__records_offset = records_offset
+
+    @property
+    def categories(self) -> list[str]:
+        """
+        The normalized names of the categories with a word list.
+        """
+        return list(self.__ids)
+
+    def has_category(self, category: str) -> bool:
+        return self.__category_id(category) is not None
+
+    def contains(self, category: str, word: str) -> bool:
+        """
+        Checks if a word is in the list of a category, ignoring case, accents
+        and extra whitespace. False if the category has no list.
+        """
+        category_id = self.__category_id(category)
+        if category_id is None:
+            return False
+        return self.__find(category_id, normalize(word).encode())
+
+    def accepts(self, category: str, answer: str) -> bool:
+        """
+        Checks an answer against the list of its category. Any answer is
+        accepted for a category without a list.
+        """
+        category_id = self.__category_id(category)
+        if category_id is None:
+            return True
+        return self.__find(category_id, normalize(answer).encode())
+
+    def close(self) -> None:
+        self.__map.close()
+
+    def __category_id(self, category: str) -> Optional[int]:
+        try:
+            return self.__names[category]
+        except KeyError:
+            category_id = self.__ids.get(normalize(category))
+            if len(self.__names) < self.MAX_CACHED_NAMES:
+                self.__names[category] = category_id
+            return category_id
+
+    def __find(self, category_id: int, key: bytes) -> bool:
+        index = self.__map
+        slot = zlib.crc32(key, category_id) & self.__mask
+        while True:
+            (entry,) = SLOT.unpack_from(index, self.__slots_offset + SLOT.size * slot)
+            if not entry:
+                return False
+            record = self.__records_offset + entry - 1
+            record_category, length = RECORD.unpack_from(index, record)
+            if record_category == category_id and length == len(key):
+                start = record + RECORD.size
+                if index[start:start + length] == key:
+                    return True
+            slot = (slot + 1) & self.__mask
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Dicionário de respostas do Potstop")
+    commands = parser.add_subparsers(dest="command", required=True)
+    build = commands.add_parser("build", help="compila as listas de palavras em um índice")
+    build.add_argument("--source", default=str(SOURCE_DIR), help="diretório com um arquivo .txt por categoria")
+    build.add_argument("--output", default=str(DEFAULT_INDEX))
+    args = parser.parse_args()
+
+    import pots
+
+    categories = [category for group in pots.pots for category in group]
+    word_lists = read_word_lists(args.source, categories)
+    count = build_index(word_lists, args.output)
+    missing = [category for category in categories if category not in word_lists]
+    print(f"{count} palavras de {len(word_lists)} categorias em {args.output}")
+    if missing:
+        print(f"Sem lista (qualquer resposta é aceita): {', '.join(missing)}")
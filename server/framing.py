@@ -0,0 +1,125 @@
+"""
+Length-prefixed framing for POP messages.
+
+Every message travels as a frame: a 4-byte big-endian unsigned length
+followed by that many bytes of UTF-8 text. TCP is a byte stream, so a single
+``recv`` may return part of a frame or several frames at once; the
+``FrameDecoder`` reassembles them.
+
+The first line of a request may also carry a request id ("STOP #7"), which
+the server echoes on the first line of the response ("10 Stopped #7");
+``split_request_id`` parses it on both sides.
+
+The client keeps its own copy in ``client/framing.py``, so it can be used
+without the server tree. Both sides must speak the same framing: a change
+here goes there too.
+"""
+import struct
+from typing import Optional
+
+HEADER = struct.Struct("!I")
+MAX_FRAME_SIZE = 1 << 20
+
+
+class FrameError(ValueError):
+    """
+    Raised when the peer sends a frame larger than the allowed size.
+    """
+
+
+def encode_frame(msg: str) -> bytes:
+    """
+    Encodes a message as a POP frame.
+
+    Args:
+        msg (str): The message to be encoded.
+
+    Returns:
+        bytes: The length header followed by the UTF-8 encoded message.
+    """
+    body = msg.encode()
+    return HEADER.pack(len(body)) + body
+
+
+class FrameDecoder:
+    """
+    Incremental decoder of POP frames.
+
+    Bytes are appended to an internal buffer as they arrive and every complete
+    frame is decoded straight from it through a ``memoryview``, so the bodies
+    are not copied before being decoded. The consumed prefix is dropped once
+    per ``feed`` call.
+    """
+
+    def __init__(self, max_frame_size: int = MAX_FRAME_SIZE) -> None:
+        self.__buffer = bytearray()
+        self.__max_frame_size = max_frame_size
+
+    def __len__(self) -> int:
+        """
+        Returns the amount of buffered bytes waiting for the rest of a frame.
+        """
+        return len(self.__buffer)
+
+    def feed(self, data: bytes) -> list[str]:
+        """
+        Feeds received bytes to the decoder.
+
+        Args:
+            data (bytes): The bytes read from the socket.
+
+        Returns:
+            list[str]: The messages completed by these bytes, in order.
+
+        Raises:
+            FrameError: If a frame header announces more than the maximum frame size.
+            UnicodeDecodeError: If a frame body is not valid UTF-8.
+        """
+        buffer = self.__buffer
+        buffer += data
+        size = len(buffer)
+        offset = 0
+        messages: list[str] = []
+
+        with memoryview(buffer) as view:
+            while size - offset >= HEADER.size:
+                (length,) = HEADER.unpack_from(buffer, offset)
+                if length > self.__max_frame_size:
+                    raise FrameError(f"Frame of {length} bytes exceeds the limit of {self.__max_frame_size}")
+                end = offset + HEADER.size + length
+                if end > size:
+                    break
+                messages.append(str(view[offset + HEADER.size:end], "utf-8"))
+                offset = end
+
+        if offset:
+            del buffer[:offset]
+        return messages
+
+    def take_pending(self) -> bytes:
+        """
+        Returns the buffered bytes of an incomplete frame and empties the buffer.
+
+        Used when the rest of the stream is going to be read by someone else
+        (e.g. a connection handed to another process).
+        """
+        pending = bytes(self.__buffer)
+        self.__buffer.clear()
+        return pending
+
+
+def split_request_id(line: str) -> tuple[str, Optional[str]]:
+    """
+    Splits the request id from the first line of a POP message.
+
+    Args:
+        line (str): The first line of a request ("STOP #7") or response ("10 Stopped #7").
+
+    Returns:
+        tuple[str, Optional[str]]: The line without the id and the id, or None
+        if the line carries no (valid) id.
+    """
+    head, sep, request_id = line.rpartition(" #")
+    if not sep or not request_id.isdigit():
+        return line, None
+    return head, request_id
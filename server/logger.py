@@ -0,0 +1,156 @@
+import json
+import random
+import sys
+import threading
+import time
+from typing import Any, Optional, TextIO
+
+from data_structures.ring_buffer import RingBuffer
+
+LEVELS = {"debug": 10, "info": 20, "warning": 30, "error": 40}
+FORMATS = ("text", "json")
+
+Record = tuple[float, str, str, dict[str, Any]]
+
+
+class Logger:
+    """
+    Structured logger whose output is written by a background thread.
+
+    A log call only checks the level, builds a record (timestamp, level,
+    event and fields) and enqueues it in a bounded ``RingBuffer``; formatting
+    and writing happen in the writer thread, so the caller never blocks on
+    the output stream. If the writer falls behind, the oldest records are
+    dropped (counted in ``dropped``) instead of growing the buffer.
+
+    Message logs (requests, responses and broadcasts) are the high-volume
+    ones: only a ``sample`` fraction of them is kept, and their payload is
+    cut to ``max_payload`` characters before being enqueued.
+
+    **Public methods:**
+
+    * debug, info, warning, error: None - Logs an event with fields.
+    * message: None - Logs a (sampled, truncated) protocol message.
+    * enabled: bool - Checks if a level is logged.
+    * close: None - Writes the pending records and stops the writer.
+    """
+
+    def __init__(
+        self,
+        level: str = "info",
+        stream: Optional[TextIO] = None,
+        fmt: str = "text",
+        sample: float = 1.0,
+        max_payload: int = 200,
+        capacity: int = 8192,
+    ) -> None:
+        if level not in LEVELS:
+            raise ValueError(f"level must be one of {tuple(LEVELS)}, not {level!r}")
+        if fmt not in FORMATS:
+            raise ValueError(f"fmt must be one of {FORMATS}, not {fmt!r}")
+        if not 0 <= sample <= 1:
+            raise ValueError("sample must be between 0 and 1")
+        self.__level = LEVELS[level]
+        self.__stream = stream if stream is not None else sys.stdout
+        self.__format = self.__format_json if fmt == "json" else self.__format_text
+        self.__sample = sample
+        self.__max_payload = max_payload
+        self.__records = RingBuffer(capacity, overflow="drop_oldest")
+        self.__writer = threading.Thread(target=self.__write, name="log-writer", daemon=True)
+        self.__writer.start()
+
+    @property
+    def dropped(self) -> int:
+        """
+        Records discarded because the writer fell behind.
+        """
+        return self.__records.dropped
+
+    def enabled(self, level: str) -> bool:
+        """
+        Checks if records of the given level are logged.
+        """
+        return LEVELS[level] >= self.__level
+
+    def debug(self, event: str, **fields: Any) -> None:
+        if self.__level <= 10:
+            self.__records.enqueue((time.time(), "debug", event, fields))
+
+    def info(self, event: str, **fields: Any) -> None:
+        if self.__level <= 20:
+            self.__records.enqueue((time.time(), "info", event, fields))
+
+    def warning(self, event: str, **fields: Any) -> None:
+        if self.__level <= 30:
+            self.__records.enqueue((time.time(), "warning", event, fields))
+
+    def error(self, event: str, **fields: Any) -> None:
+        self.__records.enqueue((time.time(), "error", event, fields))
+
+    def message(self, event: str, peer: Any, payload: str, **fields: Any) -> None:
+        """
+        Logs a protocol message at the info level, subject to sampling.
+
+        Args:
+            event (str): What happened to the message (e.g. "request").
+            peer: Who sent or received it, or None (e.g. a broadcast).
+            payload (str): The message. Only its first ``max_payload``
+                characters are kept; the full length goes in "length".
+        """
+        if self.__level > 20 or (self.__sample < 1 and random.random() >= self.__sample):
+            return
+        if len(payload) > self.__max_payload:
+            fields["length"] = len(payload)
+            payload = payload[:self.__max_payload] + "…"
+        if peer is not None:
+            fields = {"peer": peer, **fields}
+        fields["msg"] = payload
+        self.__records.enqueue((time.time(), "info", event, fields))
+
+    def close(self) -> None:
+        """
+        Stops accepting records and waits for the pending ones to be written.
+        """
+        self.__records.close()
+        self.__writer.join()
+
+    def __write(self) -> None:
+        """
+        Drains the records to the stream until the logger is closed.
+        """
+        reported = 0
+        while True:
+            records = self.__records.dequeue_many(timeout=None)
+            if not records:
+                break
+            if self.dropped != reported:
+                records.append((time.time(), "warning", "log_dropped", {"records": self.dropped - reported}))
+                reported = self.dropped
+            try:
+                self.__stream.write("".join(self.__format(record) for record in records))
+                self.__stream.flush()
+            except (OSError, ValueError):
+                pass
+
+    @staticmethod
+    def __format_text(record: Record) -> str:
+        created, level, event, fields = record
+        stamp = time.strftime("%H:%M:%S", time.localtime(created))
+        parts = [f"{stamp}.{int(created % 1 * 1000):03d}", level.upper(), event]
+        for key, value in fields.items():
+            if isinstance(value, tuple):  # an address
+                value = ":".join(map(str, value))
+            elif isinstance(value, list):
+                value = ",".join(map(str, value))
+            elif not isinstance(value, str):
+                value = str(value)
+            if not value or any(c in value for c in ' "=\n\t'):
+                value = json.dumps(value, ensure_ascii=False)
+            parts.append(f"{key}={value}")
+        return " ".join(parts) + "\n"
+
+    @staticmethod
+    def __format_json(record: Record) -> str:
+        created, level, event, fields = record
+        entry = {"time": round(created, 3), "level": level, "event": event, **fields}
+        return json.dumps(entry, ensure_ascii=False, default=str) + "\n"
@@ -0,0 +1,221 @@
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from typing import Any, Callable, Optional, Union
+
+Number = Union[int, float]
+
+
+class Counter:
+    """
+    A value that only goes up (e.g. requests handled).
+    """
+
+    def __init__(self) -> None:
+        self.value = 0
+        self.__lock = threading.Lock()
+
+    def inc(self, amount: int = 1) -> None:
+        """
+        Adds ``amount`` to the counter.
+        """
+        with self.__lock:
+            self.value += amount
+
+
+class Gauge:
+    """
+    A value read when a snapshot is taken (e.g. active connections).
+
+    The value is computed by the given function, so the code being measured
+    does not record anything.
+    """
+
+    def __init__(self, read: Callable[[], Number]) -> None:
+        self.__read = read
+
+    @property
+    def value(self) -> Number:
+        return self.__read()
+
+
+class Histogram:
+    """
+    Distribution of durations, in seconds, over fixed exponential buckets.
+
+    Bucket ``i`` holds the observations up to ``BOUNDS[i]`` (10 µs doubling
+    up to ~84 s; the last bucket holds anything slower), so observing is a
+    binary search and an increment, and the memory used does not grow with
+    the number of observations. Percentiles are estimated as the upper bound
+    of the bucket they fall in, capped at the largest observation.
+    """
+
+    BOUNDS = tuple(0.00001 * 2 ** i for i in range(24))
+
+    def __init__(self) -> None:
+        self.__buckets = [0] * (len(self.BOUNDS) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+        self.__lock = threading.Lock()
+
+    def observe(self, seconds: float) -> None:
+        """
+        Records a duration.
+        """
+        bucket = bisect_left(self.BOUNDS, seconds)
+        with self.__lock:
+            self.__buckets[bucket] += 1
+            self.count += 1
+            self.sum += seconds
+            if seconds > self.max:
+                self.max = seconds
+
+    def percentile(self, q: float) -> float:
+        """
+        Estimates the duration below which a fraction ``q`` (0 to 1) of the
+        observations fall, or 0 if there are none.
+        """
+        with self.__lock:
+            buckets = list(self.__buckets)
+            count = self.count
+            largest = self.max
+        if not count:
+            return 0.0
+        rank = max(1, round(q * count))
+        seen = 0
+        for bucket, hits in enumerate(buckets):
+            seen += hits
+            if seen >= rank:
+                return min(self.BOUNDS[bucket], largest) if bucket < len(self.BOUNDS) else largest
+        return largest
+
+    def summary(self) -> dict[str, Number]:
+        """
+        Returns the count and, in milliseconds, the mean, p50, p95, p99 and max.
+        """
+        count = self.count
+        return {
+            "count": count,
+            "mean_ms": round(self.sum / count * 1e3, 3) if count else 0.0,
+            "p50_ms": round(self.percentile(0.50) * 1e3, 3),
+            "p95_ms": round(self.percentile(0.95) * 1e3, 3),
+            "p99_ms": round(self.percentile(0.99) * 1e3, 3),
+            "max_ms": round(self.max * 1e3, 3),
+        }
+
+
+class MetricsRegistry:
+    """
+    In-process registry of the server metrics.
+
+    Metrics are created on first use and looked up by name. Recording only
+    takes the lock of the metric itself, so callers on hot paths should keep
+    a reference to the metric instead of looking it up every time.
+
+    **Public methods:**
+
+    * counter: Counter - Returns the counter with the given name.
+    * histogram: Histogram - Returns the histogram with the given name.
+    * gauge: Gauge - Registers a gauge read from a function.
+    * snapshot: dict - Returns the current value of every metric.
+    * dump: None - Writes the snapshot to a JSON file.
+    * start_dumping: None - Dumps the snapshot periodically in the background.
+    * stop_dumping: None - Stops the periodic dump, writing a last snapshot.
+    """
+
+    def __init__(self) -> None:
+        self.__counters: dict[str, Counter] = {}
+        self.__histograms: dict[str, Histogram] = {}
+        self.__gauges: dict[str, Gauge] = {}
+        self.__lock = threading.Lock()
+        self.__started = time.time()
+        self.__dumper: Optional[threading.Thread] = None
+        self.__stop_dumping = threading.Event()
+
+    def counter(self, name: str) -> Counter:
+        """
+        Returns the counter with the given name, creating it if needed.
+        """
+        with self.__lock:
+            return self.__counters.setdefault(name, Counter())
+
+    def histogram(self, name: str) -> Histogram:
+        """
+        Returns the histogram with the given name, creating it if needed.
+        """
+        with self.__lock:
+            return self.__histograms.setdefault(name, Histogram())
+
+    def gauge(self, name: str, read: Callable[[], Number]) -> Gauge:
+        """
+        Registers (or replaces) a gauge whose value is given by ``read``.
+        """
+        with self.__lock:
+            gauge = self.__gauges[name] = Gauge(read)
+            return gauge
+
+    def snapshot(self) -> dict[str, Any]:
+        """
+        Returns the current value of every metric.
+
+        Returns:
+            dict: "uptime" (seconds), "counters", "gauges" and "histograms"
+            (see ``Histogram.summary``), each keyed by metric name.
+        """
+        with self.__lock:
+            counters = dict(self.__counters)
+            gauges = dict(self.__gauges)
+            histograms = dict(self.__histograms)
+        return {
+            "uptime": round(time.time() - self.__started, 3),
+            "counters": {name: counter.value for name, counter in sorted(counters.items())},
+            "gauges": {name: gauge.value for name, gauge in sorted(gauges.items())},
+            "histograms": {name: histogram.summary() for name, histogram in sorted(histograms.items())},
+        }
+
+    def dump(self, path: str) -> None:
+        """
+        Writes the snapshot to a JSON file.
+
+        The file is replaced atomically, so a reader never sees a partial dump.
+        """
+        tmp = f"{path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as file:
+            json.dump(self.snapshot(), file, indent=2)
+        os.replace(tmp, path)
+
+    def start_dumping(self, path: str, interval: float) -> None:
+        """
+        Dumps the snapshot to ``path`` every ``interval`` seconds, from a
+        daemon thread.
+        """
+        if self.__dumper is not None:
+            return
+        self.__stop_dumping.clear()
+
+        def run() -> None:
+            while not self.__stop_dumping.wait(interval):
+                try:
+                    self.dump(path)
+                except OSError:
+                    pass
+            try:
+                self.dump(path)
+            except OSError:
+                pass
+
+        self.__dumper = threading.Thread(target=run, name="metrics-dump", daemon=True)
+        self.__dumper.start()
+
+    def stop_dumping(self) -> None:
+        """
+        Stops the periodic dump, after writing a last snapshot.
+        """
+        if self.__dumper is None:
+            return
+        self.__stop_dumping.set()
+        self.__dumper.join()
+        self.__dumper = None
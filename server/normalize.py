@@ -0,0 +1,74 @@
+"""
+Normalization of answers and categories for comparison.
+
+Two answers are the same word if they only differ in case, accents or
+whitespace ("Arara", "arara" and " Arára " all normalize to "arara"). The
+server compares normalized forms wherever answers are matched, so the rules
+live in a single place. ``InternTable`` gives each normalized form a small
+integer id, so repeated answers are compared as ints.
+"""
+import threading
+import unicodedata
+from typing import Optional
+
+
+def normalize(text: str) -> str:
+    """
+    Returns the comparable form of a text: case folded, without accents and
+    with runs of whitespace collapsed into a single space (none at the ends).
+
+    ASCII text, the common case, skips the Unicode decomposition.
+    """
+    if text.isascii():
+        return " ".join(text.lower().split())
+    decomposed = unicodedata.normalize("NFKD", text)
+    stripped = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return " ".join(stripped.casefold().split())
+
+
+class InternTable:
+    """
+    Maps answers to small integer ids, the same for every answer with the
+    same normalized form.
+
+    Each distinct raw text is normalized only once: later occurrences are
+    found in a memo. Ids are given in order from 0, so they can index lists
+    and arrays. A table is meant to live for one round and then be dropped.
+
+    Texts longer than ``max_length`` are not normalized (which would cost
+    as much as the text is long) and get no id.
+    """
+
+    def __init__(self, max_length: Optional[int] = None) -> None:
+        self.__ids: dict[str, int] = {}  # normalized form -> id
+        self.__memo: dict[str, int] = {}  # raw text -> id
+        self.__forms: list[str] = []
+        self.__max_length = max_length
+        self.__lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.__forms)
+
+    def intern(self, text: str) -> Optional[int]:
+        """
+        Returns the id of a text, or None if it is too long.
+        """
+        answer_id = self.__memo.get(text)
+        if answer_id is not None:
+            return answer_id
+        if self.__max_length is not None and len(text) > self.__max_length:
+            return None
+        form = normalize(text)
+        with self.__lock:
+            answer_id = self.__ids.get(form)
+            if answer_id is None:
+                answer_id = self.__ids[form] = len(self.__forms)
+                self.__forms.append(form)
+            self.__memo[text] = answer_id
+        return answer_id
+
+    def form(self, answer_id: int) -> str:
+        """
+        Returns the normalized form of an id.
+        """
+        return self.__forms[answer_id]
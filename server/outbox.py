@@ -0,0 +1,145 @@
+import threading
+from typing import Optional, Union
+
+from data_structures.ring_buffer import RingBuffer
+
+Frame = Union[bytes, memoryview]
+
+
+class OutboxStats:
+    """
+    Counters shared by the outboxes of a server.
+
+    The outboxes of different clients are filled from different threads, so
+    the counters are only changed through ``record_enqueued`` and
+    ``record_dropped``, under a lock. Reading them does not lock.
+
+    Attributes:
+        enqueued (int): Frames that went through any outbox.
+        dropped (int): Frames refused because an outbox was full or already
+            closed (e.g. sent to a client that was dropped or left).
+        disconnects (int): Clients disconnected for being too slow.
+        peak_depth (int): The largest depth reached by any outbox.
+    """
+
+    def __init__(self) -> None:
+        self.enqueued = 0
+        self.dropped = 0
+        self.disconnects = 0
+        self.peak_depth = 0
+        self.__lock = threading.Lock()
+
+    def record_enqueued(self, depth: int) -> None:
+        """
+        Counts a frame enqueued in an outbox that now holds ``depth`` frames.
+        """
+        with self.__lock:
+            self.enqueued += 1
+            if depth > self.peak_depth:
+                self.peak_depth = depth
+
+    def record_dropped(self, disconnect: bool) -> None:
+        """
+        Counts a refused frame and, if it overflowed the outbox, the client
+        dropped for it.
+        """
+        with self.__lock:
+            self.dropped += 1
+            if disconnect:
+                self.disconnects += 1
+
+
+class Outbox:
+    """
+    Bounded queue of encoded frames waiting to be written to a client.
+
+    Frames are never copied: a broadcast enqueues the same read-only
+    ``memoryview`` in the outbox of every recipient. They are held in a
+    ``RingBuffer``, which only grows towards the limit when frames pile up,
+    so idle connections keep a small buffer and queueing does not allocate.
+
+    Producers (handlers and broadcasts) only enqueue, so they never block on a
+    slow socket; the I/O layer drains the queue. When a client does not keep
+    up and the queue reaches its limit, the frame is refused and the outbox
+    is flagged as overflowed, so the connection can be dropped. A producer
+    may instead choose to wait a while for room (e.g. the thread answering
+    the client's own requests, which should slow down rather than overflow).
+
+    **Public methods:**
+
+    * put: bool - Enqueues a frame.
+    * get: Optional[Frame] - Waits for the next frame.
+    * get_nowait: Optional[Frame] - Returns the next frame, if any.
+    * close: None - Refuses new frames and wakes the consumer.
+    """
+
+    DEFAULT_LIMIT = 256
+
+    def __init__(self, limit: int = DEFAULT_LIMIT, stats: Optional[OutboxStats] = None) -> None:
+        self.__frames = RingBuffer(limit, overflow="reject")
+        self.__lock = threading.Lock()
+        self.__stats = stats if stats is not None else OutboxStats()
+        self.__overflowed = False
+
+    def __len__(self) -> int:
+        return len(self.__frames)
+
+    @property
+    def closed(self) -> bool:
+        return self.__frames.closed
+
+    @property
+    def overflowed(self) -> bool:
+        return self.__overflowed
+
+    def put(self, frame: Frame, timeout: float = 0) -> bool:
+        """
+        Enqueues a frame to be sent.
+
+        Args:
+            frame (Frame): The encoded frame.
+            timeout (float): How long to wait for room if the outbox is full,
+                in seconds. Defaults to 0 (do not wait).
+
+        Returns:
+            True if the frame was enqueued, False if the outbox is closed or full.
+            In the latter case the outbox is flagged as overflowed and closed.
+        """
+        if self.__frames.enqueue(frame, timeout):
+            self.__stats.record_enqueued(len(self.__frames))
+            return True
+        with self.__lock:
+            overflow = not self.__frames.closed
+            if overflow:
+                self.__overflowed = True
+                self.__frames.close()
+        self.__stats.record_dropped(disconnect=overflow)
+        return False
+
+    def get(self, timeout: Optional[float] = None) -> Optional[Frame]:
+        """
+        Waits for the next frame.
+
+        Args:
+            timeout (Optional[float]): The maximum time to wait, in seconds.
+
+        Returns:
+            The next frame, or None if the outbox was closed and is empty (or
+            the timeout expired).
+        """
+        frame = self.__frames.dequeue(timeout)
+        return None if self.__overflowed else frame
+
+    def get_nowait(self) -> Optional[Frame]:
+        """
+        Returns the next frame without waiting, or None if there is none.
+        """
+        frame = self.__frames.dequeue()
+        return None if self.__overflowed else frame
+
+    def close(self) -> None:
+        """
+        Refuses new frames. Frames already enqueued are still delivered by
+        ``get`` unless the outbox overflowed.
+        """
+        self.__frames.close()
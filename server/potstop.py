@@ -1,7 +1,13 @@
 from data_structures.queue import Queue
-from data_structures.hashtable import HashTable
-from typing import Optional
-import random
+from data_structures.concurrent_hashtable import ConcurrentHashTable
+from data_structures.leaderboard import Leaderboard
+from dictionary import Dictionary
+from normalize import InternTable
+from rounds import RoundPlanner
+from scoring import cluster_answers, score_round
+from typing import Callable, Optional
+import json
+import threading
 from collections import Counter
 
 class Potstop:
@@ -11,43 +17,78 @@ class Potstop:
     **Public properties & attributes:**
 
     * answers: list[dict[str, str]] - List of player answers.
-    * letter: str - Current letter.
-    * pots: list[str] - Current categories.
+    * letter: str - Current letter ("" until the first round starts).
+    * pots: list[str] - Current categories (empty until the first round starts).
     * player_limit: int - Player limit.
+    * max_answer_length: int - Longest answer accepted as valid.
+    * fuzzy_distance: int - Edit distance up to which answers count as the same.
     * stopped: bool - Indicates if the game has been stopped.
+    * all_answered: bool - Indicates if every player sent their answers.
     * game_started: bool - Indicates if the game has started.
     * players: list[str] - List of players.
     * leader: Optional[str] - Current leader.
     * ranking: list[tuple[str, int]] - Player ranking.
+    * ranking_payload: str - Player ranking serialized as JSON, cached per version.
     * round: int - Current round.
     
     **Public methods:**
     
-    * stop: None - Stops the game.
+    * stop: bool - Stops the game.
     * start_game: None - Starts the game.
     * end_game: None - Ends the game.
     * add_player_points: None - Adds points to a player.
     * is_stop_valid: bool - Checks if an answer is valid.
+    * is_answer_valid: bool - Checks if an answer is valid for a category.
+    * validate_answers: dict[str, bool] | list[dict[str, bool]] - Checks many answers at once.
     * add_player: None - Adds a player.
     * remove_player: Optional[str] - Removes a player.
     * get_points: Optional[int] - Returns the points of a player.
+    * get_rank: Optional[int] - Returns the rank of a player.
+    * top_players: list[tuple[str, int]] - Returns the first players of the ranking.
     * remove_leader: Optional[str] - Removes the leader.
     * compute_points: None - Computes the points of a player.
-    * count_words: dict[str, dict[str, int]] - Counts the words.
+    * answer_id: Optional[int] - Returns the id of an answer in the current round.
+    * count_words: dict[str, dict[int, int]] - Counts the words.
+    * compute_round_points: dict[str, int] - Computes the points of every player at once.
+    * add_answers: None - Saves the answers of a player.
+    * wait_answers: list[tuple[str, dict[str, str]]] - Waits for every player's answers.
+    * wait_end: bool - Waits for the game to end.
+    * watch: Callable[[], None] - Calls a function whenever the round changes.
     """
+
+    MAX_REPEATS = 3
     
-    def __init__(self):
-        import pots
-        self.__avaliable_pots = pots.pots
-        self.__pots = self.__gen_pots()
-        self.__letter = self.__gen_letter()
+    def __init__(
+        self,
+        dictionary: Optional[Dictionary] = None,
+        fuzzy_distance: int = 0,
+        planner: Optional[RoundPlanner] = None,
+    ):
+        # Sorteia a letra e as categorias de cada rodada
+        self.__planner = planner if planner is not None else RoundPlanner()
+        # Definidas por start_game: sortear aqui gastaria uma rodada do histórico
+        self.__letter = ""
+        self.__pots: list[str] = []
         self.__player_limit = 8
-        self.__players: HashTable[str, int] = HashTable()
+        self.__max_answer_length = 64
+        # Listas de palavras aceitas por categoria (opcional)
+        self.__dictionary = dictionary
+        # Respostas com erros de digitação contam como repetidas (0 desativa)
+        self.__fuzzy_distance = max(0, fuzzy_distance)
+        # Respostas normalizadas da rodada, como ids (descartadas em start_game)
+        self.__answer_ids = InternTable(self.__max_answer_length)
+        # Mutated by every client handler thread (joins, leaves, scoring)
+        self.__players: ConcurrentHashTable = ConcurrentHashTable(stripes=4, probing="triangular")
         self.__order: Queue[str] = Queue()
+        self.__leaderboard = Leaderboard()
+        self.__ranking_payload: tuple[int, str] = (-1, "[]")
+        self.__ranking_lock = threading.Lock()
         self.__game_started = False
         self.__stopped = False
         self.__round = 0
         self.answers: list[tuple[str, dict[str, str]]] = []
+        self.__round_changed = threading.Condition()
+        self.__watchers: list[Callable[[], None]] = []
         
     @property
     def letter(self) -> str:
@@ -66,6 +107,24 @@ class Potstop:
         if limit > 1:
             self.__player_limit = limit
         
+    @property
+    def max_answer_length(self) -> int:
+        return self.__max_answer_length
+
+    @max_answer_length.setter
+    def max_answer_length(self, length: int) -> None:
+        if length > 2:
+            self.__max_answer_length = length
+
+    @property
+    def fuzzy_distance(self) -> int:
+        return self.__fuzzy_distance
+
+    @fuzzy_distance.setter
+    def fuzzy_distance(self, distance: int) -> None:
+        if distance >= 0:
+            self.__fuzzy_distance = distance
+        
     @property
     def stopped(self) -> bool:
         return self.__stopped
@@ -73,6 +132,11 @@ class Potstop:
     @property
     def game_started(self) -> bool:
         return self.__game_started
+
+    @property
+    def all_answered(self) -> bool:
+        with self.__round_changed:
+            return len(self.answers) >= len(self.__players)
     
     @property
     def players(self) -> list[str]:
@@ -84,36 +148,130 @@ class Potstop:
     
     @property
     def ranking(self) -> list[tuple[str, int]]:
-        return sorted(self.__players.items(), key=lambda i: i[1], reverse=1)
+        return self.__leaderboard.items()
+
+    @property
+    def ranking_payload(self) -> str:
+        """
+        The ranking serialized as JSON. It is serialized once per leaderboard
+        version, so every handler answering the same STOP shares one string.
+        """
+        with self.__ranking_lock:
+            version, payload = self.__ranking_payload
+            if version != self.__leaderboard.version:
+                version, ranking = self.__leaderboard.snapshot()
+                payload = json.dumps(ranking)
+                self.__ranking_payload = (version, payload)
+            return payload
     
     @property
     def round(self):
         return self.__round
     
-    def stop(self):
+    def stop(self) -> bool:
         """
         Stops the current game session.
 
         This method sets the stopped flag to True, indicating that the game
         has been stopped. It does not affect the game state or player data.
+        The check and the change are atomic, so among simultaneous stops only
+        one of them gets True.
+
+        Returns:
+            True if this call stopped the game, False if it was already stopped.
+        """
+        with self.__round_changed:
+            if self.__stopped:
+                return False
+            self.__stopped = True
+            return True
+
+    def add_answers(self, name: str, answers: dict[str, str]) -> None:
+        """
+        Saves the answers of a player for the current round.
+
+        Wakes up whoever is waiting in ``wait_answers``.
+
+        Args:
+            name: The name of the player.
+            answers: The player's answers, keyed by category.
         """
-        self.__stopped = True
+        with self.__round_changed:
+            self.answers.append((name, answers))
+            self.__notify()
+
+    def wait_answers(self, timeout: float) -> list[tuple[str, dict[str, str]]]:
+        """
+        Waits until every player has sent their answers.
+
+        Returns as soon as the last expected answer arrives (or a player leaves
+        and the ones remaining have all answered), or when the timeout expires.
+
+        Args:
+            timeout: The maximum time to wait, in seconds.
+
+        Returns:
+            A copy of the answers received so far.
+        """
+        with self.__round_changed:
+            self.__round_changed.wait_for(lambda: self.all_answered, timeout)
+            return list(self.answers)
+
+    def wait_end(self, timeout: float) -> bool:
+        """
+        Waits until the current game ends (see ``end_game``).
+
+        Args:
+            timeout: The maximum time to wait, in seconds.
+
+        Returns:
+            True if the game ended, False if the timeout expired first.
+        """
+        with self.__round_changed:
+            return self.__round_changed.wait_for(lambda: not self.__game_started, timeout)
+
+    def watch(self, callback: Callable[[], None]) -> Callable[[], None]:
+        """
+        Calls a function whenever the round changes: an answer arrives, a
+        player leaves or the game ends (when ``wait_answers`` and
+        ``wait_end`` wake up).
+
+        Lets an event loop wait for the round without blocking a thread. The
+        function runs in the thread making the change, holding the game's
+        lock, so it should only schedule the work (e.g. with
+        ``loop.call_soon_threadsafe``).
+
+        Args:
+            callback: The function to call.
+
+        Returns:
+            A function that stops calling ``callback``.
+        """
+        with self.__round_changed:
+            self.__watchers.append(callback)
+
+        def unwatch() -> None:
+            with self.__round_changed:
+                self.__watchers.remove(callback)
+        return unwatch
 
     def start_game(self) -> None:
         """
         Starts a new game session.
 
-        This method starts a new game session by generating new sets of
-        categories and a letter. The game state is set to started, and 
-        the round counter is incremented. Also, the answers list is cleared 
-        and the stopped flag is set to False.
+        This method starts a new game session by drawing new categories and
+        a letter (see ``rounds.RoundPlanner``). The game state is set to started, and 
+        the round counter is incremented. Also, the answers list is cleared,
+        the answers interned in the previous round are dropped and the
+        stopped flag is set to False.
         """
-        self.__gen_pots()
-        self.__gen_letter()
-        self.__round += 1
-        self.__stopped = False
-        self.answers.clear()
-        self.__game_started = True
+        self.__plan_round()
+        self.__answer_ids = InternTable(self.__max_answer_length)
+        with self.__round_changed:
+            self.__round += 1
+            self.__stopped = False
+            self.answers.clear()
+            self.__game_started = True
 
     def end_game(self) -> None:
         """
@@ -122,10 +280,12 @@ class Potstop:
         This method sets the game state to not started, effectively ending
         the current game session. It should be called when the game needs
         to be terminated or completed, ensuring that the game status is
-        updated accordingly.
+        updated accordingly. Whoever is waiting in ``wait_end`` is woken up.
         """
 
-        self.__game_started = False
+        with self.__round_changed:
+            self.__game_started = False
+            self.__notify()
         
     def add_player_points(self, name: str, points: int) -> None:
         """
@@ -138,17 +298,22 @@ class Potstop:
         Returns:
             None
         """
-        if name in self.__players:
-            self.__players[name] += points
+        if self.__players.add(name, points) is not None:
+            self.__leaderboard.add_points(name, points)
         
     def is_stop_valid(self, answer: str) -> bool:
         """
         Verifies if a given answer is valid.
 
         An answer is considered valid if:
-        - It is longer than 2 characters.
+        - It is a string longer than 2 characters and no longer than
+          ``max_answer_length``.
         - It starts with the current game letter.
-        - No character in the answer repeats more than twice.
+        - No character in the answer repeats more than twice (appears more
+          than ``MAX_REPEATS`` times).
+
+        The length is checked first, so oversized answers are rejected without
+        being scanned; the repetitions are counted in a single pass.
 
         Args:
             answer: The answer string to validate.
@@ -157,15 +322,51 @@ class Potstop:
             True if the answer is valid according to the criteria, otherwise False.
         """
 
-        for i in range(len(answer)):
-            qtd = 0
-            for j in range(i, len(answer)):
-                if qtd > 2:
-                    return False
-                if answer[i] == answer[j] and i != j:
-                    qtd += 1
-                    
-        return len(answer) > 2 and answer[0].upper() == self.__letter.upper()
+        if not isinstance(answer, str) or not 2 < len(answer) <= self.__max_answer_length:
+            return False
+        if answer[0].upper() != self.__letter.upper():
+            return False
+        return max(Counter(answer).values()) <= self.MAX_REPEATS
+
+    def is_answer_valid(self, category: str, answer: str) -> bool:
+        """
+        Verifies if an answer is valid for a category.
+
+        The answer must pass ``is_stop_valid`` and, if the game has a
+        dictionary with a word list for the category, be in that list
+        (ignoring case, accents and extra whitespace). The list lookup costs
+        O(length of the answer).
+
+        Args:
+            category: The category the answer was given for.
+            answer: The answer string to validate.
+
+        Returns:
+            True if the answer is valid for the category, otherwise False.
+        """
+        if not self.is_stop_valid(answer):
+            return False
+        return self.__dictionary is None or self.__dictionary.accepts(category, answer)
+
+    def validate_answers(
+        self, answers: dict[str, str] | list[dict[str, str]]
+    ) -> dict[str, bool] | list[dict[str, bool]]:
+        """
+        Checks a whole set of answers at once (see ``is_answer_valid``), as
+        scoring does.
+
+        Args:
+            answers: The answers of a player, keyed by category, or a list with
+                the answers of several players.
+
+        Returns:
+            For each category, whether the answer is valid; a list of these
+            dictionaries if a list was given.
+        """
+        if isinstance(answers, list):
+            return [self.validate_answers(player_answers) for player_answers in answers]  # type: ignore[misc]
+        is_valid = self.is_answer_valid
+        return {category: is_valid(category, answer) for category, answer in answers.items()}
             
     def add_player(self, name: str, points: int = 0) -> None:
         """
@@ -183,6 +384,7 @@ class Potstop:
             None
         """
         self.__players[name] = points
+        self.__leaderboard.add(name, points)
         self.__order.enqueue(name)
         
     def remove_player(self, name: str) -> Optional[str]:
@@ -200,12 +402,15 @@ class Potstop:
         Returns:
             The name of the removed player if they existed, otherwise None.
         """
-        if name not in self.__players:
-            return None
-        self.__order.remove(name)
-        removed = self.__players.remove(name)
-        if len(self.__players) == 0:
-            self.__game_started = False
+        with self.__round_changed:
+            removed = self.__players.discard(name)
+            if removed is None:
+                return None
+            self.__leaderboard.discard(name)
+            self.__order.remove(name)
+            if len(self.__players) == 0:
+                self.__game_started = False
+            self.__notify()
         return removed
         
     def get_points(self, name: str) -> Optional[int]:
@@ -219,6 +424,30 @@ class Potstop:
             The points for the player, or None if the player does not exist.
         """
         return self.__players.get(name)
+
+    def get_rank(self, name: str) -> Optional[int]:
+        """
+        Gets the position of a player in the ranking, in O(log n).
+
+        Args:
+            name: The name of the player.
+
+        Returns:
+            The rank of the player (1 for the leader), or None if the player does not exist.
+        """
+        return self.__leaderboard.rank(name)
+
+    def top_players(self, k: int) -> list[tuple[str, int]]:
+        """
+        Gets the first players of the ranking, without reading the whole ranking.
+
+        Args:
+            k: The number of players.
+
+        Returns:
+            The (name, points) of the best ``k`` players, best first.
+        """
+        return self.__leaderboard.top(k)
         
     def remove_leader(self) -> Optional[str]:
         """
@@ -233,7 +462,8 @@ class Potstop:
         """
         removed = self.__order.dequeue()
         if removed is not None:
-            self.__players.remove(removed)
+            self.__players.discard(removed)
+            self.__leaderboard.discard(removed)
         return removed
         
     def compute_points(self, name: str, answer: dict[str, str], counted_words: dict[str, dict[str, int]]) -> None:
@@ -243,39 +473,86 @@ class Potstop:
         This method evaluates each answer provided by a player in different categories.
         If an answer is valid and unique within its category, the player is awarded
         a higher point value. If the answer is not unique, a lower point value is assigned.
-        Invalid answers are ignored.
+        Answers are compared in their normalized form, through their ids in the
+        round, and validated (see ``is_answer_valid``) as they were sent; invalid
+        ones are ignored.
 
         Args:
             name: The name of the player whose points are being computed.
             answer: A dictionary containing the player's answers, where each key is a category
                     and the value is the player's answer for that category.
-            counted_words: A dictionary with categories as keys, and values being another
-                        dictionary that counts how many times each answer appears across
-                        all players.
+            counted_words: The result of ``count_words``: for each category, how many
+                        times each answer id appears across all players.
 
         Returns:
             None
         """
         for category, ans in answer.items():
-            try:
-                if not self.is_stop_valid(ans):
-                    continue
-                
-                if counted_words[category][ans] == 1:
-                    self.add_player_points(name, 10)
-                else:
-                    self.add_player_points(name, 5)
-            except KeyError:
+            answer_id = self.answer_id(ans)
+            counts = counted_words.get(category)
+            if answer_id is None or counts is None or answer_id not in counts:
+                continue
+            if not self.is_answer_valid(category, ans):
                 continue
+
+            if counts[answer_id] == 1:
+                self.add_player_points(name, 10)
+            else:
+                self.add_player_points(name, 5)
     
-    def count_words(self, answers: list[dict[str, str]]) -> dict[str, dict[str, int]]:
+    def compute_round_points(self, answers: list[tuple[str, dict[str, str]]]) -> dict[str, int]:
+        """
+        Computes and assigns the points of a whole round at once.
+
+        Equivalent to ``count_words`` followed by ``compute_points`` for each
+        player, but every answer is interned and counted in a single batched
+        pass (see ``scoring.score_round``), and each player's score is updated
+        only once.
+
+        Args:
+            answers: A list of (player name, answers) pairs, where the answers map
+                each category to the player's answer.
+
+        Returns:
+            The points earned in the round by each player.
+        """
+        earned: dict[str, int] = {}
+        points = score_round(answers, self.__pots, self.is_answer_valid, self.__answer_ids, self.__fuzzy_distance)
+        for (name, _), player_points in zip(answers, points.tolist()):
+            earned[name] = earned.get(name, 0) + player_points
+        for name, player_points in earned.items():
+            self.add_player_points(name, player_points)
+        return earned
+
+    def answer_id(self, answer: str) -> Optional[int]:
+        """
+        Returns the id of an answer in the current round.
+
+        Answers that only differ in case, accents or whitespace share an id.
+        The ids are kept until the next round starts.
+
+        Args:
+            answer: The answer as sent by the player.
+
+        Returns:
+            The id, or None if the answer is not a string or is longer than
+            ``max_answer_length``.
+        """
+        if not isinstance(answer, str):
+            return None
+        return self.__answer_ids.intern(answer)
+
+    def count_words(self, answers: list[dict[str, str]]) -> dict[str, dict[int, int]]:
         """
         Counts the occurrences of each answer in given categories across all players.
 
         This method iterates through the list of player answers and counts how many
-        times each answer appears for each category. The result is a dictionary where
-        each key is a category, and the value is another dictionary representing the
-        count of each answer within that category.
+        times each answer appears for each category. Answers are counted by their id
+        (see ``answer_id``), so "Arara", "arara" and " Arára" are the same answer and
+        the counts compare ints. With a ``fuzzy_distance``, answers grouped by
+        ``scoring.cluster_answers`` all get the count of their group. The result is a
+        dictionary where each key is a category, and the value is another dictionary
+        representing the count of each answer id within that category.
 
         Args:
             answers: A list of dictionaries containing player answers, where each key
@@ -283,56 +560,39 @@ class Potstop:
 
         Returns:
             A dictionary with categories as keys and values being dictionaries that map
-            each answer to the count of its occurrences across all players.
+            each answer id to the count of its occurrences across all players.
         """
         count = {}
         for pot in self.__pots:
             category = Counter()
             for ans in answers:
-                value = ans.get(pot)
-                if value is not None:
-                    category[value] += 1
+                answer_id = self.answer_id(ans.get(pot))
+                if answer_id is not None:
+                    category[answer_id] += 1
                     
+            if self.__fuzzy_distance and len(category) > 1:
+                ids = list(category)
+                groups = cluster_answers([self.__answer_ids.form(i) for i in ids], self.__fuzzy_distance)
+                totals = Counter()
+                for answer_id, group in zip(ids, groups):
+                    totals[group] += category[answer_id]
+                category = Counter({answer_id: totals[group] for answer_id, group in zip(ids, groups)})
             count[pot] = dict(category)
         return count
               
-    def __gen_pots(self) -> list[str]:
+    def __notify(self) -> None:
         """
-        Randomly generates a list of pot categories for the game.
-
-        This method selects a random category from each available pot category
-        set and assigns the resulting list to the instance variable `__pots`.
-
-        Returns:
-            A list of strings representing the randomly selected pot categories.
+        Wakes up the waiters of the round. Called holding ``__round_changed``.
         """
+        self.__round_changed.notify_all()
+        for callback in self.__watchers:
+            callback()
 
-        self.__pots = [random.choice(pot) for pot in self.__avaliable_pots]
-        return self.__pots  
-            
-    def __gen_letter(self) -> str:
+    def __plan_round(self) -> None:
         """
-        Randomly generates a letter for the game.
-
-        The letter is selected from an alphabet where each letter has a weight
-        associated with it. The weights are:
-        - Common letters: 5
-        - Rare letters (Z, X, Q, H, K, Y, W): 1 or 2
-
-        The letter is then assigned to the instance variable `__letter`.
-
-        Returns:
-            A string representing the randomly selected letter.
-        """
-        self.letters = [chr(i) for i in range(65, 91)]
-        self.weights = [5] * 26
-        rare = (
-            ("Z", 1), ("X", 1), ("Q", 2),
-            ("H", 2), ("K", 2), ("Y", 1),
-            ("W", 1)
-        )
-        for letter, weight in rare:
-            self.weights[ord(letter) - 65] = weight
-        self.__letter = random.choices(self.letters, weights=self.weights, k=1)[0]
-        return self.__letter
+        Sets the categories and the letter of the next round, drawn by the
+        room's ``RoundPlanner`` (which avoids repeating those of the last
+        rounds).
+        """
+        self.__letter, self.__pots = self.__planner.next()
             
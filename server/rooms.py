@@ -0,0 +1,116 @@
+import threading
+from contextlib import contextmanager
+from typing import Any, Iterator, Optional
+from dictionary import Dictionary
+from potstop import Potstop
+from rounds import RoundPlanner, Seed
+
+
+class Room:
+    """
+    Class representing a lobby hosting a single Potstop game.
+
+    Attributes:
+        id (str): The room identifier sent by the clients on JOIN.
+        potstop (Potstop): The game played in the room.
+        members (list): The clients that joined the room.
+    """
+
+    def __init__(
+        self,
+        room_id: str,
+        dictionary: Optional[Dictionary] = None,
+        fuzzy_distance: int = 0,
+        seed: Seed = None,
+    ) -> None:
+        self.id = room_id
+        planner = RoundPlanner(None if seed is None else f"{seed}/{room_id}")
+        self.potstop = Potstop(dictionary, fuzzy_distance, planner)
+        self.members: list[Any] = []
+
+    def __repr__(self) -> str:
+        return f"Room({self.id!r}, members={len(self.members)})"
+
+
+class RoomRegistry:
+    """
+    Registry of the rooms hosted by the server.
+
+    Rooms are created on demand by ``open`` and reclaimed as soon as their
+    last member leaves, so the registry only holds live games. Every change
+    in membership happens under the registry lock.
+
+    Every game checks its answers against the same ``dictionary``, if given,
+    and groups answers within the same ``fuzzy_distance`` (see ``Potstop``).
+    With a ``seed``, the rounds of each room are the same on every run (they
+    depend on the seed and the room id, not on the order rooms are opened).
+    """
+
+    DEFAULT_ROOM = "default"
+    MAX_ID_LENGTH = 64
+
+    def __init__(self, dictionary: Optional[Dictionary] = None, fuzzy_distance: int = 0, seed: Seed = None) -> None:
+        self.__dictionary = dictionary
+        self.__fuzzy_distance = fuzzy_distance
+        self.__seed = seed
+        self.__rooms: dict[str, Room] = {}
+        self.__lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.__rooms)
+
+    def __contains__(self, room_id: str) -> bool:
+        return room_id in self.__rooms
+
+    def get(self, room_id: str) -> Optional[Room]:
+        """
+        Returns the room with the given id, if it exists.
+        """
+        return self.__rooms.get(room_id)
+
+    @contextmanager
+    def open(self, room_id: str) -> Iterator[Room]:
+        """
+        Gives exclusive access to a room, creating it if needed.
+
+        The registry lock is held for the whole block, so no other thread can
+        join or leave any room meanwhile. If the room is still empty when the
+        block ends (e.g. the join was refused) it is reclaimed.
+
+        Args:
+            room_id (str): The id of the room.
+
+        Yields:
+            Room: The room with the given id.
+        """
+        with self.__lock:
+            room = self.__rooms.get(room_id)
+            if room is None:
+                room = self.__rooms[room_id] = Room(room_id, self.__dictionary, self.__fuzzy_distance, self.__seed)
+            try:
+                yield room
+            finally:
+                if not room.members:
+                    del self.__rooms[room_id]
+
+    def leave(self, client: Any) -> Optional[str]:
+        """
+        Removes a client from its room, reclaiming the room if it gets empty.
+
+        Args:
+            client: The client leaving. Must have ``name`` and ``room`` attributes.
+
+        Returns:
+            The name of the removed player if they were in a room, otherwise None.
+        """
+        with self.__lock:
+            room: Optional[Room] = client.room
+            if room is None:
+                return None
+            client.room = None
+            if client in room.members:
+                room.members.remove(client)
+            removed = room.potstop.remove_player(client.name)
+            if not room.members and self.__rooms.get(room.id) is room:
+                del self.__rooms[room.id]
+            return removed
@@ -0,0 +1,180 @@
+"""
+Planning of the letter and categories of each round.
+
+The tables are built once, when the module is imported: the weighted
+letters become an ``AliasTable``, so drawing a letter is O(1), and the
+categories of ``pots.py`` are numbered so that a set of them fits in an
+int used as a bitset.
+
+Each room has its own ``RoundPlanner``, which remembers the letters and
+categories of its last rounds in bitsets and does not draw them again
+until they are forgotten. With a seed, a planner always gives the same
+rounds. ``plan_rooms`` plans many rounds of many rooms at once with NumPy.
+"""
+import random
+from collections import deque
+from functools import reduce
+from itertools import accumulate
+from operator import or_
+from typing import NamedTuple, Optional, Union
+
+import numpy as np
+
+import pots
+from data_structures.alias_table import AliasTable
+
+LETTERS = tuple(chr(c) for c in range(ord("A"), ord("Z") + 1))
+RARE_LETTERS = {"Z": 1, "X": 1, "Q": 2, "H": 2, "K": 2, "Y": 1, "W": 1}
+LETTER_WEIGHTS = tuple(RARE_LETTERS.get(letter, 5) for letter in LETTERS)
+
+CATEGORIES = tuple(category for group in pots.pots for category in group)
+_STARTS = list(accumulate((len(group) for group in pots.pots), initial=0))
+GROUPS = tuple(range(start, stop) for start, stop in zip(_STARTS, _STARTS[1:]))  # category numbers per group
+
+LETTER_MEMORY = 5  # rounds before a letter can be drawn again
+POT_MEMORY = 1  # rounds before a category can be drawn again
+MAX_REJECTIONS = 16  # draws of a recent letter before sampling only the others
+
+_LETTER_TABLE = AliasTable(LETTER_WEIGHTS)
+
+Seed = Union[int, str, None]
+
+
+class RoundPlan(NamedTuple):
+    letter: str
+    pots: list[str]
+
+
+def _check_memory(letter_memory: int, pot_memory: int) -> None:
+    if not 0 <= letter_memory < len(LETTERS):
+        raise ValueError(f"letter_memory must be between 0 and {len(LETTERS) - 1}")
+    if pot_memory < 0:
+        raise ValueError("pot_memory must not be negative")
+
+
+class RoundPlanner:
+    """
+    Draws the letter and the categories (one of each group of ``pots.py``)
+    of the rounds of a room.
+
+    A letter used in the last ``letter_memory`` rounds, or a category used
+    in the last ``pot_memory`` rounds, is not drawn again; a group whose
+    categories were all used recently draws any of them. Letters keep the
+    weights of ``LETTER_WEIGHTS`` among the ones allowed.
+
+    The planner is not thread-safe: ``Potstop`` only plans a round while it
+    is starting one.
+    """
+
+    def __init__(self, seed: Seed = None, letter_memory: int = LETTER_MEMORY, pot_memory: int = POT_MEMORY):
+        _check_memory(letter_memory, pot_memory)
+        self.__random = random.Random(seed)
+        self.__letters: deque[int] = deque(maxlen=letter_memory)  # bitsets of the last rounds
+        self.__pots: deque[int] = deque(maxlen=pot_memory)
+        self.__recent_letters = 0
+        self.__recent_pots = 0
+
+    def next(self) -> RoundPlan:
+        """
+        Plans the next round.
+        """
+        letter = self.__draw_letter()
+        chosen = [self.__draw_pot(group) for group in GROUPS]
+        if self.__letters.maxlen:
+            self.__letters.append(1 << letter)
+            self.__recent_letters = reduce(or_, self.__letters)
+        if self.__pots.maxlen:
+            self.__pots.append(reduce(or_, [1 << category for category in chosen]))
+            self.__recent_pots = reduce(or_, self.__pots)
+        return RoundPlan(LETTERS[letter], [CATEGORIES[category] for category in chosen])
+
+    def plan(self, rounds: int) -> list[RoundPlan]:
+        """
+        Plans the next ``rounds`` rounds.
+        """
+        return [self.next() for _ in range(rounds)]
+
+    def __draw_letter(self) -> int:
+        recent = self.__recent_letters
+        for _ in range(MAX_REJECTIONS):
+            letter = _LETTER_TABLE.sample(self.__random)
+            if not recent >> letter & 1:
+                return letter
+        # Most of the weight is recent: draw among the allowed letters only
+        allowed = [letter for letter in range(len(LETTERS)) if not recent >> letter & 1]
+        return self.__random.choices(allowed, [LETTER_WEIGHTS[letter] for letter in allowed])[0]
+
+    def __draw_pot(self, group: range) -> int:
+        recent = self.__recent_pots
+        category = self.__random.choice(group)
+        if not recent >> category & 1:
+            return category
+        allowed = [category for category in group if not recent >> category & 1]
+        return self.__random.choice(allowed or group)
+
+
+def plan_rooms(
+    rooms: int,
+    rounds: int,
+    seed: Optional[int] = None,
+    letter_memory: int = LETTER_MEMORY,
+    pot_memory: int = POT_MEMORY,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Plans ``rounds`` rounds for each of ``rooms`` rooms at once, with the
+    rules of ``RoundPlanner``.
+
+    Every round is drawn for all the rooms together: letters with
+    ``AliasTable.sample_many``, and the rooms that drew a recent letter or
+    category draw again, until none does.
+
+    Returns:
+        The letters, as indexes of ``LETTERS``, in an array of shape
+        (rooms, rounds), and the categories, as indexes of ``CATEGORIES``,
+        in an array of shape (rooms, rounds, groups).
+    """
+    _check_memory(letter_memory, pot_memory)
+    if len(CATEGORIES) > 64:
+        raise ValueError("plan_rooms keeps the categories in 64-bit sets")
+    generator = np.random.default_rng(seed)
+    letters = np.empty((rooms, rounds), dtype=np.uint8)
+    chosen = np.empty((rooms, rounds, len(GROUPS)), dtype=np.uint8)
+    letter_history = np.zeros((rooms, max(letter_memory, 1)), dtype=np.uint32)
+    pot_history = np.zeros((rooms, max(pot_memory, 1)), dtype=np.uint64)
+    weights = np.array(LETTER_WEIGHTS, dtype=float)
+    one = np.uint64(1)
+
+    for round_index in range(rounds):
+        recent_letters = np.bitwise_or.reduce(letter_history, axis=1) if letter_memory else np.zeros(rooms, np.uint32)
+        drawn = _LETTER_TABLE.sample_many(generator, rooms)
+        pending = np.flatnonzero((recent_letters >> drawn.astype(np.uint32)) & 1)
+        for _ in range(MAX_REJECTIONS):
+            if not len(pending):
+                break
+            drawn[pending] = _LETTER_TABLE.sample_many(generator, len(pending))
+            pending = pending[((recent_letters[pending] >> drawn[pending].astype(np.uint32)) & 1) != 0]
+        for room in pending:
+            allowed = ((int(recent_letters[room]) >> np.arange(len(LETTERS))) & 1) == 0
+            p = weights * allowed
+            drawn[room] = generator.choice(len(LETTERS), p=p / p.sum())
+        letters[:, round_index] = drawn
+
+        recent_pots = np.bitwise_or.reduce(pot_history, axis=1) if pot_memory else np.zeros(rooms, np.uint64)
+        bits = np.zeros(rooms, dtype=np.uint64)
+        for g, group in enumerate(GROUPS):
+            group_mask = np.uint64(((1 << len(group)) - 1) << group.start)
+            # A group whose categories were all used recently draws any of them
+            blocked = np.where((recent_pots & group_mask) == group_mask, np.uint64(0), recent_pots)
+            picked = generator.integers(group.start, group.stop, rooms, dtype=np.uint64)
+            pending = np.flatnonzero((blocked >> picked) & one)
+            while len(pending):
+                picked[pending] = generator.integers(group.start, group.stop, len(pending), dtype=np.uint64)
+                pending = pending[((blocked[pending] >> picked[pending]) & one) != 0]
+            chosen[:, round_index, g] = picked
+            bits |= one << picked
+
+        if letter_memory:
+            letter_history[:, round_index % letter_memory] = np.uint32(1) << drawn.astype(np.uint32)
+        if pot_memory:
+            pot_history[:, round_index % pot_memory] = bits
+    return letters, chosen
@@ -0,0 +1,132 @@
+"""
+Batched scoring of a Potstop round.
+
+The answers of every player are interned to integer ids per category (two
+answers are the same if they only differ in case, accents or whitespace, see
+``normalize.InternTable``), the repetitions of each id are counted with NumPy
+and the points of the whole round are computed in one pass. Each distinct
+answer is validated only once, as it was sent (normalizing it only decides
+which answers are repeated).
+
+Optionally, answers within a small edit distance of each other (typos like
+"arrara" for "arara") are grouped with ``cluster_answers`` and count as the
+same answer too.
+"""
+from typing import Callable, Optional
+import numpy as np
+from data_structures.bktree import BKTree
+from normalize import InternTable
+
+UNIQUE_POINTS = 10
+SHARED_POINTS = 5
+MIN_FUZZY_LENGTH = 4  # shorter answers are only grouped when equal
+
+
+def cluster_answers(forms: list[str], max_distance: int) -> list[int]:
+    """
+    Groups the distinct answers of a category that are within an edit
+    distance of each other.
+
+    Each answer joins the group of the closest earlier answer that started a
+    group (the earliest, on ties), if one is within ``max_distance``, and
+    starts a group otherwise.
+    The answers starting groups are kept in a ``BKTree``, so each answer is
+    compared with a small part of them instead of with every one.
+
+    Args:
+        forms: The distinct normalized answers, in the order they were given.
+        max_distance: The largest edit distance between grouped answers; 0
+            groups nothing.
+
+    Returns:
+        For each answer, the index of the answer that started its group.
+    """
+    groups = list(range(len(forms)))
+    if max_distance <= 0:
+        return groups
+    tree = BKTree()
+    leaders: dict[str, int] = {}
+    for index, form in enumerate(forms):
+        if len(form) < MIN_FUZZY_LENGTH:
+            continue
+        matches = tree.search(form, max_distance)
+        if matches:
+            groups[index] = min((distance, leaders[leader]) for distance, leader in matches)[1]
+        else:
+            tree.add(form)
+            leaders[form] = index
+    return groups
+
+
+def score_round(
+    answers: list[tuple[str, dict[str, str]]],
+    pots: list[str],
+    is_valid: Callable[[str, str], bool],
+    table: Optional[InternTable] = None,
+    max_distance: int = 0,
+) -> np.ndarray:
+    """
+    Computes the points earned by each set of answers of a round.
+
+    Gives the same results as ``Potstop.count_words`` followed by
+    ``Potstop.compute_points`` for every player: a valid answer is worth
+    ``UNIQUE_POINTS`` if nobody else gave it in the same category and
+    ``SHARED_POINTS`` otherwise; invalid answers and categories outside
+    ``pots`` are worth nothing (but invalid answers still count as repeated).
+    Answers that are not strings, or that the table does not intern, are
+    ignored. With a ``max_distance``, answers grouped by ``cluster_answers``
+    count as repetitions of each other.
+
+    Args:
+        answers: The (player name, answers by category) pairs of the round.
+        pots: The categories of the round.
+        is_valid: The validator of a single answer, given its category and the
+            answer as sent.
+        table: The intern table of the round. Defaults to a new one.
+        max_distance: The edit distance up to which answers are grouped.
+
+    Returns:
+        An array with the points of each entry of ``answers``, in order.
+    """
+    table = table if table is not None else InternTable()
+    interned: dict[tuple[int, int], int] = {}
+    values: list[tuple[str, str]] = []
+    ids: list[int] = []
+    owners: list[int] = []
+    checked: dict[tuple[str, str], bool] = {}  # (category, answer as sent) -> valid
+    valid: list[bool] = []
+    members: dict[int, list[int]] = {}  # category -> its answer ids
+
+    for owner, (_, player_answers) in enumerate(answers):
+        for category, pot in enumerate(pots):
+            value = player_answers.get(pot)
+            if not isinstance(value, str) or (form_id := table.intern(value)) is None:
+                continue
+            key = (category, form_id)
+            answer_id = interned.get(key)
+            if answer_id is None:
+                answer_id = interned[key] = len(values)
+                values.append((pot, table.form(form_id)))
+                members.setdefault(category, []).append(answer_id)
+            ids.append(answer_id)
+            owners.append(owner)
+            is_answer_valid = checked.get((pot, value))
+            if is_answer_valid is None:
+                is_answer_valid = checked[(pot, value)] = is_valid(pot, value)
+            valid.append(is_answer_valid)
+
+    if not ids:
+        return np.zeros(len(answers), dtype=np.int64)
+
+    id_array = np.array(ids, dtype=np.intp)
+    counts = np.bincount(id_array, minlength=len(values))
+    if max_distance > 0:
+        groups = np.arange(len(values))
+        for category_ids in members.values():
+            leaders = cluster_answers([values[i][1] for i in category_ids], max_distance)
+            groups[category_ids] = np.array(category_ids)[leaders]
+        counts = np.bincount(groups, weights=counts, minlength=len(values))[groups]
+    points = np.where(counts[id_array] == 1, UNIQUE_POINTS, SHARED_POINTS) * np.array(valid, dtype=bool)
+
+    totals = np.bincount(np.array(owners, dtype=np.intp), weights=points, minlength=len(answers))
+    return totals.astype(np.int64)
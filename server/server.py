@@ -1,119 +1,715 @@
+import os
 import threading
 import socket
 import json
-from potstop import Potstop
 import time
-from typing import Optional
-import sys
+import asyncio
+import argparse
+from dictionary import DEFAULT_INDEX, Dictionary
+from framing import FrameDecoder, FrameError, encode_frame, split_request_id
+from logger import FORMATS, LEVELS, Logger
+from metrics import MetricsRegistry
+from outbox import Frame, Outbox, OutboxStats
+from potstop import Potstop
+from rooms import Room, RoomRegistry
+from workers import Dispatcher, join_room, owner, receive_connection, send_connection
+from typing import Callable, Optional
 
 class Client:
     """ 
     Class to represent a client connected to the server.
+
+    Messages to the client are enqueued in its outbox and written by a
+    dedicated writer thread (``drain``), so a slow client never blocks the
+    thread that sends to it. If the outbox fills up, the connection is shut
+    down and the reader thread cleans it up.
     
     Attributes:
         socket (socket): The client's socket object.
         address (tuple[str, int]): The client's address as a tuple of host and port.
         name (str): The client's name, if any.
+        room (Optional[Room]): The room the client joined, if any.
+        outbox (Outbox): The frames waiting to be sent to the client.
+        writer (Optional[Thread]): The thread running ``drain``, if any.
     """
     
-    def __init__(self, socket: socket, address: tuple[str, int], name: str = "") -> None:
+    def __init__(
+        self,
+        socket: socket,
+        address: tuple[str, int],
+        name: str = "",
+        outbox: Optional[Outbox] = None,
+    ) -> None:
         self.socket = socket
         self.address = address
         self.name = name
+        self.room: Optional[Room] = None
+        self.outbox = outbox if outbox is not None else Outbox()
+        self.writer: Optional[threading.Thread] = None
 
     def __eq__(self, other: "Client") -> bool:
         return self.address == other.address
-    
+
+    def __hash__(self) -> int:
+        return hash(self.address)
+
+    def send(self, data: Frame, timeout: float = 0) -> None:
+        """
+        Enqueues raw bytes to be sent to the client.
+
+        Args:
+            data (Frame): The encoded message to be sent. It is not copied, so
+                the same buffer may be shared by several clients.
+            timeout (float): How long to wait for room in a full outbox before
+                dropping the client, in seconds. Defaults to 0 (never block).
+        """
+        if not self.outbox.put(data, timeout) and self.outbox.overflowed:
+            self.abort()
+
+    def drain(self) -> None:
+        """
+        Writes the outbox to the socket until the client is closed.
+
+        Runs in its own thread. A partial send resumes from the offset it
+        reached through a ``memoryview`` of the frame, so the frame is never
+        copied. Closes the socket once the outbox is closed and every pending
+        frame was written.
+        """
+        while (data := self.outbox.get()) is not None:
+            try:
+                with memoryview(data) as view:
+                    offset = 0
+                    while offset < len(view):
+                        offset += self.socket.send(view[offset:])
+            except OSError:
+                self.abort()
+                break
+        self.socket.close()
+
+    def abort(self) -> None:
+        """
+        Drops the connection right away, discarding the pending frames.
+        """
+        self.outbox.close()
+        try:
+            self.socket.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+
+    def close(self) -> None:
+        """
+        Closes the connection with the client after the pending frames are sent.
+        """
+        self.outbox.close()
+
+
+class AsyncClient(Client):
+    """
+    Client connected through the event loop serving mode.
+
+    Frames sent from the loop thread go straight to the transport while it
+    accepts writes. Otherwise they wait in the outbox, which is drained by the
+    loop once the transport stops asking to pause writing, so ``send`` and
+    ``close`` can be called from any thread (e.g. the one reading stdin, which
+    sends ENDC on shutdown). The loop thread never waits for room in the
+    outbox.
+
+    Attributes:
+        transport (asyncio.Transport): The transport of the connection.
+        loop (asyncio.AbstractEventLoop): The loop that owns the transport.
+    """
+
+    def __init__(
+        self,
+        transport: asyncio.Transport,
+        loop: asyncio.AbstractEventLoop,
+        name: str = "",
+        outbox: Optional[Outbox] = None,
+    ) -> None:
+        super().__init__(transport.get_extra_info("socket"), transport.get_extra_info("peername"), name, outbox)
+        self.transport = transport
+        self.loop = loop
+        self.__paused = False
+        self.__flush_scheduled = False
+        self.__loop_thread = threading.get_ident()
+
+    def send(self, data: Frame, timeout: float = 0) -> None:
+        if threading.get_ident() == self.__loop_thread:
+            if not self.__paused and not len(self.outbox) and not self.outbox.closed:
+                self.transport.write(data)
+                return
+            timeout = 0
+        if self.outbox.put(data, timeout):
+            self.__schedule_flush()
+        elif self.outbox.overflowed:
+            self.abort()
+
+    def pause_writing(self) -> None:
+        self.__paused = True
+
+    def resume_writing(self) -> None:
+        self.__paused = False
+        self.__flush()
+
+    def abort(self) -> None:
+        self.outbox.close()
+        self.loop.call_soon_threadsafe(self.transport.abort)
+
+    def close(self) -> None:
+        self.outbox.close()
+        self.__schedule_flush()
+
+    def __schedule_flush(self) -> None:
+        if not self.__flush_scheduled:
+            self.__flush_scheduled = True
+            self.loop.call_soon_threadsafe(self.__flush)
+
+    def __flush(self) -> None:
+        """
+        Writes the outbox to the transport. Runs on the loop thread.
+        """
+        self.__flush_scheduled = False
+        while not self.__paused and (data := self.outbox.get_nowait()) is not None:
+            self.transport.write(data)
+        if self.outbox.closed and not len(self.outbox) and not self.transport.is_closing():
+            self.transport.close()
+
+
+class PopProtocol(asyncio.Protocol):
+    """
+    asyncio protocol for a single POP connection.
+
+    Holds no state besides the client and its frame decoder, so an idle
+    connection costs one protocol object and the transport buffers. Everything
+    else is delegated to the callbacks given by the server.
+
+    When ``served_elsewhere`` says a message belongs to another worker process,
+    reading stops and ``on_hand_back`` receives that message and everything
+    received after it, so the connection can be handed over.
+    """
+
+    def __init__(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        new_outbox: Callable[[], Outbox],
+        on_connect: Callable[[Client], None],
+        on_message: Callable[[Client, str], None],
+        on_disconnect: Callable[[Client], None],
+        served_elsewhere: Optional[Callable[[Client, str], bool]] = None,
+        on_hand_back: Optional[Callable[[Client, bytes], None]] = None,
+    ) -> None:
+        self.__loop = loop
+        self.__new_outbox = new_outbox
+        self.__on_connect = on_connect
+        self.__on_message = on_message
+        self.__on_disconnect = on_disconnect
+        self.__served_elsewhere = served_elsewhere
+        self.__on_hand_back = on_hand_back
+        self.client: Optional[AsyncClient] = None
+        self.__decoder = FrameDecoder()
+
+    def connection_made(self, transport: asyncio.BaseTransport) -> None:
+        # asyncio only disables Nagle for sockets created with proto=IPPROTO_TCP
+        transport.get_extra_info("socket").setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, True)
+        self.client = AsyncClient(transport, self.__loop, outbox=self.__new_outbox())  # type: ignore[arg-type]
+        self.__on_connect(self.client)
+
+    def data_received(self, data: bytes) -> None:
+        assert self.client is not None
+        try:
+            messages = self.__decoder.feed(data)
+        except (FrameError, UnicodeDecodeError):
+            self.client.transport.close()
+            return
+        for index, msg in enumerate(messages):
+            if self.__served_elsewhere is not None and self.__served_elsewhere(self.client, msg):
+                assert self.__on_hand_back is not None
+                self.client.transport.pause_reading()
+                unprocessed = b"".join(map(encode_frame, messages[index:])) + self.__decoder.take_pending()
+                self.__on_hand_back(self.client, unprocessed)
+                return
+            self.__on_message(self.client, msg)
+
+    def pause_writing(self) -> None:
+        if self.client is not None:
+            self.client.pause_writing()
+
+    def resume_writing(self) -> None:
+        if self.client is not None:
+            self.client.resume_writing()
+
+    def connection_lost(self, exc: Optional[Exception]) -> None:
+        if self.client is not None:
+            self.__on_disconnect(self.client)
+
+
 class Server:
-    def __init__(self, port: int = 8888):
+    MODES = ("thread", "async")
+    COMMANDS = ("QUIT", "JOIN", "START", "STOP", "STATS")
+    ANSWERS_TIMEOUT = 5
+    SETTLEMENT_TIMEOUT = 7.5
+    REPLY_TIMEOUT = 5
+
+    def __init__(
+        self,
+        port: int = 8888,
+        mode: str = "thread",
+        outbox_limit: int = Outbox.DEFAULT_LIMIT,
+        metrics_file: Optional[str] = None,
+        metrics_interval: float = 10,
+        logger: Optional[Logger] = None,
+        channel: Optional[socket.socket] = None,
+        worker: int = 0,
+        workers: int = 1,
+        dictionary: Optional[Dictionary] = None,
+        fuzzy_distance: int = 0,
+        seed: Optional[int] = None,
+    ):
+        """
+        Args:
+            port (int): The port to listen on.
+            mode (str): "thread" or "async" (see ``start``).
+            outbox_limit (int): Frames each client outbox holds.
+            metrics_file (Optional[str]): Where to dump the metrics periodically.
+            metrics_interval (float): Seconds between metrics dumps.
+            logger (Optional[Logger]): The logger; defaults to info on stdout.
+            channel (Optional[socket]): When given, the server is worker
+                ``worker`` of ``workers``: instead of listening, it serves the
+                connections a ``Dispatcher`` sends through this channel and
+                hands back the ones joining rooms owned by other workers.
+            dictionary (Optional[Dictionary]): Word lists the answers of
+                every room are checked against.
+            fuzzy_distance (int): Edit distance up to which the answers of a
+                round count as the same answer; 0 disables it.
+            seed (Optional[int]): Makes the letters and categories of the
+                rounds of each room reproducible.
+        """
+        if mode not in self.MODES:
+            raise ValueError(f"Invalid mode: {mode}")
         self.__host = "0.0.0.0"
         self.__port = port
+        self.__mode = mode
+        self.__outbox_limit = outbox_limit
+        self.__outbox_stats = OutboxStats()
         self.__server_sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
         self.__server_sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, True)
-        self.__clients: list[Client] = []
-        self.__potstop = Potstop()
+        # Clientes conectados, pelo endereço (remoção em O(1))
+        self.__clients: dict[tuple[str, int], Client] = {}
+        self.__rooms = RoomRegistry(dictionary, fuzzy_distance, seed)
+        self.__loop: Optional[asyncio.AbstractEventLoop] = None
+        self.__tasks: set[asyncio.Task] = set()
+        self.__closed: Optional[asyncio.Event] = None
+        self.__metrics_file = metrics_file
+        self.__metrics_interval = metrics_interval
+        self.log = logger if logger is not None else Logger()
+        self.__channel = channel
+        self.__worker = worker
+        self.__workers = workers
+        self.metrics = MetricsRegistry()
+        self.__register_metrics()
         
     def start(self):
         """
         Starts the server to accept client connections.
 
-        This method binds the server socket to the specified host and port, listens
-        for incoming connections, and spawns a thread to handle each client request.
-        It also starts a separate thread to monitor for server shutdown requests.
+        This method binds the server socket to the specified host and port and
+        listens for incoming connections. In "thread" mode a thread is spawned to
+        handle each client; in "async" mode every connection is multiplexed on a
+        single event loop (see ``__serve_async``). It also starts a separate
+        thread to monitor for server shutdown requests.
+
+        A worker (see ``channel``) does not listen nor read stdin: it serves
+        the connections received through its channel and shuts down when the
+        dispatcher closes it.
 
         Raises:
             OSError: If there is an issue with the server socket.
             KeyboardInterrupt: If the server is manually interrupted.
         """
 
-        self.__server_sock.bind((self.__host, self.__port))
-        self.__server_sock.listen(10)
-        threading.Thread(target=self.__stop_server, daemon=True).start()
-        
-        print(f"[+] Servidor escutando em {self.__host}:{self.__port}")
+        if self.__channel is None:
+            self.__server_sock.bind((self.__host, self.__port))
+            self.__server_sock.listen(socket.SOMAXCONN)
+            threading.Thread(target=self.__stop_server, daemon=True).start()
+            self.log.info("listening", host=self.__host, port=self.__port, mode=self.__mode)
+        else:
+            self.__server_sock.close()
+            self.log.info("worker_ready", worker=self.__worker, mode=self.__mode)
+        if self.__metrics_file is not None:
+            self.metrics.start_dumping(self.__metrics_file, self.__metrics_interval)
+
+        if self.__mode == "async":
+            try:
+                asyncio.run(self.__serve_async())
+            except KeyboardInterrupt:
+                pass
+            self.log.close()
+            return
         
         while True:
             try:
-                client_sock, address = self.__server_sock.accept()
-                client = Client(client_sock, address)
-                self.__clients.append(client)
-                threading.Thread(target=self.__handle_client_requests, args=(client,), daemon=True).start()
+                if self.__channel is None:
+                    client_sock, address = self.__server_sock.accept()
+                    data = b""
+                elif (received := receive_connection(self.__channel)) is not None:
+                    client_sock, data = received
+                    address = client_sock.getpeername()
+                else:
+                    self.__shutdown_worker()
+                    break
+                self.__serve_client(client_sock, address, data)
             except (OSError, KeyboardInterrupt):
                 break
+        self.log.close()
+
+    def __serve_client(self, client_sock: socket.socket, address: tuple[str, int], data: bytes = b"") -> None:
+        """
+        Starts the reader and writer threads of a new connection (thread mode).
+
+        Args:
+            client_sock (socket): The connected socket.
+            address (tuple[str, int]): The client's address.
+            data (bytes): Bytes already read from the socket (by the dispatcher).
+        """
+        # Broadcasts and replies are small back-to-back writes: with
+        # Nagle on, the second waits ~40 ms for the delayed ACK
+        client_sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, True)
+        client = Client(client_sock, address, outbox=self.__new_outbox())
+        self.__add_client(client)
+        client.writer = threading.Thread(target=client.drain, daemon=True)
+        client.writer.start()
+        threading.Thread(target=self.__handle_client_requests, args=(client, data), daemon=True).start()
+
+    async def __serve_async(self) -> None:
+        """
+        Serves every client connection from a single event loop.
+
+        Connections are handled by ``PopProtocol`` instances, which dispatch
+        incoming messages to ``__handle_async_message``. STOP, which waits for
+        the other players, runs as a task on the same loop, so no thread is
+        held while it waits. Returns once the server is asked to shut down.
+        """
+        _raise_open_files_limit()
+        self.__loop = asyncio.get_running_loop()
+        self.__closed = asyncio.Event()
+
+        if self.__channel is not None:
+            self.__loop.add_reader(self.__channel, self.__receive_async)
+            await self.__closed.wait()
+            self.__loop.remove_reader(self.__channel)
+        else:
+            self.__server_sock.setblocking(False)
+            server = await self.__loop.create_server(self.__new_protocol, sock=self.__server_sock)
+            async with server:
+                await self.__closed.wait()
+        for task in tuple(self.__tasks):
+            task.cancel()
+
+    def __new_protocol(self) -> PopProtocol:
+        assert self.__loop is not None
+        if self.__channel is None:
+            return PopProtocol(
+                self.__loop, self.__new_outbox, self.__add_client, self.__handle_async_message, self.__disconnect,
+            )
+        return PopProtocol(
+            self.__loop, self.__new_outbox, self.__add_client, self.__handle_async_message, self.__disconnect,
+            self.__served_elsewhere, self.__hand_back_async,
+        )
+
+    def __add_client(self, client: Client) -> None:
+        self.__clients[client.address] = client
+
+    def __receive_async(self) -> None:
+        """
+        Serves a connection sent by the dispatcher. Runs on the loop thread
+        whenever the channel is readable.
+        """
+        assert self.__loop is not None and self.__closed is not None
+        try:
+            received = receive_connection(self.__channel)
+        except OSError:
+            received = None
+        if received is None:
+            self.__shutdown_worker()
+            self.__closed.set()
+            return
+        client_sock, data = received
+        client_sock.setblocking(False)
+        self.__loop.create_task(self.__connect_async(client_sock, data))
+
+    async def __connect_async(self, client_sock: socket.socket, data: bytes) -> None:
+        assert self.__loop is not None
+        try:
+            _, protocol = await self.__loop.connect_accepted_socket(self.__new_protocol, client_sock)
+        except OSError:
+            client_sock.close()
+            return
+        protocol.data_received(data)
+
+    def __served_elsewhere(self, client: Client, msg: str) -> bool:
+        """
+        Checks if a message joins a room owned by another worker.
+        """
+        if self.__channel is None or client.room is not None:
+            return False
+        room_id = join_room(msg)
+        return room_id is not None and owner(room_id, self.__workers) != self.__worker
+
+    def __send_back(self, client: Client, sock: socket.socket, data: bytes) -> None:
+        """
+        Hands a connection back to the dispatcher, to be routed to the worker
+        owning the room it joins.
+
+        Args:
+            client (Client): The client being handed back.
+            sock (socket): A duplicate of the client's socket, closed here.
+            data (bytes): The unprocessed bytes, starting with the JOIN frame.
+        """
+        assert self.__channel is not None
+        try:
+            send_connection(self.__channel, sock, data)
+            self.__handed_back.inc()
+            self.log.info("handed_back", peer=client.address)
+        except OSError as e:
+            self.log.warning("hand_back_failed", peer=client.address, error=str(e))
+            sock.shutdown(socket.SHUT_RDWR)
+        finally:
+            sock.close()
+
+    def __hand_back_async(self, client: Client, data: bytes) -> None:
+        """
+        Hands a connection back once every pending frame was written, so
+        responses keep their order. Runs on the loop thread.
+        """
+        assert self.__loop is not None and isinstance(client, AsyncClient)
+        deadline = self.__loop.time() + self.REPLY_TIMEOUT
+        transport = client.transport
+
+        def attempt() -> None:
+            if transport.is_closing():
+                return
+            if (len(client.outbox) or transport.get_write_buffer_size()) and self.__loop.time() < deadline:
+                self.__loop.call_later(0.005, attempt)
+                return
+            sock = transport.get_extra_info("socket")
+            self.__send_back(client, socket.socket(sock.family, sock.type, fileno=os.dup(sock.fileno())), data)
+            transport.abort()
+
+        attempt()
+
+    def __shutdown_worker(self) -> None:
+        """
+        Shuts a worker down after the dispatcher closed its channel.
+        """
+        self.log.info("shutting_down", worker=self.__worker)
+        self.metrics.stop_dumping()
+        self.__kill_clients()
+
+    def __handle_async_message(self, client: Client, msg: str) -> None:
+        """
+        Handles a message received by the event loop.
+
+        Runs on the loop thread. Non-blocking commands are answered inline while
+        STOP becomes a task (see ``__respond_stop``), since it waits for the
+        other players.
+
+        Args:
+            client (Client): The client that sent the message.
+            msg (str): The message sent by the client.
+        """
+        command, _ = split_request_id(msg.split("\n")[0])
+        if command == "STOP":
+            assert self.__loop is not None
+            task = self.__loop.create_task(self.__respond_stop(client, msg))
+            self.__tasks.add(task)
+            task.add_done_callback(self.__tasks.discard)
+        else:
+            self.__respond(client, msg)
+
+    async def __respond_stop(self, client: Client, msg: str) -> None:
+        """
+        Processes a STOP and sends the response back to the client (async
+        mode), like ``__respond``.
+
+        The answers are saved on the loop thread as soon as the message
+        arrives; the wait for the other players is awaited, not blocked on.
+
+        Args:
+            client (Client): The client that sent the message.
+            msg (str): The message sent by the client.
+        """
+        self.log.message("request", client.name or client.address, msg)
+        started = time.perf_counter()
+        _, request_id = split_request_id(msg.split("\n")[0])
+        response = self.__record("STOP", request_id, await self.__stop_async(client, msg), started)
+        self.log.message("response", client.name or client.address, response)
+        client.send(encode_frame(response))
+
+    def __respond(self, client: Client, msg: str) -> None:
+        """
+        Processes a message and sends the response back to the client.
+
+        Both are handed to the logger, which samples, truncates and writes
+        them off this thread.
+
+        Args:
+            client (Client): The client that sent the message.
+            msg (str): The message sent by the client.
+        """
+        self.log.message("request", client.name or client.address, msg)
+        response = self.__handle_message(client, msg)
+        self.log.message("response", client.name or client.address, response)
+        client.send(encode_frame(f"{response}"), timeout=self.REPLY_TIMEOUT)
+        if msg.startswith('QUIT') and self.__mode == "async":
+            client.close()
     
-    def broadcast(self, msg: str, exclude: Optional[set[str]] = None) -> None:
+    def broadcast(self, msg: str, exclude: Optional[set[str]] = None, room: Optional[Room] = None) -> None:
         """
-        Broadcasts a message to all connected clients, optionally excluding
-        some by their name.
+        Broadcasts a message to the members of a room (or to every connected
+        client), optionally excluding some by their name.
+
+        The message is encoded once into an immutable frame and a read-only
+        view of it is enqueued in the outbox of each recipient, so this returns
+        immediately even if some of them are slow and costs no copies per
+        recipient.
 
         Args:
             msg (str): The message to be broadcasted.
             exclude (set[str], optional): A set of client names to be excluded
                 from the broadcast. Defaults to None.
+            room (Room, optional): The room whose members receive the message.
+                Defaults to None, which broadcasts to every connected client.
         """
         
+        started = time.perf_counter()
         if exclude is None:
             exclude = set()
-        
-        for client in self.__clients:
+
+        recipients = tuple(room.members) if room is not None else tuple(self.__clients.values())
+        frame = memoryview(encode_frame(msg))
+        sent = 0
+        for client in recipients:
             if client.name == '' or client.name in exclude: 
                 continue
-            client.socket.sendall(msg.encode())
-            print(f"<BROADCAST> [{client.name or client.address}] {repr(msg)[1:-1]}")
+            client.send(frame)
+            sent += 1
+        self.__broadcast_latency.observe(time.perf_counter() - started)
+        self.__broadcast_frames.inc(sent)
+        self.log.message("broadcast", None, msg, room=room.id if room is not None else "*", recipients=sent)
     
-    def __handle_client_requests(self, client: Client) -> None:
+    def outbound_stats(self) -> dict[str, int]:
+        """
+        Returns the counters of the clients' outboxes.
+
+        Returns:
+            dict[str, int]: "depth" (frames currently queued), "peak_depth",
+            "enqueued", "dropped" (frames refused by full or closed outboxes) and
+            "disconnects" (slow clients dropped).
+        """
+        stats = self.__outbox_stats
+        return {
+            "depth": sum(len(client.outbox) for client in tuple(self.__clients.values())),
+            "peak_depth": stats.peak_depth,
+            "enqueued": stats.enqueued,
+            "dropped": stats.dropped,
+            "disconnects": stats.disconnects,
+        }
+
+    def __register_metrics(self) -> None:
+        """
+        Creates the metrics recorded by the server.
+
+        Handlers keep references to the counters and histograms, so recording
+        never looks them up by name. Connections, rooms and outbox counters are
+        gauges, read only when a snapshot is taken.
+        """
+        metrics = self.metrics
+        # Latência de cada comando e quantas respostas foram de erro
+        self.__command_latency = {command: metrics.histogram(f"command.{command}") for command in self.COMMANDS}
+        self.__command_errors = {command: metrics.counter(f"command.{command}.errors") for command in self.COMMANDS}
+        self.__bad_requests = metrics.counter("command.bad_requests")
+        self.__broadcast_latency = metrics.histogram("broadcast.fanout")
+        self.__broadcast_frames = metrics.counter("broadcast.frames")
+        self.__settlement_latency = metrics.histogram("round.settlement")
+
+        metrics.gauge("connections.active", lambda: len(self.__clients))
+        metrics.gauge("rooms.active", lambda: len(self.__rooms))
+        metrics.gauge("log.dropped", lambda: self.log.dropped)
+        self.__handed_back = metrics.counter("workers.handed_back")
+        for name in ("peak_depth", "enqueued", "dropped", "disconnects"):
+            metrics.gauge(f"outbox.{name}", lambda name=name: getattr(self.__outbox_stats, name))
+
+    def __new_outbox(self) -> Outbox:
+        return Outbox(self.__outbox_limit, self.__outbox_stats)
+
+    def __handle_client_requests(self, client: Client, data: bytes = b"") -> None:
         """
         Handles client requests.
 
-        This function will run in its own thread and wait for incoming messages
-        from the client. When a message is received, it will be processed and a
-        response will be sent back to the client.
+        This function will run in its own thread and wait for incoming frames
+        from the client. Each complete message is processed and a response is
+        sent back to the client. A malformed frame ends the connection.
+
+        In a worker, a JOIN to a room owned by another worker hands the
+        connection back to the dispatcher, after the pending responses are
+        written.
 
         Args:
             client (Client): The client object that sent the message.
+            data (bytes): Bytes already read from the socket, handled first.
 
         Raises:
             ConnectionResetError: If the client disconnects unexpectedly.
         """
-        while True:
+        decoder = FrameDecoder()
+        quit_requested = False
+        while not quit_requested:
             try:
-                msg: str = client.socket.recv(1024).decode()
-                if not msg:
+                data = data or client.socket.recv(65536)
+                if not data:
                     break
                 
-                print(f"> [{client.name or client.address}] {repr(msg)[1:-1]}")
-                response = self.__handle_message(client, msg)
-                print(f"< [{client.name or client.address}] {repr(response)[1:-1]}")
-                client.socket.sendall(f"{response}".encode())
-                if msg.startswith('QUIT'):
-                    break
-            except ConnectionResetError:
+                messages = decoder.feed(data)
+                data = b""
+                for index, msg in enumerate(messages):
+                    if self.__served_elsewhere(client, msg):
+                        unprocessed = b"".join(map(encode_frame, messages[index:])) + decoder.take_pending()
+                        self.__hand_back(client, unprocessed)
+                        return
+                    self.__respond(client, msg)
+                    if msg.startswith('QUIT'):
+                        quit_requested = True
+                        break
+            except (OSError, FrameError, UnicodeDecodeError):
                 break
         
-        print(f"[-] Conexão encerrada com {client.name or client.address}")
-        self.__clients.remove(client)
-        self.__potstop.remove_player(client.name)
-        client.socket.close()
+        self.__disconnect(client)
+
+    def __hand_back(self, client: Client, data: bytes) -> None:
+        """
+        Hands a connection back to the dispatcher (thread mode).
+
+        The socket is duplicated first: the writer thread closes its own
+        descriptor once the outbox is flushed, without ending the connection.
+        """
+        sock = client.socket.dup()
+        client.close()
+        if client.writer is not None:
+            client.writer.join(self.REPLY_TIMEOUT)
+        self.__clients.pop(client.address, None)
+        self.__send_back(client, sock, data)
+
+    def __disconnect(self, client: Client) -> None:
+        """
+        Releases everything held by a client whose connection ended.
+
+        Args:
+            client (Client): The disconnected client.
+        """
+        self.log.info("disconnected", peer=client.name or client.address)
+        self.__clients.pop(client.address, None)
+        self.__rooms.leave(client)
+        client.close()
         
     def __handle_message(self, client: Client, data: str) -> str:
         """
@@ -126,10 +722,17 @@ class Server:
 
         The handlers for the "JOIN" and "STOP" commands will receive the entire
         message, including the first line, as an argument. The handlers for the
-        "QUIT" and "START" commands will only receive the client as an argument.
+        "QUIT", "START" and "STATS" commands will only receive the client as an argument.
 
         If the command is not recognized, the function will return "0 Bad Request".
 
+        Every command is timed into the ``command.<COMMAND>`` histogram, and
+        error responses are counted in ``command.<COMMAND>.errors``.
+
+        The first line may carry a request id after the command ("STOP #7"). In
+        that case the id is echoed at the end of the first line of the response
+        ("10 Stopped #7"), so the client can match responses to requests.
+
         Args:
             client (Client): The client that sent the message.
             data (str): The message sent by the client.
@@ -141,17 +744,47 @@ class Server:
             "QUIT": self.__quit,
             "JOIN": self.__join,
             "START": self.__start,
-            "STOP": self.__stop    
+            "STOP": self.__stop,
+            "STATS": self.__stats
         }
         
-        command = data.split("\n")[0]
+        started = time.perf_counter()
+        command, request_id = split_request_id(data.split("\n")[0])
         if command not in commands:
-            return "0 Bad Request"
-        
+            self.__bad_requests.inc()
+            return self.__record(None, request_id, "0 Bad Request", started)
         if command in ["JOIN", "STOP"]:
-            return commands[command](client, data)
-        
-        return commands[command](client)
+            response = commands[command](client, data)
+        else:
+            response = commands[command](client)
+        return self.__record(command, request_id, response, started)
+
+    def __record(self, command: Optional[str], request_id: Optional[str], response: str, started: float) -> str:
+        """
+        Times a command into its metrics and echoes the request id, if any,
+        at the end of the first line of the response.
+
+        Args:
+            command (Optional[str]): The command answered, or None if it
+                was not recognized.
+            request_id (Optional[str]): The id of the request.
+            response (str): The response to the request.
+            started (float): When the request started being handled
+                (``time.perf_counter``).
+
+        Returns:
+            str: The response to send.
+        """
+        if command is not None:
+            self.__command_latency[command].observe(time.perf_counter() - started)
+            # Códigos de sucesso terminam em 0 (10 Stopped, 20 Joined, ...)
+            if response[1:2] != "0":
+                self.__command_errors[command].inc()
+
+        if request_id is None:
+            return response
+        status, sep, body = response.partition("\n")
+        return f"{status} #{request_id}{sep}{body}"
         
     def __quit(self, client: Client) -> str: 
         """
@@ -170,47 +803,64 @@ class Server:
             player does not exist in the game.
         """
 
-        if self.__potstop.remove_player(client.name) is None:
+        if self.__rooms.leave(client) is None:
             return "31 Player Not Found"
         return "30 Left"
     
     def __join(self, client: Client, data: str) -> str:
         """
-        Handles the client's request to join the game.
+        Handles the client's request to join a game room.
 
-        This method attempts to add the client to the game with the given name. If
-        the game is full, the player is already joined, the name is invalid, or the
-        game has already started, an error message is returned. If the player is
-        successfully added to the game, a success message is returned.
+        This method attempts to add the client, with the given name, to the game of
+        the requested room (or of the default room if none is given). The room is
+        created if it does not exist yet. If the game is full, the player is already
+        joined, the name or room id is invalid, or the game has already started, an
+        error message is returned. If the player is successfully added to the game,
+        a success message is returned.
 
         Args:
             client (Client): The client requesting to join the game.
             data (str): The message sent by the client, which should contain the
-                client's desired name on the second line.
+                client's desired name on the second line and, optionally, the
+                room id on the third line.
 
         Returns:
             str: A response code indicating the result of the join request. "20
                 Joined" if the player was successfully added to the game, "21 Full
                 Lobby" if the game is full, "22 Already Joined" if the player is
                 already joined, "23 Already Started" if the game has already
-                started, "24 Invalid Name" if the name is invalid, or "0 Bad
-                Request" if the message is malformed.
+                started, "24 Invalid Name" if the name is invalid, "25 Invalid
+                Room" if the room id is too long, or "0 Bad Request" if the
+                message is malformed.
         """
+        lines = data.split('\n')
         try:
-            name = data.split('\n')[1].strip()
+            name = lines[1].strip()
         except IndexError:
             return "0 Bad Request"
-        if len(self.__potstop.players) >= self.__potstop.player_limit:
-            return "21 Full Lobby"
-        if name in self.__potstop.players:
+        room_id = lines[2].strip() if len(lines) > 2 else ''
+        room_id = room_id or RoomRegistry.DEFAULT_ROOM
+        if len(room_id) > RoomRegistry.MAX_ID_LENGTH:
+            return "25 Invalid Room"
+        if client.room is not None:
             return "22 Already Joined"
-        if name == '':
-            return "24 Invalid Name"
-        if self.__potstop.game_started:
-            return "23 Already Started"
 
-        self.__potstop.add_player(name, 0)
-        client.name = name
+        with self.__rooms.open(room_id) as room:
+            potstop = room.potstop
+            players = potstop.players
+            if len(players) >= potstop.player_limit:
+                return "21 Full Lobby"
+            if name in players:
+                return "22 Already Joined"
+            if name == '':
+                return "24 Invalid Name"
+            if potstop.game_started:
+                return "23 Already Started"
+
+            potstop.add_player(name, 0)
+            room.members.append(client)
+            client.name = name
+            client.room = room
         return "20 Joined"
         
     def __start(self, client: Client) -> str:
@@ -229,20 +879,20 @@ class Server:
             if the client is not the leader, or "42 Already Started" if the game
             has already started.
         """
-        
-        if self.__potstop.game_started:
+        room = client.room
+        if room is None:
+            return "41 Unauthorized"
+        potstop = room.potstop
+        if potstop.game_started:
             return "42 Already Started"
-        if self.__potstop.leader != client.name:
+        if potstop.leader != client.name:
             return "41 Unauthorized"
-        self.__potstop.start_game()
-        def send_start():
-            time.sleep(0.3)
-            game_init = {"round": self.__potstop.round, "pots": self.__potstop.pots, "letter": self.__potstop.letter}	
-            self.broadcast(f"START\n{json.dumps(game_init)}")
-        threading.Thread(target=send_start, daemon=True).start()
+        potstop.start_game()
+        game_init = {"round": potstop.round, "pots": potstop.pots, "letter": potstop.letter}
+        self.broadcast(f"START\n{json.dumps(game_init)}", room=room)
         return "40 Started"
     
-    def __call_stop(self, client: Client, data: dict[str, str]) -> None:
+    def __call_stop(self, client: Client, room: Room, data: dict[str, str]) -> str:
         """
         Handles a client's stop request.
 
@@ -250,41 +900,55 @@ class Server:
         clients to send their answers (if any), computes points for all clients, and
         finally ends the game and returns the stopped message with the ranking.
 
+        The wait ends the moment the last expected answer arrives, or after
+        ``ANSWERS_TIMEOUT`` seconds.
+
         Args:
             client (Client): The client that sent the stop request.
+            room (Room): The room where the game is being played.
             data (dict[str, str]): The answers from the client.
 
         Returns:
             str: A response code indicating the result of the stop request.
             "10 Stopped" if the game was successfully stopped, along with the ranking.
         """
+        started = time.perf_counter()
+        self.__announce_stop(client, room, data)
+        
+        # Aguardo as respostas chegarem (acordo assim que a última chegar)
+        received = room.potstop.wait_answers(self.ANSWERS_TIMEOUT)
+        return self.__settle(room, received, started)
+
+    def __announce_stop(self, client: Client, room: Room, data: dict[str, str]) -> None:
+        """
+        Saves the answers of the client that stopped the game and tells the
+        other players to send theirs.
+        """
+        potstop = room.potstop
         # Salvo as respostas da pessoa que mandou stop
-        self.__potstop.answers.append((client.name, data))
+        potstop.add_answers(client.name, data)
         """ 
         Se houver stops simultaneos significa que alguns usuarios
-        já enviaram as respostas no primeiro if.
+        já enviaram as respostas.
         Então preciso excluí-los do broadcast para evitar erros.
         """
-        time.sleep(0.5)
-        exclude = {name for name, _ in self.__potstop.answers}
+        exclude = {name for name, _ in potstop.answers}
         # Sinalizo que houve um stop para os clientes
-        self.broadcast("STOPPED BY " + client.name, exclude=exclude)
-        
-        # Aguardo as respostas chegarem (se demorar muito eu passo direto)
-        start_time = time.time()
-        while (time.time() - start_time) < 5 and len(self.__potstop.answers) < len(self.__potstop.players):
-            time.sleep(0.5)
-        
-        # Crio uma lista de respostas list[dict[str, str]]
-        # e computo os pontos
-        answers = [data for _, data in self.__potstop.answers]
-        words = self.__potstop.count_words(answers)
-        for name, ans in self.__potstop.answers:
-            self.__potstop.compute_points(name, ans, words)
+        self.broadcast("STOPPED BY " + client.name, exclude=exclude, room=room)
+
+    def __settle(self, room: Room, received: list[tuple[str, dict[str, str]]], started: float) -> str:
+        """
+        Scores the answers received, ends the game and returns the stopped
+        message with the ranking.
+        """
+        potstop = room.potstop
+        # Computo os pontos de todos de uma vez
+        potstop.compute_round_points(received)
         
         # Enfim finalizo o jogo e retorno stopped e o ranking
-        self.__potstop.end_game()
-        return f"10 Stopped\n{json.dumps(self.__potstop.ranking)}"
+        potstop.end_game()
+        self.__settlement_latency.observe(time.perf_counter() - started)
+        return f"10 Stopped\n{potstop.ranking_payload}"
     
     
     def __stop(self, client: Client, data: str) -> str:
@@ -296,7 +960,8 @@ class Server:
 
         If the game has already been stopped, adds the client's
         answers to the list of answers and waits for the points
-        to be computed. Then returns "10 Stopped" with the ranking.
+        to be computed (up to ``SETTLEMENT_TIMEOUT`` seconds). Then
+        returns "10 Stopped" with the ranking.
 
         Otherwise, stops the game and calls __call_stop to handle
         the stop request.
@@ -311,28 +976,117 @@ class Server:
             "0 Bad Request" if the request is invalid.
             "10 Stopped" if the game was successfully stopped, along with the ranking.
         """
-        if not self.__potstop.game_started:
+        request = self.__stop_request(client, data)
+        if isinstance(request, str):
+            return request
+        room, answers = request
+        potstop = room.potstop
+
+        # Dou stop; se ja tiverem dado stop entao vai entrar nesse if
+        if not potstop.stop():
+            # Manda as respostas e aguarda o jogo acabar
+            # (quando terminar de computar os pontos o estado muda em end_game)
+            potstop.add_answers(client.name, answers)
+            potstop.wait_end(self.SETTLEMENT_TIMEOUT)
+            return f"10 Stopped\n{potstop.ranking_payload}"
+        
+        return self.__call_stop(client, room, answers)
+
+    async def __stop_async(self, client: Client, data: str) -> str:
+        """
+        Handles a stop request on the event loop, as ``__stop`` does.
+
+        The answers are saved before the first wait. The waits for the other
+        players' answers and for the end of the game are awaited (see
+        ``__wait_round``), so any number of rooms may be settling at once.
+
+        Args:
+            client (Client): The client that sent the stop request.
+            data (str): The answers from the client.
+
+        Returns:
+            str: The same responses as ``__stop``.
+        """
+        request = self.__stop_request(client, data)
+        if isinstance(request, str):
+            return request
+        room, answers = request
+        potstop = room.potstop
+
+        if not potstop.stop():
+            potstop.add_answers(client.name, answers)
+            await self.__wait_round(potstop, lambda: not potstop.game_started, self.SETTLEMENT_TIMEOUT)
+            return f"10 Stopped\n{potstop.ranking_payload}"
+
+        started = time.perf_counter()
+        self.__announce_stop(client, room, answers)
+        await self.__wait_round(potstop, lambda: potstop.all_answered, self.ANSWERS_TIMEOUT)
+        return self.__settle(room, potstop.wait_answers(0), started)
+
+    def __stop_request(self, client: Client, data: str) -> str | tuple[Room, dict[str, str]]:
+        """
+        Checks a stop request.
+
+        Returns:
+            The room and the answers of the request, or the error response:
+            "11 Not Started" or "0 Bad Request".
+        """
+        room = client.room
+        if room is None or not room.potstop.game_started:
             return "11 Not Started"
         
         try:
-            data = json.loads(data.strip().split('\n')[1])
+            answers = json.loads(data.strip().split('\n')[1])
         except (json.JSONDecodeError, IndexError):
             return "0 Bad Request"
+        return room, answers
 
-        # Se ja tiverem dado stop entao vai entrar nesse if
-        if self.__potstop.stopped:
-            # Manda as respostas e aguarda o jogo acabar
-            # (quando terminar de computar os pontos o estado muda) linha 146
-            self.__potstop.answers.append((client.name, data))
-            start_time = time.time()
-            while (time.time() - start_time) < 7.5 and self.__potstop.game_started:
-                time.sleep(0.5)
-            return f"10 Stopped\n{json.dumps(self.__potstop.ranking)}"
-        
-        # Dou stop, para garantir que proximo entre no if
-        self.__potstop.stop()
-        
-        return self.__call_stop(client, data)
+    async def __wait_round(self, potstop: Potstop, done: Callable[[], bool], timeout: float) -> bool:
+        """
+        Waits on the event loop until ``done()`` is true, checking it again
+        whenever the round changes (see ``Potstop.watch``).
+
+        Args:
+            potstop (Potstop): The game of the room.
+            done (Callable[[], bool]): The condition waited for.
+            timeout (float): The maximum time to wait, in seconds.
+
+        Returns:
+            bool: The last value of ``done()``.
+        """
+        assert self.__loop is not None
+        loop = self.__loop
+        changed = asyncio.Event()
+        deadline = loop.time() + timeout
+        unwatch = potstop.watch(lambda: loop.call_soon_threadsafe(changed.set))
+        try:
+            while not done():
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    return False
+                try:
+                    await asyncio.wait_for(changed.wait(), remaining)
+                except asyncio.TimeoutError:
+                    return done()
+                changed.clear()
+            return True
+        finally:
+            unwatch()
+
+    def __stats(self, client: Client) -> str:
+        """
+        Handles a client's request for the server metrics.
+
+        Read-only: it does not require joining a room.
+
+        Args:
+            client (Client): The client requesting the metrics.
+
+        Returns:
+            str: "50 Stats" followed by the metrics snapshot in JSON (see
+            ``MetricsRegistry.snapshot``).
+        """
+        return f"50 Stats\n{json.dumps(self.metrics.snapshot())}"
 
         
     def __kill_clients(self) -> None:
@@ -341,9 +1095,12 @@ class Server:
         "ENDC" message to them, indicating that the server 
         is shutting down.
         """
-        for client in self.__clients:
-            client.socket.sendall("ENDC".encode())
-            client.socket.close()
+        for client in list(self.__clients.values()):
+            try:
+                client.send(encode_frame("ENDC"))
+            except OSError:
+                pass
+            client.close()
 
     def __stop_server(self) -> None:
         """
@@ -360,16 +1117,96 @@ class Server:
                 command = 'q'
                 
             if command.strip().lower() == 'q':
-                print("Encerrando servidor...")
+                self.log.info("shutting_down")
                 break
         
-        self.__server_sock.close()
-        self.__kill_clients()
+        self.metrics.stop_dumping()
+        if self.__loop is not None and self.__closed is not None:
+            self.__kill_clients()
+            self.__loop.call_soon_threadsafe(self.__closed.set)
+        else:
+            # close() sozinho não acorda o accept() bloqueado na thread principal
+            try:
+                self.__server_sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            self.__server_sock.close()
+            self.__kill_clients()
+
+
+def _raise_open_files_limit() -> None:
+    """
+    Raises the soft limit of open file descriptors up to the hard limit,
+    so the event loop mode is not capped at the usual 1024 sockets.
+    """
+    try:
+        import resource
+    except ImportError:  # Windows
+        return
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft < hard:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
 
 
 if __name__ == "__main__":
-    if len(sys.argv) == 2:
-        Server(port=int(sys.argv[1])).start()
+    parser = argparse.ArgumentParser(description="Servidor do Potstop")
+    parser.add_argument("port", nargs="?", type=int, default=8888)
+    parser.add_argument("--mode", choices=Server.MODES, default="thread",
+                        help="thread: uma thread por cliente; async: todos os clientes em um event loop")
+    parser.add_argument("--metrics-file", help="arquivo JSON onde as métricas são gravadas periodicamente")
+    parser.add_argument("--metrics-interval", type=float, default=10,
+                        help="intervalo entre as gravações das métricas, em segundos")
+    parser.add_argument("--log-level", choices=LEVELS, default="info",
+                        help="nível mínimo dos logs; warning omite as mensagens trocadas com os clientes")
+    parser.add_argument("--log-format", choices=FORMATS, default="text")
+    parser.add_argument("--log-sample", type=float, default=1.0,
+                        help="fração das mensagens (requisições, respostas e broadcasts) registradas")
+    parser.add_argument("--log-payload", type=int, default=200,
+                        help="máximo de caracteres registrados de cada mensagem")
+    parser.add_argument("--dictionary", nargs="?", const=str(DEFAULT_INDEX),
+                        help="índice das listas de palavras por categoria (gerado por server/dictionary.py build)")
+    parser.add_argument("--fuzzy-distance", type=int, default=0,
+                        help="distância de edição até a qual respostas parecidas contam como repetidas "
+                             "(0 desativa)")
+    parser.add_argument("--seed", type=int,
+                        help="semente das letras e categorias sorteadas (rodadas reproduzíveis em cada sala)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="processos que atendem as salas (cada sala fica em um único processo)")
+    parser.add_argument("--worker-channel", type=int, help=argparse.SUPPRESS)
+    parser.add_argument("--worker-index", type=int, default=0, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    logger = Logger(args.log_level, fmt=args.log_format, sample=args.log_sample, max_payload=args.log_payload)
+
+    if args.workers > 1 and args.worker_channel is None:
+        worker_args = ["--mode", args.mode, "--metrics-interval", str(args.metrics_interval),
+                       "--log-level", args.log_level, "--log-format", args.log_format,
+                       "--log-sample", str(args.log_sample), "--log-payload", str(args.log_payload),
+                       "--fuzzy-distance", str(args.fuzzy_distance)]
+        if args.seed is not None:
+            worker_args += ["--seed", str(args.seed)]
+        if args.metrics_file:
+            worker_args += ["--metrics-file", args.metrics_file]
+        if args.dictionary:
+            worker_args += ["--dictionary", args.dictionary]
+        Dispatcher(args.port, args.workers, worker_args, logger).start()
     else:
-        Server().start()
+        metrics_file = args.metrics_file
+        channel = None
+        if args.worker_channel is not None:
+            channel = socket.socket(fileno=args.worker_channel)
+            # Cada worker grava as suas métricas em um arquivo próprio
+            metrics_file = metrics_file and f"{metrics_file}.{args.worker_index}"
+        Server(
+            port=args.port,
+            mode=args.mode,
+            metrics_file=metrics_file,
+            metrics_interval=args.metrics_interval,
+            logger=logger,
+            channel=channel,
+            worker=args.worker_index,
+            workers=args.workers,
+            dictionary=Dictionary(args.dictionary) if args.dictionary else None,
+            fuzzy_distance=args.fuzzy_distance,
+            seed=args.seed,
+        ).start()
         
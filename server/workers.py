@@ -0,0 +1,269 @@
+"""
+Multi-process serving: one dispatcher process and N worker processes.
+
+A single server process runs on one core because of the GIL, however many
+handler threads it has. In this mode the dispatcher owns the listening
+socket and every room is pinned to exactly one worker (``owner``), so the
+state of a game lives in a single process and needs no cross-process
+locking.
+
+The dispatcher reads the first frame of each new connection, picks the
+worker owning the room it joins and hands the socket to that worker over a
+Unix ``SOCK_SEQPACKET`` channel (``SCM_RIGHTS``), together with the bytes it
+already read. A client whose first message is not a JOIN goes to the owner
+of the default room. If a client later joins a room owned by another worker
+(e.g. after its first JOIN was refused), the worker hands the connection
+back to the dispatcher, which routes it again.
+
+Passing sockets between processes needs ``socket.send_fds`` (Unix only).
+"""
+import asyncio
+import socket
+import subprocess
+import sys
+import threading
+import zlib
+from pathlib import Path
+from typing import Optional
+
+from framing import HEADER, split_request_id
+from logger import Logger
+from rooms import RoomRegistry
+
+ROUTE_LIMIT = 16 * 1024  # larger first frames are not read before routing
+ROUTE_TIMEOUT = 10  # seconds a new connection has to send its first frame
+CHANNEL_MESSAGE_SIZE = 4 * 1024 * 1024
+
+
+def owner(room_id: str, workers: int) -> int:
+    """
+    Returns the index of the worker that owns a room.
+    """
+    return zlib.crc32(room_id.encode()) % workers
+
+
+def join_room(msg: str) -> Optional[str]:
+    """
+    Returns the room a JOIN message asks for (parsed as ``Server.__join``
+    does), or None if the message is not a JOIN.
+    """
+    lines = msg.split("\n")
+    command, _ = split_request_id(lines[0])
+    if command != "JOIN":
+        return None
+    room_id = lines[2].strip() if len(lines) > 2 else ''
+    return room_id or RoomRegistry.DEFAULT_ROOM
+
+
+def first_room(data: bytes) -> str:
+    """
+    Returns the room that decides where a connection goes, from the bytes
+    starting with its first frame.
+    """
+    if len(data) < HEADER.size:
+        return RoomRegistry.DEFAULT_ROOM
+    (length,) = HEADER.unpack_from(data)
+    try:
+        msg = data[HEADER.size:HEADER.size + length].decode()
+    except UnicodeDecodeError:
+        return RoomRegistry.DEFAULT_ROOM
+    return join_room(msg) or RoomRegistry.DEFAULT_ROOM
+
+
+def send_connection(channel: socket.socket, sock: socket.socket, data: bytes) -> None:
+    """
+    Sends a connected socket and the bytes already read from it through a
+    channel. ``data`` must not be empty.
+    """
+    socket.send_fds(channel, [data], [sock.fileno()])
+
+
+def receive_connection(channel: socket.socket) -> Optional[tuple[socket.socket, bytes]]:
+    """
+    Receives a socket sent by ``send_connection``.
+
+    The socket is returned in blocking mode: the flag belongs to the shared
+    open file, and the dispatcher's sockets are non-blocking.
+
+    Returns:
+        The socket and the bytes already read from it, or None once the
+        other end of the channel is closed.
+    """
+    data, fds, _, _ = socket.recv_fds(channel, CHANNEL_MESSAGE_SIZE, 1)
+    if not data:
+        for fd in fds:
+            socket.close(fd)
+        return None
+    sock = socket.socket(fileno=fds[0])
+    sock.setblocking(True)
+    return sock, data
+
+
+class Dispatcher:
+    """
+    Accepts the connections and hands each one to the worker owning its room.
+
+    The workers are ``server.py`` processes started with ``--worker-channel``;
+    they serve the connections they receive with the usual thread or async
+    mode and exit when the dispatcher closes their channel.
+    """
+
+    def __init__(self, port: int, workers: int, worker_args: list[str], logger: Optional[Logger] = None) -> None:
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        self.__host = "0.0.0.0"
+        self.__port = port
+        self.__workers = workers
+        self.__worker_args = worker_args
+        self.log = logger if logger is not None else Logger()
+        self.__channels: list[socket.socket] = []
+        self.__processes: list[subprocess.Popen] = []
+        self.__loop: Optional[asyncio.AbstractEventLoop] = None
+        self.__closed: Optional[asyncio.Event] = None
+
+    def start(self) -> None:
+        """
+        Starts the workers and dispatches connections until 'q' is typed
+        (or stdin is closed).
+        """
+        server_sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        server_sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, True)
+        server_sock.bind((self.__host, self.__port))
+        server_sock.listen(socket.SOMAXCONN)
+        self.__spawn_workers()
+        threading.Thread(target=self.__wait_quit, daemon=True).start()
+        self.log.info("listening", host=self.__host, port=self.__port, workers=self.__workers)
+        try:
+            asyncio.run(self.__serve(server_sock))
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server_sock.close()
+            self.__stop_workers()
+            self.log.close()
+
+    def __spawn_workers(self) -> None:
+        script = Path(__file__).resolve().parent / "server.py"
+        for index in range(self.__workers):
+            parent, child = socket.socketpair(socket.AF_UNIX, socket.SOCK_SEQPACKET)
+            process = subprocess.Popen(
+                [sys.executable, str(script), "--worker-channel", str(child.fileno()),
+                 "--worker-index", str(index), "--workers", str(self.__workers), *self.__worker_args],
+                stdin=subprocess.DEVNULL,
+                pass_fds=(child.fileno(),),
+            )
+            child.close()
+            self.__channels.append(parent)
+            self.__processes.append(process)
+
+    def __stop_workers(self) -> None:
+        """
+        Closes the channels, which makes every worker shut down.
+        """
+        for channel in self.__channels:
+            channel.close()
+        for process in self.__processes:
+            try:
+                process.wait(5)
+            except subprocess.TimeoutExpired:
+                process.kill()
+
+    async def __serve(self, server_sock: socket.socket) -> None:
+        self.__loop = asyncio.get_running_loop()
+        self.__closed = asyncio.Event()
+        server_sock.setblocking(False)
+        for channel in self.__channels:
+            self.__loop.add_reader(channel, self.__handed_back, channel)
+        accepting = asyncio.create_task(self.__accept(server_sock))
+        await self.__closed.wait()
+        accepting.cancel()
+        for channel in self.__channels:
+            self.__loop.remove_reader(channel)
+
+    async def __accept(self, server_sock: socket.socket) -> None:
+        assert self.__loop is not None
+        while True:
+            sock, _ = await self.__loop.sock_accept(server_sock)
+            self.__loop.create_task(self.__route_new(sock))
+
+    async def __route_new(self, sock: socket.socket) -> None:
+        """
+        Reads the first frame of a new connection and routes it.
+        """
+        try:
+            data = await asyncio.wait_for(self.__read_first_frame(sock), ROUTE_TIMEOUT)
+        except (OSError, asyncio.TimeoutError):
+            sock.close()
+            return
+        if data:
+            self.__route(sock, data)
+        sock.close()
+
+    async def __read_first_frame(self, sock: socket.socket) -> bytes:
+        """
+        Reads exactly the first frame (or only its header, if the frame is
+        larger than ``ROUTE_LIMIT``), so nothing sent after it is consumed.
+
+        Returns:
+            The bytes read, or empty bytes if the client disconnected.
+        """
+        data = await self.__read_exactly(sock, HEADER.size)
+        if len(data) < HEADER.size:
+            return b""
+        (length,) = HEADER.unpack(data)
+        if length > ROUTE_LIMIT:
+            return data
+        body = await self.__read_exactly(sock, length)
+        return data + body if len(body) == length else b""
+
+    async def __read_exactly(self, sock: socket.socket, size: int) -> bytes:
+        assert self.__loop is not None
+        data = b""
+        while len(data) < size:
+            chunk = await self.__loop.sock_recv(sock, size - len(data))
+            if not chunk:
+                break
+            data += chunk
+        return data
+
+    def __handed_back(self, channel: socket.socket) -> None:
+        """
+        Routes a connection a worker handed back. Runs on the loop thread.
+        """
+        try:
+            received = receive_connection(channel)
+        except OSError:
+            received = None
+        if received is None:
+            # A worker exited: without it, its rooms cannot be served
+            self.log.error("worker_lost", worker=self.__channels.index(channel))
+            assert self.__closed is not None
+            self.__closed.set()
+            return
+        sock, data = received
+        self.__route(sock, data)
+        sock.close()
+
+    def __route(self, sock: socket.socket, data: bytes) -> None:
+        room_id = first_room(data)
+        worker = owner(room_id, self.__workers)
+        try:
+            send_connection(self.__channels[worker], sock, data)
+        except OSError as e:
+            self.log.warning("route_failed", room=room_id, worker=worker, error=str(e))
+
+    def __wait_quit(self) -> None:
+        """
+        Waits for 'q' on stdin, like ``Server.__stop_server``.
+        """
+        while True:
+            print("Digite 'q' para encerrar o servidor.")
+            try:
+                command = input()
+            except EOFError:
+                command = 'q'
+            if command.strip().lower() == 'q':
+                self.log.info("shutting_down")
+                break
+        if self.__loop is not None and self.__closed is not None:
+            self.__loop.call_soon_threadsafe(self.__closed.set)